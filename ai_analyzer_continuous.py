@@ -278,7 +278,7 @@ Write as one flowing paragraph, not bullet points."""
             m.name as model_name,
             v.created_at,
             v.ai_description
-        FROM vehicles v
+        FROM vehicle_listings v
         JOIN models m ON v.model_id = m.id
         WHERE 
             -- New vehicles without any description
@@ -182,7 +182,7 @@ class SEOService {
         v.has_warranty,
         m.name as manufacturer_name,
         md.name as model_name
-      FROM vehicles v
+      FROM vehicle_listings v
       LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
       LEFT JOIN models md ON v.model_id = md.id
       WHERE ${whereClause}
@@ -292,7 +292,7 @@ class SEOService {
     if (force) {
       // Clear all existing SEO metadata
       try {
-        const clearQuery = 'UPDATE vehicles SET seo_metadata = NULL, seo_updated_at = NULL WHERE is_available = TRUE';
+        const clearQuery = 'UPDATE vehicles SET seo_metadata = NULL, seo_updated_at = NULL WHERE id IN (SELECT vehicle_id FROM vehicle_status WHERE is_available = TRUE)';
         const result = await this.pool.query(clearQuery);
         this.logger.info(`🗑️ Cleared SEO for ${result.rowCount} vehicles`);
       } catch (error) {
@@ -341,14 +341,14 @@ class SEOService {
   async getSEOStats() {
     try {
       const queries = {
-        total: 'SELECT COUNT(*) as count FROM vehicles WHERE is_available = TRUE',
-        withSeo: 'SELECT COUNT(*) as count FROM vehicles WHERE seo_metadata IS NOT NULL AND is_available = TRUE',
-        withoutSeo: 'SELECT COUNT(*) as count FROM vehicles WHERE seo_metadata IS NULL AND is_available = TRUE',
-        outdated: `SELECT COUNT(*) as count FROM vehicles 
+        total: 'SELECT COUNT(*) as count FROM vehicle_listings WHERE is_available = TRUE',
+        withSeo: 'SELECT COUNT(*) as count FROM vehicle_listings WHERE seo_metadata IS NOT NULL AND is_available = TRUE',
+        withoutSeo: 'SELECT COUNT(*) as count FROM vehicle_listings WHERE seo_metadata IS NULL AND is_available = TRUE',
+        outdated: `SELECT COUNT(*) as count FROM vehicle_listings 
                    WHERE is_available = TRUE 
                    AND seo_metadata IS NOT NULL 
                    AND (seo_updated_at IS NULL OR seo_updated_at < NOW() - INTERVAL '30 days')`,
-        recent: `SELECT COUNT(*) as count FROM vehicles 
+        recent: `SELECT COUNT(*) as count FROM vehicle_listings 
                  WHERE is_available = TRUE 
                  AND seo_updated_at > NOW() - INTERVAL '1 day'`
       };
@@ -400,7 +400,7 @@ class SEOService {
           v.has_warranty,
           m.name as manufacturer_name,
           md.name as model_name
-        FROM vehicles v
+        FROM vehicle_listings v
         LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
         LEFT JOIN models md ON v.model_id = md.id
         WHERE v.id = $1
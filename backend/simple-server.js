@@ -165,7 +165,7 @@ app.get('/api/vehicles/featured', async (req, res) => {
         md.name as model_name,
         vi.local_path as primary_image_path,
         vi.original_url as primary_image_url
-      FROM vehicles v
+      FROM vehicle_listings v
       LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
       LEFT JOIN models md ON v.model_id = md.id
       LEFT JOIN vehicle_images vi ON v.id = vi.vehicle_id AND vi.is_primary = TRUE
@@ -382,7 +382,7 @@ async function performProgressiveSearch(searchQuery, manufacturer, model, page =
       // Count query
       const countQuery = `
         SELECT COUNT(*) as total
-        FROM vehicles v
+        FROM vehicle_listings v
         LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
         LEFT JOIN models md ON v.model_id = md.id
         WHERE ${whereClause}
@@ -400,7 +400,7 @@ async function performProgressiveSearch(searchQuery, manufacturer, model, page =
             md.name as model_name,
             vi.local_path as primary_image_path,
             vi.original_url as primary_image_url
-          FROM vehicles v
+          FROM vehicle_listings v
           LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
           LEFT JOIN models md ON v.model_id = md.id
           LEFT JOIN vehicle_images vi ON v.id = vi.vehicle_id AND vi.is_primary = TRUE
@@ -601,7 +601,7 @@ app.post('/api/vehicles/search', async (req, res) => {
             md.name as model_name,
             vi.original_url as primary_image_url,
             COUNT(*) OVER() as total_count
-          FROM vehicles v
+          FROM vehicle_listings v
           LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
           LEFT JOIN models md ON v.model_id = md.id
           LEFT JOIN vehicle_images vi ON v.id = vi.vehicle_id AND vi.is_primary = TRUE
@@ -748,7 +748,7 @@ app.get('/api/manufacturers', async (req, res) => {
         m.country,
         COUNT(v.id) as vehicle_count
       FROM manufacturers m
-      LEFT JOIN vehicles v ON m.id = v.manufacturer_id AND v.is_available = TRUE
+      LEFT JOIN vehicle_listings v ON m.id = v.manufacturer_id AND v.is_available = TRUE
       WHERE m.is_active = TRUE
       GROUP BY m.id, m.name, m.country
       HAVING COUNT(v.id) > 0
@@ -783,7 +783,7 @@ app.get('/api/manufacturers/:manufacturerId/models', async (req, res) => {
         md.body_type,
         COUNT(v.id) as vehicle_count
       FROM models md
-      LEFT JOIN vehicles v ON md.id = v.model_id AND v.is_available = TRUE
+      LEFT JOIN vehicle_listings v ON md.id = v.model_id AND v.is_available = TRUE
       WHERE md.manufacturer_id = $1
       GROUP BY md.id, md.name, md.body_type
       HAVING COUNT(v.id) > 0
@@ -815,7 +815,7 @@ app.get('/api/models/:modelId/vehicles', async (req, res) => {
     // First get total count for pagination
     const countQuery = `
       SELECT COUNT(*) as total
-      FROM vehicles v
+      FROM vehicle_listings v
       WHERE v.model_id = $1 AND v.is_available = TRUE
     `;
     const countResult = await pool.query(countQuery, [modelId]);
@@ -827,7 +827,7 @@ app.get('/api/models/:modelId/vehicles', async (req, res) => {
         m.name as manufacturer_name,
         md.name as model_name,
         vi.original_url as primary_image_url
-      FROM vehicles v
+      FROM vehicle_listings v
       LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
       LEFT JOIN models md ON v.model_id = md.id
       LEFT JOIN vehicle_images vi ON v.id = vi.vehicle_id AND vi.is_primary = TRUE
@@ -953,9 +953,9 @@ function generateAIAnalysis(vehicle) {
 app.get('/api/vehicles/stats', async (req, res) => {
   try {
     const queries = [
-      'SELECT COUNT(*) as total FROM vehicles',
-      'SELECT COUNT(*) as available FROM vehicles WHERE is_available = TRUE',
-      'SELECT COUNT(*) as featured FROM vehicles WHERE is_featured = TRUE',
+      'SELECT COUNT(*) as total FROM vehicle_listings',
+      'SELECT COUNT(*) as available FROM vehicle_listings WHERE is_available = TRUE',
+      'SELECT COUNT(*) as featured FROM vehicle_listings WHERE is_featured = TRUE',
       'SELECT COUNT(*) as inquiries FROM inquiries'
     ];
     
@@ -987,7 +987,7 @@ app.get('/api/vehicles/sitemap', async (req, res) => {
   try {
     const query = `
       SELECT id, updated_at 
-      FROM vehicles 
+      FROM vehicle_listings 
       WHERE is_available = TRUE 
       ORDER BY id
     `;
@@ -1026,7 +1026,7 @@ app.get('/api/vehicles/:id', async (req, res) => {
             'is_primary', vi.is_primary
           ) ORDER BY vi.image_order, vi.is_primary DESC
         ) FILTER (WHERE vi.id IS NOT NULL) as images
-      FROM vehicles v
+      FROM vehicle_listings v
       LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
       LEFT JOIN models md ON v.model_id = md.id
       LEFT JOIN vehicle_images vi ON v.id = vi.vehicle_id
@@ -1214,7 +1214,7 @@ app.get('/api/vehicles/:id/similar', async (req, res) => {
     
     // First get the current vehicle's details
     const currentVehicle = await pool.query(
-      'SELECT manufacturer_id, model_id, price_vehicle_yen FROM vehicles WHERE id = $1',
+      'SELECT manufacturer_id, model_id, price_vehicle_yen FROM vehicle_listings WHERE id = $1',
       [id]
     );
     
@@ -1231,7 +1231,7 @@ app.get('/api/vehicles/:id/similar', async (req, res) => {
         m.name as manufacturer_name,
         md.name as model_name,
         vi.original_url as primary_image_url
-      FROM vehicles v
+      FROM vehicle_listings v
       LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
       LEFT JOIN models md ON v.model_id = md.id
       LEFT JOIN vehicle_images vi ON v.id = vi.vehicle_id AND vi.is_primary = TRUE
@@ -1708,7 +1708,7 @@ app.get('/api/favorites', authenticateToken, async (req, res) => {
         vi.original_url as primary_image_url,
         uf.created_at as favorited_at
       FROM user_favorites uf
-      JOIN vehicles v ON uf.vehicle_id = v.id
+      JOIN vehicle_listings v ON uf.vehicle_id = v.id
       LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
       LEFT JOIN models md ON v.model_id = md.id
       LEFT JOIN vehicle_images vi ON v.id = vi.vehicle_id AND vi.is_primary = TRUE
@@ -1762,7 +1762,7 @@ app.get('/api/admin/inquiries', async (req, res) => {
         i.*,
         v.title_description as vehicle_title
       FROM inquiries i
-      LEFT JOIN vehicles v ON i.vehicle_id = v.id
+      LEFT JOIN vehicle_listings v ON i.vehicle_id = v.id
       ORDER BY i.created_at DESC
       LIMIT $1 OFFSET $2
     `;
@@ -1993,7 +1993,7 @@ app.delete('/api/admin/models/:id', async (req, res) => {
     
     // Check if model has associated vehicles
     const vehicles = await pool.query(
-      'SELECT COUNT(*) FROM vehicles WHERE model_id = $1',
+      'SELECT COUNT(*) FROM vehicle_listings WHERE model_id = $1',
       [id]
     );
     
@@ -2061,7 +2061,7 @@ app.post('/api/admin/vehicles/add-single', async (req, res) => {
     
     // Check if vehicle already exists
     const existing = await pool.query(
-      'SELECT id FROM vehicles WHERE url = $1',
+      'SELECT id FROM vehicle_listings WHERE url = $1',
       [url]
     );
     
@@ -2138,7 +2138,7 @@ app.post('/api/admin/vehicles/add-single', async (req, res) => {
       if (code === 0) {
         // Success - check if vehicle was added
         const newVehicle = await pool.query(
-          'SELECT id FROM vehicles WHERE url = $1',
+          'SELECT id FROM vehicle_listings WHERE url = $1',
           [url]
         );
         
@@ -2595,7 +2595,7 @@ app.post('/api/admin/cleanup-titles', async (req, res) => {
     // Get all vehicles with problematic titles
     const query = `
       SELECT id, title_description 
-      FROM vehicles 
+      FROM vehicle_listings 
       WHERE title_description ILIKE '%CruiserPrado%' 
          OR title_description ILIKE '%Landcruiser%'
          OR title_description ~ '[ぁ-んァ-ヶー]'
@@ -2674,7 +2674,7 @@ app.listen(port, () => {
 });
 
 // Test database connection on startup
-pool.query('SELECT NOW() as current_time, COUNT(*) as vehicle_count FROM vehicles', (err, result) => {
+pool.query('SELECT NOW() as current_time, COUNT(*) as vehicle_count FROM vehicle_listings', (err, result) => {
   if (err) {
     console.error('Database connection failed:', err.message);
   } else {
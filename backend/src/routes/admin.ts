@@ -27,7 +27,7 @@ router.get('/dashboard', async (req, res) => {
         'vehicle_added' as type,
         'New vehicle: ' || title_description as message,
         created_at as timestamp
-      FROM vehicles 
+      FROM vehicle_listings 
       WHERE created_at >= NOW() - INTERVAL '7 days'
       
       UNION ALL
@@ -78,7 +78,7 @@ router.get('/manufacturers', async (req, res) => {
         m.*,
         COUNT(v.id) as vehicle_count
       FROM manufacturers m
-      LEFT JOIN vehicles v ON m.id = v.manufacturer_id AND v.is_available = TRUE
+      LEFT JOIN vehicle_listings v ON m.id = v.manufacturer_id AND v.is_available = TRUE
       WHERE m.is_active = TRUE
       GROUP BY m.id
       ORDER BY m.name
@@ -148,7 +148,7 @@ router.get('/models', async (req, res) => {
         COUNT(v.id) as vehicle_count
       FROM models m
       LEFT JOIN manufacturers mf ON m.manufacturer_id = mf.id
-      LEFT JOIN vehicles v ON m.id = v.model_id AND v.is_available = TRUE
+      LEFT JOIN vehicle_listings v ON m.id = v.model_id AND v.is_available = TRUE
       WHERE 1=1
     `;
 
@@ -282,7 +282,7 @@ router.get('/export/vehicles', requireRole(['admin']), async (req, res) => {
         v.*,
         m.name as manufacturer_name,
         md.name as model_name
-      FROM vehicles v
+      FROM vehicle_listings v
       LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
       LEFT JOIN models md ON v.model_id = md.id
       ORDER BY v.created_at DESC
@@ -315,7 +315,7 @@ router.get('/export/inquiries', requireRole(['admin']), async (req, res) => {
         v.title_description as vehicle_title,
         v.price_total_yen as vehicle_price
       FROM inquiries i
-      LEFT JOIN vehicles v ON i.vehicle_id = v.id
+      LEFT JOIN vehicle_listings v ON i.vehicle_id = v.id
       ORDER BY i.created_at DESC
     `;
 
@@ -12,7 +12,7 @@ router.get('/', async (req, res) => {
         m.*,
         COUNT(v.id) as vehicle_count
       FROM manufacturers m
-      LEFT JOIN vehicles v ON m.id = v.manufacturer_id 
+      LEFT JOIN vehicle_listings v ON m.id = v.manufacturer_id 
         AND v.is_available = TRUE 
         AND v.export_status = 'available'
       WHERE m.is_active = TRUE
@@ -53,7 +53,7 @@ router.get('/:id', async (req, res) => {
         m.*,
         COUNT(v.id) as vehicle_count
       FROM manufacturers m
-      LEFT JOIN vehicles v ON m.id = v.manufacturer_id 
+      LEFT JOIN vehicle_listings v ON m.id = v.manufacturer_id 
         AND v.is_available = TRUE 
         AND v.export_status = 'available'
       WHERE m.id = $1 AND m.is_active = TRUE
@@ -100,7 +100,7 @@ router.get('/:id/models', async (req, res) => {
         md.*,
         COUNT(v.id) as vehicle_count
       FROM models md
-      LEFT JOIN vehicles v ON md.id = v.model_id 
+      LEFT JOIN vehicle_listings v ON md.id = v.model_id 
         AND v.is_available = TRUE 
         AND v.export_status = 'available'
       WHERE md.manufacturer_id = $1
@@ -23,7 +23,7 @@ router.get('/:id', async (req, res) => {
         COUNT(v.id) as vehicle_count
       FROM models md
       LEFT JOIN manufacturers m ON md.manufacturer_id = m.id
-      LEFT JOIN vehicles v ON md.id = v.model_id 
+      LEFT JOIN vehicle_listings v ON md.id = v.model_id 
         AND v.is_available = TRUE 
         AND v.export_status = 'available'
       WHERE md.id = $1
@@ -78,7 +78,7 @@ router.get('/:id/vehicles', async (req, res) => {
         md.name as model_name,
         vi.original_url as primary_image_url,
         COUNT(*) OVER() as total_count
-      FROM vehicles v
+      FROM vehicle_listings v
       LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
       LEFT JOIN models md ON v.model_id = md.id
       LEFT JOIN vehicle_images vi ON v.id = vi.vehicle_id AND vi.is_primary = TRUE
@@ -252,7 +252,7 @@ export class ImageService {
         SELECT DISTINCT vehicle_id 
         FROM vehicle_images vi 
         WHERE NOT EXISTS (
-          SELECT 1 FROM vehicles v WHERE v.id = vi.vehicle_id
+          SELECT 1 FROM vehicle_listings v WHERE v.id = vi.vehicle_id
         )
       `;
       
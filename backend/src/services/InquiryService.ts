@@ -49,7 +49,7 @@ export class InquiryService {
           md.name as model_name,
           COUNT(*) OVER() as total_count
         FROM inquiries i
-        LEFT JOIN vehicles v ON i.vehicle_id = v.id
+        LEFT JOIN vehicle_listings v ON i.vehicle_id = v.id
         LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
         LEFT JOIN models md ON v.model_id = md.id
         WHERE 1=1
@@ -114,7 +114,7 @@ export class InquiryService {
           m.name as manufacturer_name,
           md.name as model_name
         FROM inquiries i
-        LEFT JOIN vehicles v ON i.vehicle_id = v.id
+        LEFT JOIN vehicle_listings v ON i.vehicle_id = v.id
         LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
         LEFT JOIN models md ON v.model_id = md.id
         WHERE i.id = $1
@@ -131,7 +131,7 @@ export class SEOService {
         v.has_warranty,
         m.name as manufacturer_name,
         md.name as model_name
-      FROM vehicles v
+      FROM vehicle_listings v
       LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
       LEFT JOIN models md ON v.model_id = md.id
       WHERE v.seo_metadata IS NULL
@@ -233,9 +233,9 @@ export class SEOService {
    */
   public async getSEOStats(): Promise<any> {
     try {
-      const totalQuery = 'SELECT COUNT(*) as total FROM vehicles WHERE is_available = TRUE';
-      const withSeoQuery = 'SELECT COUNT(*) as with_seo FROM vehicles WHERE seo_metadata IS NOT NULL AND is_available = TRUE';
-      const withoutSeoQuery = 'SELECT COUNT(*) as without_seo FROM vehicles WHERE seo_metadata IS NULL AND is_available = TRUE';
+      const totalQuery = 'SELECT COUNT(*) as total FROM vehicle_listings WHERE is_available = TRUE';
+      const withSeoQuery = 'SELECT COUNT(*) as with_seo FROM vehicle_listings WHERE seo_metadata IS NOT NULL AND is_available = TRUE';
+      const withoutSeoQuery = 'SELECT COUNT(*) as without_seo FROM vehicle_listings WHERE seo_metadata IS NULL AND is_available = TRUE';
       
       const [totalResult, withSeoResult, withoutSeoResult] = await Promise.all([
         pool.query(totalQuery),
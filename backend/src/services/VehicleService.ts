@@ -2,6 +2,9 @@ import pool from '@/config/database';
 import { Vehicle, SearchFilters, PaginationOptions, SortOptions, SearchResult } from '@/types';
 import { logger } from '@/utils/logger';
 
+// Columns kept in vehicle_status rather than on the vehicles row (read both through vehicle_listings)
+const STATUS_FIELDS = ['price_vehicle_yen', 'price_total_yen', 'is_available', 'last_scraped_at', 'sold_detected_at', 'notes'];
+
 export class VehicleService {
   private preprocessSearchQuery(query: string): string {
     if (!query) return query;
@@ -52,7 +55,7 @@ export class VehicleService {
           m.name as manufacturer_name,
           md.name as model_name,
           COUNT(*) OVER() as total_count
-        FROM vehicles v
+        FROM vehicle_listings v
         LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
         LEFT JOIN models md ON v.model_id = md.id
         WHERE 1=1
@@ -185,7 +188,7 @@ export class VehicleService {
           m.logo_path as manufacturer_logo,
           md.name as model_name,
           md.body_type as model_body_type
-        FROM vehicles v
+        FROM vehicle_listings v
         LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
         LEFT JOIN models md ON v.model_id = md.id
         WHERE v.id = $1
@@ -235,7 +238,7 @@ export class VehicleService {
           m.name as manufacturer_name,
           md.name as model_name,
           vi.original_url as primary_image_url
-        FROM vehicles v
+        FROM vehicle_listings v
         LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
         LEFT JOIN models md ON v.model_id = md.id
         LEFT JOIN vehicle_images vi ON v.id = vi.vehicle_id AND vi.is_primary = TRUE
@@ -264,7 +267,7 @@ export class VehicleService {
     try {
       const vehicleQuery = `
         SELECT manufacturer_id, model_id, price_total_yen 
-        FROM vehicles 
+        FROM vehicle_listings 
         WHERE id = $1
       `;
       const vehicleResult = await pool.query(vehicleQuery, [vehicleId]);
@@ -282,7 +285,7 @@ export class VehicleService {
           m.name as manufacturer_name,
           md.name as model_name,
           vi.original_url as primary_image_url
-        FROM vehicles v
+        FROM vehicle_listings v
         LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
         LEFT JOIN models md ON v.model_id = md.id
         LEFT JOIN vehicle_images vi ON v.id = vi.vehicle_id AND vi.is_primary = TRUE
@@ -329,20 +332,25 @@ export class VehicleService {
   async createVehicle(vehicleData: Partial<Vehicle>): Promise<Vehicle> {
     try {
       const query = `
-        INSERT INTO vehicles (
-          source_id, source_url, source_site, manufacturer_id, model_id,
-          title_description, grade, body_style, price_vehicle_yen, price_total_yen,
-          monthly_payment_yen, model_year_ad, model_year_era, mileage_km, color,
-          transmission_details, engine_displacement_cc, fuel_type, drive_type,
-          has_repair_history, is_one_owner, has_warranty, is_accident_free,
-          warranty_details, maintenance_details, shaken_status, equipment_details,
-          dealer_name, location_prefecture, location_city, dealer_phone,
-          is_available, is_featured, export_status, admin_notes
-        ) VALUES (
-          $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15,
-          $16, $17, $18, $19, $20, $21, $22, $23, $24, $25, $26, $27, $28,
-          $29, $30, $31, $32, $33, $34, $35
-        ) RETURNING *
+        WITH inserted AS (
+          INSERT INTO vehicles (
+            source_id, source_url, source_site, manufacturer_id, model_id,
+            title_description, grade, body_style,
+            monthly_payment_yen, model_year_ad, model_year_era, mileage_km, color,
+            transmission_details, engine_displacement_cc, fuel_type, drive_type,
+            has_repair_history, is_one_owner, has_warranty, is_accident_free,
+            warranty_details, maintenance_details, shaken_status, equipment_details,
+            dealer_name, location_prefecture, location_city, dealer_phone,
+            is_featured, export_status, admin_notes
+          ) VALUES (
+            $1, $2, $3, $4, $5, $6, $7, $8, $11, $12, $13, $14, $15,
+            $16, $17, $18, $19, $20, $21, $22, $23, $24, $25, $26, $27, $28,
+            $29, $30, $31, $33, $34, $35
+          ) RETURNING id
+        )
+        INSERT INTO vehicle_status (vehicle_id, price_vehicle_yen, price_total_yen, is_available, last_scraped_at)
+        SELECT id, $9, $10, $32, NOW() FROM inserted
+        RETURNING vehicle_id AS id
       `;
 
       const values = [
@@ -386,7 +394,8 @@ export class VehicleService {
       const result = await pool.query(query, values);
       logger.info(`Created vehicle with ID: ${result.rows[0].id}`);
       
-      return result.rows[0];
+      const created = await pool.query('SELECT * FROM vehicle_listings WHERE id = $1', [result.rows[0].id]);
+      return created.rows[0];
     } catch (error) {
       logger.error('Error creating vehicle:', error);
       throw new Error('Failed to create vehicle');
@@ -395,23 +404,50 @@ export class VehicleService {
 
   async updateVehicle(id: number, vehicleData: Partial<Vehicle>): Promise<Vehicle | null> {
     try {
-      const fields = Object.keys(vehicleData).filter(key => key !== 'id');
-      const setClause = fields.map((field, index) => `${field} = $${index + 2}`).join(', ');
-      
-      const query = `
-        UPDATE vehicles 
-        SET ${setClause}, updated_at = NOW()
-        WHERE id = $1 
-        RETURNING *
-      `;
-
-      const values = [id, ...fields.map(field => vehicleData[field as keyof Vehicle])];
-      const result = await pool.query(query, values);
-      
-      if (result.rows.length === 0) {
-        return null;
+      const fields = Object.keys(vehicleData).filter(key => key !== 'id' && key !== 'price_misc_expenses_yen');
+      const statusFields = fields.filter(field => STATUS_FIELDS.includes(field));
+      const vehicleFields = fields.filter(field => !STATUS_FIELDS.includes(field));
+      const setClause = (columns: string[]) => columns.map((field, index) => `${field} = $${index + 2}`).join(', ');
+      const valuesFor = (columns: string[]) => [id, ...columns.map(field => vehicleData[field as keyof Vehicle])];
+
+      // Both writes on one client in one transaction; the wide vehicles row is
+      // only touched when one of its own columns changes
+      const client = await pool.connect();
+      try {
+        await client.query('BEGIN');
+
+        let updated;
+        if (vehicleFields.length > 0) {
+          updated = await client.query(
+            `UPDATE vehicles SET ${setClause(vehicleFields)}, updated_at = NOW() WHERE id = $1 RETURNING id`,
+            valuesFor(vehicleFields)
+          );
+        } else {
+          updated = await client.query('SELECT id FROM vehicles WHERE id = $1', [id]);
+        }
+
+        if (updated.rows.length === 0) {
+          await client.query('ROLLBACK');
+          return null;
+        }
+
+        if (statusFields.length > 0) {
+          await client.query(
+            `UPDATE vehicle_status SET ${setClause(statusFields)} WHERE vehicle_id = $1`,
+            valuesFor(statusFields)
+          );
+        }
+
+        await client.query('COMMIT');
+      } catch (error) {
+        await client.query('ROLLBACK');
+        throw error;
+      } finally {
+        client.release();
       }
 
+      const result = await pool.query('SELECT * FROM vehicle_listings WHERE id = $1', [id]);
+
       logger.info(`Updated vehicle with ID: ${id}`);
       return result.rows[0];
     } catch (error) {
@@ -434,13 +470,13 @@ export class VehicleService {
   async getVehicleStats() {
     try {
       const queries = [
-        'SELECT COUNT(*) as total FROM vehicles',
-        'SELECT COUNT(*) as available FROM vehicles WHERE is_available = TRUE AND export_status = \'available\'',
-        'SELECT COUNT(*) as featured FROM vehicles WHERE is_featured = TRUE',
+        'SELECT COUNT(*) as total FROM vehicle_listings',
+        'SELECT COUNT(*) as available FROM vehicle_listings WHERE is_available = TRUE AND export_status = \'available\'',
+        'SELECT COUNT(*) as featured FROM vehicle_listings WHERE is_featured = TRUE',
         `SELECT 
            m.name, 
            COUNT(*) as count 
-         FROM vehicles v 
+         FROM vehicle_listings v 
          LEFT JOIN manufacturers m ON v.manufacturer_id = m.id 
          WHERE v.is_available = TRUE 
          GROUP BY m.name 
@@ -454,7 +490,7 @@ export class VehicleService {
              ELSE 'Over ¥5M'
            END as range,
            COUNT(*) as count
-         FROM vehicles 
+         FROM vehicle_listings 
          WHERE is_available = TRUE 
          GROUP BY range`
       ];
@@ -38,10 +38,7 @@ CREATE TABLE vehicles (
     grade VARCHAR(255), -- '4.7 4WD Multi-less'
     body_style VARCHAR(100), -- 'Cross-country/SUV'
     
-    -- Pricing (stored as integers for precision)
-    price_vehicle_yen INTEGER NOT NULL,
-    price_total_yen INTEGER NOT NULL,
-    price_misc_expenses_yen INTEGER GENERATED ALWAYS AS (price_total_yen - price_vehicle_yen) STORED,
+    -- Pricing (stored as integers for precision; current prices live in vehicle_status)
     monthly_payment_yen INTEGER,
     
     -- Core Specifications
@@ -72,8 +69,7 @@ CREATE TABLE vehicles (
     location_city VARCHAR(100),
     dealer_phone VARCHAR(50),
     
-    -- Status & Management
-    is_available BOOLEAN DEFAULT TRUE,
+    -- Status & Management (availability lives in vehicle_status)
     is_featured BOOLEAN DEFAULT FALSE,
     export_status VARCHAR(50) DEFAULT 'available', -- available, reserved, sold, shipped
     admin_notes TEXT,
@@ -81,7 +77,7 @@ CREATE TABLE vehicles (
     -- Timestamps
     created_at TIMESTAMP DEFAULT NOW(),
     updated_at TIMESTAMP DEFAULT NOW(),
-    last_scraped_at TIMESTAMP,
+    content_hash CHAR(40), -- sha1 of the scraped fields; unchanged rescrapes skip the row rewrite
     
     -- Search optimization
     search_vector tsvector GENERATED ALWAYS AS (
@@ -93,6 +89,18 @@ CREATE TABLE vehicles (
     ) STORED
 );
 
+-- Volatile listing state, split off the wide vehicles row so frequent updates are small HOT updates.
+-- No indexes besides the key on purpose. Read vehicles through the vehicle_listings view below.
+CREATE TABLE vehicle_status (
+    vehicle_id INTEGER PRIMARY KEY REFERENCES vehicles(id) ON DELETE CASCADE,
+    price_vehicle_yen INTEGER,
+    price_total_yen INTEGER,
+    is_available BOOLEAN NOT NULL DEFAULT TRUE,
+    last_scraped_at TIMESTAMP,
+    sold_detected_at TIMESTAMP,
+    notes TEXT
+) WITH (fillfactor = 70);
+
 -- Vehicle Images (Self-hosted)
 CREATE TABLE vehicle_images (
     id SERIAL PRIMARY KEY,
@@ -160,14 +168,16 @@ CREATE TABLE scraper_runs (
 );
 
 -- Create indexes for performance
+CREATE UNIQUE INDEX idx_manufacturers_name_lower ON manufacturers (LOWER(name));
+CREATE UNIQUE INDEX idx_models_manufacturer_name_lower ON models (manufacturer_id, LOWER(name));
 CREATE INDEX idx_vehicles_search ON vehicles USING GIN(search_vector);
 CREATE INDEX idx_vehicles_manufacturer_model ON vehicles(manufacturer_id, model_id);
-CREATE INDEX idx_vehicles_price ON vehicles(price_total_yen);
 CREATE INDEX idx_vehicles_year_mileage ON vehicles(model_year_ad, mileage_km);
-CREATE INDEX idx_vehicles_available ON vehicles(is_available, export_status);
-CREATE INDEX idx_vehicles_featured ON vehicles(is_featured, is_available);
+CREATE INDEX idx_vehicles_export_status ON vehicles(export_status);
+CREATE INDEX idx_vehicles_featured ON vehicles(is_featured);
 CREATE INDEX idx_vehicles_source ON vehicles(source_site, source_id);
 CREATE INDEX idx_vehicle_images_vehicle ON vehicle_images(vehicle_id);
+CREATE UNIQUE INDEX idx_vehicle_images_vehicle_filename ON vehicle_images(vehicle_id, filename);
 CREATE INDEX idx_inquiries_status ON inquiries(status, created_at);
 CREATE INDEX idx_inquiries_vehicle ON inquiries(vehicle_id);
 
@@ -186,6 +196,51 @@ CREATE TRIGGER update_vehicles_updated_at
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+-- Every vehicle gets a status row, whoever inserts it
+CREATE OR REPLACE FUNCTION create_vehicle_status()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO vehicle_status (vehicle_id, last_scraped_at) VALUES (NEW.id, NOW())
+    ON CONFLICT (vehicle_id) DO NOTHING;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER create_vehicles_status
+    AFTER INSERT ON vehicles
+    FOR EACH ROW
+    EXECUTE FUNCTION create_vehicle_status();
+
+-- Vehicles with their current status, under the column names vehicles had before the split
+CREATE VIEW vehicle_listings AS
+SELECT
+    v.*,
+    s.price_vehicle_yen,
+    s.price_total_yen,
+    s.price_total_yen - s.price_vehicle_yen AS price_misc_expenses_yen,
+    s.is_available,
+    s.last_scraped_at,
+    s.sold_detected_at,
+    s.notes
+FROM vehicles v
+JOIN vehicle_status s ON s.vehicle_id = v.id;
+
+CREATE VIEW recently_sold_vehicles AS
+SELECT
+    v.*,
+    m.name as manufacturer_name,
+    md.name as model_name,
+    (SELECT vi.original_url
+     FROM vehicle_images vi
+     WHERE vi.vehicle_id = v.id AND vi.is_primary = TRUE
+     LIMIT 1) as primary_image
+FROM vehicle_listings v
+LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
+LEFT JOIN models md ON v.model_id = md.id
+WHERE v.is_available = FALSE
+AND v.sold_detected_at IS NOT NULL
+ORDER BY v.sold_detected_at DESC;
+
 -- Insert initial manufacturers
 INSERT INTO manufacturers (name, country, is_active) VALUES
 ('Toyota', 'Japan', TRUE),
@@ -50,7 +50,7 @@ async function fixAllSEO() {
         COUNT(*) as total,
         COUNT(*) FILTER (WHERE seo_metadata IS NOT NULL) as with_seo,
         COUNT(*) FILTER (WHERE seo_metadata IS NULL) as without_seo
-      FROM vehicles 
+      FROM vehicle_listings 
       WHERE is_available = TRUE
     `;
     
@@ -74,7 +74,7 @@ async function fixAllSEO() {
       const clearResult = await pool.query(`
         UPDATE vehicles 
         SET seo_metadata = NULL, seo_updated_at = NULL 
-        WHERE is_available = TRUE
+        WHERE id IN (SELECT vehicle_id FROM vehicle_status WHERE is_available = TRUE)
       `);
       logger.info(`🗑️  Cleared SEO for ${clearResult.rowCount} vehicles`);
     }
@@ -71,7 +71,7 @@ app.get('/api/vehicles/:id', async (req, res) => {
             'is_primary', vi.is_primary
           ) ORDER BY vi.image_order, vi.is_primary DESC
         ) FILTER (WHERE vi.id IS NOT NULL) as images
-      FROM vehicles v
+      FROM vehicle_listings v
       LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
       LEFT JOIN models md ON v.model_id = md.id
       LEFT JOIN vehicle_images vi ON v.id = vi.vehicle_id
@@ -1,5 +1,7 @@
 -- Database Migration for Enhanced SEO System
 -- Run this SQL to update your database structure
+-- Availability lives in vehicle_status (scrapers/add_vehicle_status.sql): read it through vehicle_listings.
+-- After adding columns to vehicles, recreate vehicle_listings (v.* is expanded when the view is created).
 
 -- 1. Add column to track when SEO was last updated
 ALTER TABLE vehicles 
@@ -7,7 +9,7 @@ ADD COLUMN IF NOT EXISTS seo_updated_at TIMESTAMP;
 
 -- 2. Create index for faster SEO queries
 CREATE INDEX IF NOT EXISTS idx_vehicles_seo_metadata 
-ON vehicles(is_available, (seo_metadata IS NULL));
+ON vehicles((seo_metadata IS NULL));
 
 CREATE INDEX IF NOT EXISTS idx_vehicles_seo_updated 
 ON vehicles(seo_updated_at);
@@ -34,7 +36,7 @@ DROP TRIGGER IF EXISTS generate_seo_trigger ON vehicles;
 CREATE TRIGGER generate_seo_trigger
   AFTER INSERT ON vehicles
   FOR EACH ROW
-  WHEN (NEW.is_available = TRUE AND NEW.seo_metadata IS NULL)
+  WHEN (NEW.seo_metadata IS NULL) -- new vehicles always start available
   EXECUTE FUNCTION trigger_generate_seo_notification();
 
 -- 6. View to monitor SEO status
@@ -52,7 +54,7 @@ SELECT
     NULLIF(COUNT(*) FILTER (WHERE is_available = TRUE), 0), 
     2
   ) as seo_coverage_percent
-FROM vehicles;
+FROM vehicle_listings;
 
 -- 7. Function to manually regenerate SEO for a specific vehicle
 CREATE OR REPLACE FUNCTION regenerate_vehicle_seo(vehicle_id INTEGER)
@@ -74,7 +76,7 @@ BEGIN
   UPDATE vehicles 
   SET seo_metadata = NULL, 
       seo_updated_at = NULL 
-  WHERE is_available = TRUE;
+  WHERE id IN (SELECT vehicle_id FROM vehicle_status WHERE is_available = TRUE);
   
   GET DIAGNOSTICS affected_rows = ROW_COUNT;
   RETURN affected_rows;
@@ -91,7 +93,7 @@ SELECT
   created_at,
   seo_metadata IS NOT NULL as has_seo,
   seo_updated_at
-FROM vehicles 
+FROM vehicle_listings 
 WHERE is_available = TRUE 
   AND seo_metadata IS NULL
 ORDER BY created_at DESC
@@ -74,7 +74,7 @@ async function testSEOSystem() {
           COUNT(*) as total,
           COUNT(*) FILTER (WHERE seo_metadata IS NOT NULL) as with_seo,
           COUNT(*) FILTER (WHERE seo_metadata IS NULL) as without_seo
-        FROM vehicles 
+        FROM vehicle_listings 
         WHERE is_available = TRUE
       `);
       
@@ -107,7 +107,7 @@ async function testSEOSystem() {
       // Get a random vehicle with SEO
       const vehicleResult = await pool.query(`
         SELECT id 
-        FROM vehicles 
+        FROM vehicle_listings 
         WHERE is_available = TRUE AND seo_metadata IS NOT NULL 
         LIMIT 1
       `);
@@ -187,7 +187,7 @@ async function testSEOSystem() {
     try {
       const sampleResult = await pool.query(`
         SELECT id, seo_metadata 
-        FROM vehicles 
+        FROM vehicle_listings 
         WHERE is_available = TRUE AND seo_metadata IS NOT NULL 
         ORDER BY RANDOM() 
         LIMIT 3
@@ -120,7 +120,7 @@ class RealAIAnalyzer:
             v.location_prefecture,
             m.name as model_name,
             mf.name as manufacturer_name
-        FROM vehicles v
+        FROM vehicle_listings v
         JOIN models m ON v.model_id = m.id
         JOIN manufacturers mf ON v.manufacturer_id = mf.id
         WHERE v.id = $1
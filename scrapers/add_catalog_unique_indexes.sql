@@ -0,0 +1,38 @@
+-- Case-insensitive unique manufacturer and model names, for get-or-create with ON CONFLICT (LOWER(name))
+
+-- Merge manufacturers whose names differ only by case into the oldest row
+WITH duplicates AS (
+    SELECT id, MIN(id) OVER (PARTITION BY LOWER(name)) AS keep_id FROM manufacturers
+)
+UPDATE models SET manufacturer_id = d.keep_id
+FROM duplicates d
+WHERE models.manufacturer_id = d.id AND d.id <> d.keep_id;
+
+WITH duplicates AS (
+    SELECT id, MIN(id) OVER (PARTITION BY LOWER(name)) AS keep_id FROM manufacturers
+)
+UPDATE vehicles SET manufacturer_id = d.keep_id
+FROM duplicates d
+WHERE vehicles.manufacturer_id = d.id AND d.id <> d.keep_id;
+
+DELETE FROM manufacturers m
+USING manufacturers older
+WHERE LOWER(m.name) = LOWER(older.name)
+AND m.id > older.id;
+
+-- Same for models within a manufacturer
+WITH duplicates AS (
+    SELECT id, MIN(id) OVER (PARTITION BY manufacturer_id, LOWER(name)) AS keep_id FROM models
+)
+UPDATE vehicles SET model_id = d.keep_id
+FROM duplicates d
+WHERE vehicles.model_id = d.id AND d.id <> d.keep_id;
+
+DELETE FROM models m
+USING models older
+WHERE m.manufacturer_id = older.manufacturer_id
+AND LOWER(m.name) = LOWER(older.name)
+AND m.id > older.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_manufacturers_name_lower ON manufacturers (LOWER(name));
+CREATE UNIQUE INDEX IF NOT EXISTS idx_models_manufacturer_name_lower ON models (manufacturer_id, LOWER(name));
@@ -0,0 +1,4 @@
+-- Fingerprint of each vehicle's scraped fields (see utils/content_hash.py).
+-- Rescrapes compare it and only rewrite rows whose content changed; NULL means "not hashed yet".
+ALTER TABLE vehicles
+ADD COLUMN IF NOT EXISTS content_hash CHAR(40);
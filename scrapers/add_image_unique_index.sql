@@ -0,0 +1,11 @@
+-- One row per (vehicle_id, filename) in vehicle_images, so gallery writes can merge with ON CONFLICT
+
+-- Remove duplicates left by earlier check-then-insert writes, keeping the oldest row
+DELETE FROM vehicle_images vi
+USING vehicle_images older
+WHERE vi.vehicle_id = older.vehicle_id
+AND vi.filename = older.filename
+AND vi.id > older.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_vehicle_images_vehicle_filename
+ON vehicle_images(vehicle_id, filename);
@@ -0,0 +1,150 @@
+-- Move volatile listing state (prices, availability, scrape/sold timestamps, notes) off the wide
+-- vehicles row into the narrow vehicle_status table. Rescrape bumps, sold sweeps and price
+-- refreshes then rewrite a small row whose only index is its key (HOT updates), and the vehicles
+-- row with its stored search_vector is only rewritten when the listing itself changes.
+--
+-- Read through the vehicle_listings view: it has every column vehicles used to have.
+-- Write the volatile fields to vehicle_status (a row is created for every new vehicle).
+-- Run once, after add_sold_tracking.sql and add_content_hash.sql (database/schema.sql already has this layout).
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS vehicle_status (
+    vehicle_id INTEGER PRIMARY KEY REFERENCES vehicles(id) ON DELETE CASCADE,
+    price_vehicle_yen INTEGER,
+    price_total_yen INTEGER,
+    is_available BOOLEAN NOT NULL DEFAULT TRUE,
+    last_scraped_at TIMESTAMP,
+    sold_detected_at TIMESTAMP,
+    notes TEXT
+) WITH (fillfactor = 70); -- free space on each page so updated versions stay on it (HOT)
+
+INSERT INTO vehicle_status (vehicle_id, price_vehicle_yen, price_total_yen, is_available,
+                            last_scraped_at, sold_detected_at, notes)
+SELECT id, price_vehicle_yen, price_total_yen, COALESCE(is_available, TRUE),
+       last_scraped_at, sold_detected_at, notes
+FROM vehicles
+ON CONFLICT (vehicle_id) DO NOTHING;
+
+-- Every vehicle gets a status row, whoever inserts it; writers then fill in prices
+CREATE OR REPLACE FUNCTION create_vehicle_status()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO vehicle_status (vehicle_id, last_scraped_at) VALUES (NEW.id, NOW())
+    ON CONFLICT (vehicle_id) DO NOTHING;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS create_vehicles_status ON vehicles;
+CREATE TRIGGER create_vehicles_status
+    AFTER INSERT ON vehicles
+    FOR EACH ROW
+    EXECUTE FUNCTION create_vehicle_status();
+
+-- Objects built on the columns being dropped (recreated over vehicle_listings below)
+DROP VIEW IF EXISTS recently_sold_vehicles;
+DROP VIEW IF EXISTS seo_status;
+DROP TRIGGER IF EXISTS generate_seo_trigger ON vehicles;
+DROP INDEX IF EXISTS idx_vehicles_seo_metadata;
+
+ALTER TABLE vehicles
+    DROP COLUMN IF EXISTS price_misc_expenses_yen,
+    DROP COLUMN IF EXISTS price_vehicle_yen,
+    DROP COLUMN IF EXISTS price_total_yen,
+    DROP COLUMN IF EXISTS is_available,
+    DROP COLUMN IF EXISTS last_scraped_at,
+    DROP COLUMN IF EXISTS sold_detected_at,
+    DROP COLUMN IF EXISTS notes;
+
+-- idx_vehicles_price, idx_vehicles_available and idx_vehicles_available_model went with the columns;
+-- vehicle_status is deliberately left without them so its updates stay HOT
+DROP INDEX IF EXISTS idx_vehicles_featured;
+CREATE INDEX IF NOT EXISTS idx_vehicles_featured ON vehicles(is_featured);
+CREATE INDEX IF NOT EXISTS idx_vehicles_export_status ON vehicles(export_status);
+
+-- v.* is expanded when the view is created: after adding columns to vehicles,
+-- DROP and re-CREATE this view (and the views below that use it)
+CREATE VIEW vehicle_listings AS
+SELECT
+    v.*,
+    s.price_vehicle_yen,
+    s.price_total_yen,
+    s.price_total_yen - s.price_vehicle_yen AS price_misc_expenses_yen,
+    s.is_available,
+    s.last_scraped_at,
+    s.sold_detected_at,
+    s.notes
+FROM vehicles v
+JOIN vehicle_status s ON s.vehicle_id = v.id;
+
+CREATE VIEW recently_sold_vehicles AS
+SELECT
+    v.*,
+    m.name as manufacturer_name,
+    md.name as model_name,
+    (SELECT vi.original_url
+     FROM vehicle_images vi
+     WHERE vi.vehicle_id = v.id AND vi.is_primary = TRUE
+     LIMIT 1) as primary_image
+FROM vehicle_listings v
+LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
+LEFT JOIN models md ON v.model_id = md.id
+WHERE v.is_available = FALSE
+AND v.sold_detected_at IS NOT NULL
+ORDER BY v.sold_detected_at DESC;
+
+-- Only where the SEO migration (opusfix/seo-database-migration.sql) has been applied
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns
+               WHERE table_name = 'vehicles' AND column_name = 'seo_metadata') THEN
+        CREATE INDEX IF NOT EXISTS idx_vehicles_seo_metadata ON vehicles((seo_metadata IS NULL));
+        EXECUTE $view$
+            CREATE VIEW seo_status AS
+            SELECT
+              COUNT(*) FILTER (WHERE is_available = TRUE) as total_vehicles,
+              COUNT(*) FILTER (WHERE is_available = TRUE AND seo_metadata IS NOT NULL) as with_seo,
+              COUNT(*) FILTER (WHERE is_available = TRUE AND seo_metadata IS NULL) as without_seo,
+              COUNT(*) FILTER (WHERE is_available = TRUE AND seo_metadata IS NOT NULL
+                               AND seo_updated_at > NOW() - INTERVAL '1 day') as updated_today,
+              COUNT(*) FILTER (WHERE is_available = TRUE AND seo_metadata IS NOT NULL
+                               AND seo_updated_at < NOW() - INTERVAL '30 days') as outdated_seo,
+              ROUND(
+                100.0 * COUNT(*) FILTER (WHERE is_available = TRUE AND seo_metadata IS NOT NULL) /
+                NULLIF(COUNT(*) FILTER (WHERE is_available = TRUE), 0),
+                2
+              ) as seo_coverage_percent
+            FROM vehicle_listings
+        $view$;
+        IF EXISTS (SELECT 1 FROM pg_proc WHERE proname = 'trigger_generate_seo_notification') THEN
+            -- New vehicles always start available, so the old is_available condition is implied
+            CREATE TRIGGER generate_seo_trigger
+              AFTER INSERT ON vehicles
+              FOR EACH ROW
+              WHEN (NEW.seo_metadata IS NULL)
+              EXECUTE FUNCTION trigger_generate_seo_notification();
+        END IF;
+        IF EXISTS (SELECT 1 FROM pg_proc WHERE proname = 'regenerate_all_seo') THEN
+            EXECUTE $fn$
+                CREATE OR REPLACE FUNCTION regenerate_all_seo()
+                RETURNS INTEGER AS $body$
+                DECLARE
+                  affected_rows INTEGER;
+                BEGIN
+                  UPDATE vehicles
+                  SET seo_metadata = NULL,
+                      seo_updated_at = NULL
+                  WHERE id IN (SELECT vehicle_id FROM vehicle_status WHERE is_available = TRUE);
+
+                  GET DIAGNOSTICS affected_rows = ROW_COUNT;
+                  RETURN affected_rows;
+                END;
+                $body$ LANGUAGE plpgsql
+            $fn$;
+        END IF;
+    END IF;
+END
+$$;
+
+COMMIT;
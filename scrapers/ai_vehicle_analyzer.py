@@ -120,7 +120,7 @@ Focus on Japanese vehicle quality, maintenance standards, and specific savings."
             v.mileage_km,
             m.name as model_name,
             v.created_at
-        FROM vehicles v
+        FROM vehicle_listings v
         JOIN models m ON v.model_id = m.id
         WHERE v.ai_analysis IS NULL
         ORDER BY v.created_at DESC
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark listing parser backends against the saved CarSensor listing page
+Reports cassettes/second for each backend and checks they extract the same fields
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.listing_parser import PARSER_BACKENDS, get_listing_parser
+
+FIXTURE = Path(__file__).parent.parent / "carsensor" / "webpage.html"
+
+
+def run_backend(name, html, iterations):
+    """Parse the page `iterations` times and return (cassettes, seconds)"""
+    parser = get_listing_parser(name)
+    if parser.name != name:
+        return None, None
+
+    # Warm up once so import and XPath compilation costs are not measured
+    cassettes = parser.parse_cassettes(html)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parser.parse_cassettes(html)
+    elapsed = time.perf_counter() - start
+
+    return cassettes, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark CarSensor listing parser backends')
+    parser.add_argument('--fixture', type=Path, default=FIXTURE,
+                       help=f'Listing page HTML to parse (default: {FIXTURE})')
+    parser.add_argument('--iterations', type=int, default=20,
+                       help='Times to parse the page per backend (default: 20)')
+    args = parser.parse_args()
+
+    html = args.fixture.read_text(encoding='utf-8')
+    print(f"📄 Fixture: {args.fixture} ({args.fixture.stat().st_size / 1024:.0f} KB)")
+    print(f"🔁 Iterations: {args.iterations}")
+    print("=" * 60)
+
+    reference = None
+    results = {}
+    for name in PARSER_BACKENDS:
+        cassettes, elapsed = run_backend(name, html, args.iterations)
+        if cassettes is None:
+            print(f"{name:8} | unavailable")
+            continue
+
+        total = len(cassettes) * args.iterations
+        rate = total / elapsed if elapsed else float('inf')
+        results[name] = rate
+        print(f"{name:8} | {len(cassettes)} cassettes/page | "
+              f"{elapsed / args.iterations * 1000:8.1f} ms/page | {rate:10.0f} cassettes/s")
+
+        if reference is None:
+            reference = cassettes
+        elif cassettes != reference:
+            print(f"❌ {name} extracted different fields than {next(iter(results))}")
+
+    if len(results) > 1:
+        baseline = results.get("bs4")
+        print("=" * 60)
+        for name, rate in results.items():
+            if baseline and name != "bs4":
+                print(f"⚡ {name} is {rate / baseline:.1f}x faster than bs4")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,7 +25,7 @@ async def check_database():
             SELECT v.id, v.title_description, v.price_vehicle_yen, 
                    m.name as manufacturer, mo.name as model,
                    (SELECT COUNT(*) FROM vehicle_images WHERE vehicle_id = v.id) as image_count
-            FROM vehicles v
+            FROM vehicle_listings v
             LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
             LEFT JOIN models mo ON v.model_id = mo.id
             ORDER BY v.created_at DESC
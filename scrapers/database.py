@@ -5,10 +5,12 @@ Handles all database operations for the scraping system
 
 import asyncio
 import asyncpg
-from datetime import datetime
 from typing import Dict, List, Optional, Any
 from loguru import logger
 
+from utils.catalog_cache import CatalogCache
+from utils.content_hash import content_hash
+
 
 class DatabaseManager:
     """Manages database connections and operations for the scraper"""
@@ -16,6 +18,7 @@ class DatabaseManager:
     def __init__(self, database_url: str):
         self.database_url = database_url
         self.pool = None
+        self.catalog = None
     
     async def connect(self):
         """Initialize database connection pool"""
@@ -28,6 +31,8 @@ class DatabaseManager:
                     command_timeout=60
                 )
                 logger.info("Database connection pool created")
+                self.catalog = CatalogCache(self.pool)
+                await self.catalog.warm()
             except Exception as e:
                 logger.error(f"Failed to create database pool: {e}")
                 raise
@@ -83,98 +88,91 @@ class DatabaseManager:
     # Manufacturer and Model operations
     async def get_or_create_manufacturer(self, name: str, country: str = 'Japan') -> int:
         """Get manufacturer ID or create if not exists"""
-        # Try to find existing manufacturer
-        result = await self._execute_single(
-            "SELECT id FROM manufacturers WHERE LOWER(name) = LOWER($1)",
-            name
-        )
-        
-        if result:
-            return result['id']
-        
-        # Create new manufacturer
-        result = await self._execute_single(
-            """
-            INSERT INTO manufacturers (name, country, is_active)
-            VALUES ($1, $2, TRUE)
-            RETURNING id
-            """,
-            name, country
-        )
-        
-        logger.info(f"Created new manufacturer: {name}")
-        return result['id']
+        return await self.catalog.manufacturer_id(name, country)
     
     async def get_or_create_model(self, manufacturer_id: int, name: str, body_type: str = None) -> int:
         """Get model ID or create if not exists"""
-        # Try to find existing model
-        result = await self._execute_single(
-            "SELECT id FROM models WHERE manufacturer_id = $1 AND LOWER(name) = LOWER($2)",
-            manufacturer_id, name
-        )
-        
-        if result:
-            return result['id']
-        
-        # Create new model
-        result = await self._execute_single(
-            """
-            INSERT INTO models (manufacturer_id, name, body_type, is_popular)
-            VALUES ($1, $2, $3, FALSE)
-            RETURNING id
-            """,
-            manufacturer_id, name, body_type
-        )
-        
-        logger.info(f"Created new model: {name}")
-        return result['id']
+        return await self.catalog.model_id(manufacturer_id, name, body_type)
     
     # Vehicle operations
+    # Column order of _extract_vehicle_values (the wide vehicles row)
+    VEHICLE_COLUMNS = (
+        'source_id', 'source_url', 'source_site', 'manufacturer_id', 'model_id',
+        'title_description', 'grade', 'body_style',
+        'monthly_payment_yen', 'model_year_ad', 'model_year_era', 'mileage_km', 'color',
+        'transmission_details', 'engine_displacement_cc', 'fuel_type', 'drive_type',
+        'has_repair_history', 'is_one_owner', 'has_warranty', 'is_accident_free',
+        'warranty_details', 'maintenance_details', 'shaken_status', 'equipment_details',
+        'dealer_name', 'location_prefecture', 'location_city', 'dealer_phone',
+        'is_featured', 'export_status'
+    )
+    # Columns a re-scrape overwrites (same set as update_vehicle)
+    VEHICLE_UPDATE_COLUMNS = (
+        'source_url', 'title_description', 'grade', 'body_style',
+        'monthly_payment_yen',
+        'mileage_km', 'color', 'transmission_details',
+        'engine_displacement_cc', 'fuel_type', 'drive_type',
+        'has_repair_history', 'is_one_owner', 'has_warranty',
+        'is_accident_free', 'warranty_details', 'maintenance_details',
+        'shaken_status', 'equipment_details', 'dealer_name',
+        'location_prefecture', 'location_city', 'dealer_phone'
+    )
+    # Column order of _extract_status_values (the narrow vehicle_status row; last_scraped_at is set to NOW())
+    STATUS_COLUMNS = ('price_vehicle_yen', 'price_total_yen', 'is_available')
+    
     async def get_vehicle_by_source_id(self, source_id: str, source_site: str) -> Optional[Dict]:
         """Get vehicle by source ID and site"""
         result = await self._execute_single(
-            "SELECT * FROM vehicles WHERE source_id = $1 AND source_site = $2",
+            "SELECT * FROM vehicle_listings WHERE source_id = $1 AND source_site = $2",
             source_id, source_site
         )
         
         return dict(result) if result else None
     
     async def create_vehicle(self, vehicle_data: Dict) -> int:
-        """Create a new vehicle record"""
+        """Create a new vehicle record and its status row"""
         query = """
-        INSERT INTO vehicles (
-            source_id, source_url, source_site, manufacturer_id, model_id,
-            title_description, grade, body_style, price_vehicle_yen, price_total_yen,
-            monthly_payment_yen, model_year_ad, model_year_era, mileage_km, color,
-            transmission_details, engine_displacement_cc, fuel_type, drive_type,
-            has_repair_history, is_one_owner, has_warranty, is_accident_free,
-            warranty_details, maintenance_details, shaken_status, equipment_details,
-            dealer_name, location_prefecture, location_city, dealer_phone,
-            is_available, is_featured, export_status, last_scraped_at
-        ) VALUES (
-            $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15,
-            $16, $17, $18, $19, $20, $21, $22, $23, $24, $25, $26, $27, $28,
-            $29, $30, $31, $32, $33, $34, $35
-        ) RETURNING id
+        WITH inserted AS (
+            INSERT INTO vehicles (
+                source_id, source_url, source_site, manufacturer_id, model_id,
+                title_description, grade, body_style,
+                monthly_payment_yen, model_year_ad, model_year_era, mileage_km, color,
+                transmission_details, engine_displacement_cc, fuel_type, drive_type,
+                has_repair_history, is_one_owner, has_warranty, is_accident_free,
+                warranty_details, maintenance_details, shaken_status, equipment_details,
+                dealer_name, location_prefecture, location_city, dealer_phone,
+                is_featured, export_status, content_hash
+            ) VALUES (
+                $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15,
+                $16, $17, $18, $19, $20, $21, $22, $23, $24, $25, $26, $27, $28,
+                $29, $30, $31, $32
+            ) RETURNING id
+        )
+        INSERT INTO vehicle_status (vehicle_id, price_vehicle_yen, price_total_yen, is_available, last_scraped_at)
+        SELECT id, $33, $34, $35, NOW() FROM inserted
+        RETURNING vehicle_id AS id
         """
         
-        result = await self._execute_single(query, *self._extract_vehicle_values(vehicle_data))
+        values = self._extract_vehicle_values(vehicle_data)
+        values.append(self._content_hash(values))
+        values.extend(self._extract_status_values(vehicle_data))
+        result = await self._execute_single(query, *values)
         return result['id']
     
     async def update_vehicle(self, vehicle_id: int, vehicle_data: Dict):
-        """Update an existing vehicle record"""
+        """Update an existing vehicle record (the wide row only if its content_hash changed)"""
         query = """
         UPDATE vehicles SET
             source_url = $2, title_description = $3, grade = $4, body_style = $5,
-            price_vehicle_yen = $6, price_total_yen = $7, monthly_payment_yen = $8,
-            mileage_km = $9, color = $10, transmission_details = $11,
-            engine_displacement_cc = $12, fuel_type = $13, drive_type = $14,
-            has_repair_history = $15, is_one_owner = $16, has_warranty = $17,
-            is_accident_free = $18, warranty_details = $19, maintenance_details = $20,
-            shaken_status = $21, equipment_details = $22, dealer_name = $23,
-            location_prefecture = $24, location_city = $25, dealer_phone = $26,
-            is_available = $27, last_scraped_at = $28, updated_at = NOW()
-        WHERE id = $1
+            monthly_payment_yen = $6,
+            mileage_km = $7, color = $8, transmission_details = $9,
+            engine_displacement_cc = $10, fuel_type = $11, drive_type = $12,
+            has_repair_history = $13, is_one_owner = $14, has_warranty = $15,
+            is_accident_free = $16, warranty_details = $17, maintenance_details = $18,
+            shaken_status = $19, equipment_details = $20, dealer_name = $21,
+            location_prefecture = $22, location_city = $23, dealer_phone = $24,
+            content_hash = $25, updated_at = NOW()
+        WHERE id = $1 AND content_hash IS DISTINCT FROM $25
         """
         
         values = [
@@ -183,8 +181,6 @@ class DatabaseManager:
             vehicle_data['title_description'],
             vehicle_data.get('grade'),
             vehicle_data.get('body_style'),
-            vehicle_data['price_vehicle_yen'],
-            vehicle_data['price_total_yen'],
             vehicle_data.get('monthly_payment_yen'),
             vehicle_data['mileage_km'],
             vehicle_data.get('color'),
@@ -204,11 +200,103 @@ class DatabaseManager:
             vehicle_data.get('location_prefecture'),
             vehicle_data.get('location_city'),
             vehicle_data.get('dealer_phone'),
-            vehicle_data.get('is_available', True),
-            datetime.now()
+            self._content_hash(self._extract_vehicle_values(vehicle_data))
         ]
         
         await self._execute_command(query, *values)
+        await self._execute_command(
+            """
+            INSERT INTO vehicle_status (vehicle_id, price_vehicle_yen, price_total_yen, is_available, last_scraped_at)
+            VALUES ($1, $2, $3, $4, NOW())
+            ON CONFLICT (vehicle_id) DO UPDATE SET
+                price_vehicle_yen = EXCLUDED.price_vehicle_yen,
+                price_total_yen = EXCLUDED.price_total_yen,
+                is_available = EXCLUDED.is_available,
+                last_scraped_at = NOW()
+            """,
+            vehicle_id, *self._extract_status_values(vehicle_data)
+        )
+    
+    async def upsert_vehicles(self, vehicles_data: List[Dict]) -> List[Dict]:
+        """
+        Insert or update a batch of vehicles in one statement.
+        Existing vehicles rows are only rewritten when their content_hash
+        changed; prices, availability and last_scraped_at are written to
+        vehicle_status for every vehicle in the batch.
+        Returns {'id', 'source_id', 'inserted', 'changed'} per vehicle.
+        """
+        if not vehicles_data:
+            return []
+        
+        columns = self.VEHICLE_COLUMNS + ('content_hash',)
+        width = len(columns)
+        rows = ", ".join(
+            "(" + ", ".join(f"${i * width + c}" for c in range(1, width + 1)) + ")"
+            for i in range(len(vehicles_data))
+        )
+        # Status arrays follow the row values: source_ids, then one per STATUS_COLUMNS
+        first = len(vehicles_data) * width + 1
+        source_ids, price_vehicle, price_total, available = (f"${first + n}" for n in range(4))
+        updates = ", ".join(f"{column} = EXCLUDED.{column}"
+                            for column in self.VEHICLE_UPDATE_COLUMNS + ('content_hash',))
+        query = f"""
+        WITH previous AS (
+            SELECT v.id, v.source_id, s.price_vehicle_yen, s.price_total_yen, s.is_available
+            FROM vehicles v
+            LEFT JOIN vehicle_status s ON s.vehicle_id = v.id
+            WHERE v.source_id = ANY({source_ids}::text[])
+        ),
+        upserted AS (
+            INSERT INTO vehicles ({", ".join(columns)})
+            VALUES {rows}
+            ON CONFLICT (source_id) DO UPDATE SET {updates}, updated_at = NOW()
+            WHERE vehicles.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+            RETURNING id, source_id, (xmax = 0) AS inserted
+        ),
+        ids AS (
+            SELECT id, source_id, inserted, TRUE AS rewritten FROM upserted
+            UNION ALL
+            SELECT id, source_id, FALSE, FALSE FROM previous
+            WHERE source_id NOT IN (SELECT source_id FROM upserted)
+        ),
+        incoming AS (
+            SELECT * FROM unnest({source_ids}::text[], {price_vehicle}::int[], {price_total}::int[], {available}::bool[])
+                AS i(source_id, price_vehicle_yen, price_total_yen, is_available)
+        ),
+        status AS (
+            INSERT INTO vehicle_status (vehicle_id, price_vehicle_yen, price_total_yen, is_available, last_scraped_at)
+            SELECT ids.id, i.price_vehicle_yen, i.price_total_yen, i.is_available, NOW()
+            FROM ids JOIN incoming i USING (source_id)
+            ON CONFLICT (vehicle_id) DO UPDATE SET
+                price_vehicle_yen = EXCLUDED.price_vehicle_yen,
+                price_total_yen = EXCLUDED.price_total_yen,
+                is_available = EXCLUDED.is_available,
+                last_scraped_at = NOW()
+        )
+        SELECT ids.id, ids.source_id, ids.inserted,
+               ids.rewritten
+               OR p.price_vehicle_yen IS DISTINCT FROM i.price_vehicle_yen
+               OR p.price_total_yen IS DISTINCT FROM i.price_total_yen
+               OR p.is_available IS DISTINCT FROM i.is_available AS changed
+        FROM ids
+        JOIN incoming i USING (source_id)
+        LEFT JOIN previous p USING (source_id)
+        """
+        
+        values = []
+        for vehicle_data in vehicles_data:
+            row = self._extract_vehicle_values(vehicle_data)
+            values.extend(row)
+            values.append(self._content_hash(row))
+        values.append([vehicle_data['source_id'] for vehicle_data in vehicles_data])
+        statuses = [self._extract_status_values(vehicle_data) for vehicle_data in vehicles_data]
+        values.extend(list(column) for column in zip(*statuses))
+        return [dict(row) for row in await self._execute_query(query, *values)]
+    
+    def _content_hash(self, values: List) -> str:
+        """Hash of the columns a re-scrape rewrites, from a row of _extract_vehicle_values"""
+        row = dict(zip(self.VEHICLE_COLUMNS, values))
+        return content_hash([row[column] for column in self.VEHICLE_UPDATE_COLUMNS])
     
     def _extract_vehicle_values(self, vehicle_data: Dict) -> List:
         """Extract vehicle values in the correct order for INSERT"""
@@ -221,8 +309,6 @@ class DatabaseManager:
             vehicle_data['title_description'],
             vehicle_data.get('grade'),
             vehicle_data.get('body_style'),
-            vehicle_data['price_vehicle_yen'],
-            vehicle_data['price_total_yen'],
             vehicle_data.get('monthly_payment_yen'),
             vehicle_data['model_year_ad'],
             vehicle_data.get('model_year_era'),
@@ -244,10 +330,16 @@ class DatabaseManager:
             vehicle_data.get('location_prefecture'),
             vehicle_data.get('location_city'),
             vehicle_data.get('dealer_phone'),
-            vehicle_data.get('is_available', True),
             vehicle_data.get('is_featured', False),
-            vehicle_data.get('export_status', 'available'),
-            datetime.now()
+            vehicle_data.get('export_status', 'available')
+        ]
+    
+    def _extract_status_values(self, vehicle_data: Dict) -> List:
+        """Extract vehicle_status values in STATUS_COLUMNS order"""
+        return [
+            vehicle_data['price_vehicle_yen'],
+            vehicle_data['price_total_yen'],
+            vehicle_data.get('is_available', True)
         ]
     
     # Vehicle Images
@@ -275,6 +367,41 @@ class DatabaseManager:
         
         return result['id']
     
+    async def create_vehicle_images(self, images_data: List[Dict]):
+        """Save a vehicle's gallery: COPY into a staging table, then one INSERT ... ON CONFLICT merge"""
+        if not images_data:
+            return
+        
+        columns = ('vehicle_id', 'original_url', 'local_path', 'filename',
+                   'is_primary', 'alt_text', 'file_size', 'image_order')
+        records = [
+            (image_data['vehicle_id'], image_data.get('original_url'), image_data['local_path'],
+             image_data['filename'], image_data.get('is_primary', False), image_data.get('alt_text'),
+             image_data.get('file_size'), image_data.get('image_order', 0))
+            for image_data in images_data
+        ]
+        
+        try:
+            async with self.pool.acquire() as conn:
+                async with conn.transaction():
+                    await conn.execute("""
+                        CREATE TEMP TABLE IF NOT EXISTS vehicle_images_staging (
+                            vehicle_id INTEGER, original_url TEXT, local_path VARCHAR(512), filename VARCHAR(255),
+                            is_primary BOOLEAN, alt_text VARCHAR(255), file_size INTEGER, image_order INTEGER
+                        ) ON COMMIT DELETE ROWS
+                    """)
+                    await conn.copy_records_to_table('vehicle_images_staging', records=records, columns=columns)
+                    await conn.execute(f"""
+                        INSERT INTO vehicle_images ({', '.join(columns)})
+                        SELECT DISTINCT ON (vehicle_id, filename) {', '.join(columns)}
+                        FROM vehicle_images_staging
+                        ORDER BY vehicle_id, filename, image_order
+                        ON CONFLICT (vehicle_id, filename) DO NOTHING
+                    """)
+        except Exception as e:
+            logger.error(f"Failed to save {len(records)} vehicle images: {e}")
+            raise
+    
     # Scraper Run Tracking
     async def create_scraper_run(self, scraper_name: str) -> int:
         """Create a new scraper run record"""
@@ -321,7 +448,7 @@ class DatabaseManager:
             COUNT(*) FILTER (WHERE is_available = true) as available_vehicles,
             COUNT(*) FILTER (WHERE is_featured = true) as featured_vehicles,
             AVG(price_total_yen) as avg_price
-        FROM vehicles
+        FROM vehicle_listings
         """
         
         result = await self._execute_single(stats_query)
@@ -18,6 +18,7 @@ from loguru import logger
 import asyncpg
 import re
 from translator import VehicleTranslator
+from utils.catalog_cache import CatalogCache
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
@@ -35,6 +36,7 @@ class DatabaseManager:
     def __init__(self, database_url):
         self.database_url = database_url
         self.pool = None
+        self.catalog = None
 
     async def connect(self):
         if not self.pool:
@@ -46,6 +48,8 @@ class DatabaseManager:
                     command_timeout=60
                 )
                 logger.info("Database connection pool created")
+                self.catalog = CatalogCache(self.pool)
+                await self.catalog.warm()
             except Exception as e:
                 logger.error(f"Failed to connect to the database: {e}")
                 raise
@@ -57,58 +61,11 @@ class DatabaseManager:
 
     async def get_or_create_manufacturer(self, name):
         """Get manufacturer ID or create if doesn't exist"""
-        async with self.pool.acquire() as conn:
-            try:
-                # Try to find existing manufacturer
-                existing = await conn.fetchrow(
-                    "SELECT id FROM manufacturers WHERE LOWER(name) = LOWER($1)", name
-                )
-                
-                if existing:
-                    logger.info(f"Found existing manufacturer: {name} (ID: {existing['id']})")
-                    return existing['id']
-                
-                # Create new manufacturer
-                manufacturer_id = await conn.fetchval(
-                    """
-                    INSERT INTO manufacturers (name, country, is_active)
-                    VALUES ($1, 'Japan', TRUE)
-                    RETURNING id
-                    """, name
-                )
-                logger.success(f"✅ Created new manufacturer: {name} (ID: {manufacturer_id})")
-                return manufacturer_id
-            except Exception as e:
-                logger.error(f"Error in get_or_create_manufacturer: {e}")
-                raise
+        return await self.catalog.manufacturer_id(name)
 
     async def get_or_create_model(self, manufacturer_id, model_name):
         """Get model ID or create if doesn't exist"""
-        async with self.pool.acquire() as conn:
-            try:
-                # Try to find existing model
-                existing = await conn.fetchrow(
-                    "SELECT id FROM models WHERE manufacturer_id = $1 AND LOWER(name) = LOWER($2)",
-                    manufacturer_id, model_name
-                )
-                
-                if existing:
-                    logger.info(f"Found existing model: {model_name} (ID: {existing['id']})")
-                    return existing['id']
-                
-                # Create new model
-                model_id = await conn.fetchval(
-                    """
-                    INSERT INTO models (manufacturer_id, name, body_type, is_popular)
-                    VALUES ($1, $2, 'SUV', TRUE)
-                    RETURNING id
-                    """, manufacturer_id, model_name
-                )
-                logger.success(f"✅ Created new model: {model_name} (ID: {model_id})")
-                return model_id
-            except Exception as e:
-                logger.error(f"Error in get_or_create_model: {e}")
-                raise
+        return await self.catalog.model_id(manufacturer_id, model_name, body_type='SUV', is_popular=True)
 
     async def create_vehicle(self, vehicle):
         """Create or update vehicle with detailed error logging"""
@@ -120,7 +77,7 @@ class DatabaseManager:
                 # First try to find existing vehicle
                 logger.info(f"Checking for existing vehicle with source_id: {vehicle['source_id']}")
                 existing = await conn.fetchrow(
-                    "SELECT id, is_available FROM vehicles WHERE source_id = $1 AND source_site = $2",
+                    "SELECT id, is_available FROM vehicle_listings WHERE source_id = $1 AND source_site = $2",
                     vehicle["source_id"], vehicle["source_site"]
                 )
                 
@@ -132,17 +89,21 @@ class DatabaseManager:
                     logger.info(f"Updating existing vehicle {existing_id}")
                     await conn.execute(
                         """
-                        UPDATE vehicles SET
-                            source_url = $2,
-                            title_description = $3,
+                        WITH listing AS (
+                            UPDATE vehicles SET
+                                source_url = $2,
+                                title_description = $3,
+                                mileage_km = $6,
+                                location_prefecture = $7,
+                                model_year_ad = $8,
+                                updated_at = NOW()
+                            WHERE id = $1
+                        )
+                        UPDATE vehicle_status SET
                             price_vehicle_yen = $4,
                             price_total_yen = $5,
-                            mileage_km = $6,
-                            location_prefecture = $7,
-                            model_year_ad = $8,
-                            last_scraped_at = NOW(),
-                            updated_at = NOW()
-                        WHERE id = $1
+                            last_scraped_at = NOW()
+                        WHERE vehicle_id = $1
                         """,
                         existing_id, vehicle["source_url"], 
                         vehicle["title_description"], vehicle["price_vehicle_yen"],
@@ -158,14 +119,18 @@ class DatabaseManager:
                     
                     vehicle_id = await conn.fetchval(
                         """
-                        INSERT INTO vehicles (
-                            source_id, source_url, source_site, manufacturer_id, model_id, 
-                            title_description, price_vehicle_yen, price_total_yen, 
-                            model_year_ad, mileage_km, location_prefecture,
-                            has_repair_history, has_warranty, is_available, last_scraped_at
-                        ) VALUES (
-                            $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, TRUE, NOW()
-                        ) RETURNING id
+                        WITH inserted AS (
+                            INSERT INTO vehicles (
+                                source_id, source_url, source_site, manufacturer_id, model_id, 
+                                title_description, model_year_ad, mileage_km, location_prefecture,
+                                has_repair_history, has_warranty
+                            ) VALUES (
+                                $1, $2, $3, $4, $5, $6, $9, $10, $11, $12, $13
+                            ) RETURNING id
+                        )
+                        INSERT INTO vehicle_status (vehicle_id, price_vehicle_yen, price_total_yen, is_available, last_scraped_at)
+                        SELECT id, $7, $8, TRUE, NOW() FROM inserted
+                        RETURNING vehicle_id
                         """,
                         vehicle["source_id"], vehicle["source_url"], vehicle["source_site"], 
                         vehicle["manufacturer_id"], vehicle["model_id"], vehicle["title_description"], 
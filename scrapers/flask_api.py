@@ -7,7 +7,7 @@ from flask import Flask, jsonify, request
 from flask_cors import CORS
 import asyncpg
 import asyncio
-import requests
+from utils.http_client import get_http_client
 
 app = Flask(__name__)
 CORS(app)
@@ -46,7 +46,7 @@ def featured_vehicles():
           m.name as manufacturer_name,
           md.name as model_name,
           vi.original_url as primary_image_url
-        FROM vehicles v
+        FROM vehicle_listings v
         LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
         LEFT JOIN models md ON v.model_id = md.id
         LEFT JOIN vehicle_images vi ON v.id = vi.vehicle_id AND vi.is_primary = TRUE
@@ -101,7 +101,7 @@ def get_vehicle_detail(vehicle_id):
           v.*,
           m.name as manufacturer_name,
           md.name as model_name
-        FROM vehicles v
+        FROM vehicle_listings v
         LEFT JOIN manufacturers m ON v.manufacturer_id = m.id
         LEFT JOIN models md ON v.model_id = md.id
         WHERE v.id = %s
@@ -181,7 +181,8 @@ def image_proxy():
             'Accept': 'image/*'
         }
         
-        response = requests.get(image_url, headers=headers, timeout=10)
+        # Pooled keep-alive session instead of a new connection per image
+        response = get_http_client().sync_session().get(image_url, headers=headers, timeout=10)
         
         if response.status_code == 200:
             return Response(
@@ -9,7 +9,6 @@ import aiofiles
 from pathlib import Path
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
@@ -17,6 +16,8 @@ import time
 import re
 from loguru import logger
 from typing import List, Dict, Optional
+from utils.http_client import get_http_client
+from utils.browser_profile import apply_request_blocking, lean_chrome_options
 
 class HighResImageDownloader:
     """Downloads high-resolution images from CarSensor vehicle pages"""
@@ -26,17 +27,10 @@ class HighResImageDownloader:
         self.vehicles_dir = self.images_dir / "vehicles"
         self.vehicles_dir.mkdir(parents=True, exist_ok=True)
         
-        # Setup Chrome options for headless browsing
-        self.chrome_options = Options()
-        self.chrome_options.add_argument("--headless")
-        self.chrome_options.add_argument("--no-sandbox")
-        self.chrome_options.add_argument("--disable-dev-shm-usage")
-        self.chrome_options.add_argument("--disable-gpu")
-        self.chrome_options.add_argument("--window-size=1920,1080")
-        self.chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
+        # Lean headless profile: the gallery is read from src attributes, images are downloaded separately
+        self.chrome_options = lean_chrome_options("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
         # For WSL/Linux without display
         self.chrome_options.add_argument("--remote-debugging-port=9222")
-        self.chrome_options.add_argument("--disable-extensions")
         
         # Try to find Chrome binary
         chrome_paths = [
@@ -77,25 +71,22 @@ class HighResImageDownloader:
             # Start browser
             try:
                 driver = webdriver.Chrome(options=self.chrome_options)
+                apply_request_blocking(driver)
             except Exception as e:
                 logger.warning(f"Failed to start Chrome for vehicle {vehicle_id}: {e}")
                 return []
             driver.get(carsensor_url)
             
-            # Wait for page to load
-            await asyncio.sleep(3)
-            
             # Find and click on the first image to open gallery
             try:
                 # Look for image gallery trigger (usually the first large image)
+                # Presence, not clickability: with images blocked an <img> may have no rendered size
                 first_image = WebDriverWait(driver, 10).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, ".vehicle-image, .main-image, .photo-main img, .detail-photo img"))
+                    EC.presence_of_element_located((By.CSS_SELECTOR, ".vehicle-image, .main-image, .photo-main img, .detail-photo img"))
                 )
-                first_image.click()
+                driver.execute_script("arguments[0].click();", first_image)
                 logger.debug("Clicked on main image to open gallery")
-                
-                # Wait for gallery to open
-                await asyncio.sleep(2)
+                self._wait_for_gallery(driver)
                 
             except TimeoutException:
                 logger.warning("Could not find clickable main image, trying alternative selectors")
@@ -103,7 +94,7 @@ class HighResImageDownloader:
                 try:
                     gallery_button = driver.find_element(By.CSS_SELECTOR, ".photo-gallery-btn, .view-all-photos, .gallery-trigger")
                     gallery_button.click()
-                    await asyncio.sleep(2)
+                    self._wait_for_gallery(driver)
                 except NoSuchElementException:
                     logger.error("Could not open image gallery")
                     driver.quit()
@@ -116,9 +107,7 @@ class HighResImageDownloader:
             # Method 1: Try to find all images in the current gallery view
             try:
                 # Common selectors for high-res images in CarSensor galleries
-                image_elements = driver.find_elements(By.CSS_SELECTOR, 
-                    ".gallery-image img, .photo-gallery img, .vehicle-photo img, .detail-image img, .large-image img"
-                )
+                image_elements = driver.find_elements(By.CSS_SELECTOR, self.GALLERY_IMAGE_SELECTOR)
                 
                 for img_element in image_elements:
                     src = img_element.get_attribute("src")
@@ -148,10 +137,9 @@ class HighResImageDownloader:
                     
                     for _ in range(max_images):
                         # Get current image URL
+                        current_url = None
                         try:
-                            current_img = driver.find_element(By.CSS_SELECTOR, 
-                                ".active-image img, .current-image img, .gallery-main img"
-                            )
+                            current_img = driver.find_element(By.CSS_SELECTOR, self.CURRENT_IMAGE_SELECTOR)
                             src = current_img.get_attribute("src")
                             data_src = current_img.get_attribute("data-src")
                             current_url = data_src if data_src else src
@@ -171,7 +159,7 @@ class HighResImageDownloader:
                                 next_btn = driver.find_element(By.CSS_SELECTOR, selector)
                                 if next_btn.is_enabled():
                                     next_btn.click()
-                                    await asyncio.sleep(1)
+                                    self._wait_for_photo_change(driver, current_url)
                                     next_clicked = True
                                     break
                             except NoSuchElementException:
@@ -193,11 +181,11 @@ class HighResImageDownloader:
             
             # Download all images
             downloaded_paths = []
-            async with aiohttp.ClientSession() as session:
-                for i, url in enumerate(high_res_urls):
-                    local_path = await self._download_single_image(session, url, vehicle_dir, i)
-                    if local_path:
-                        downloaded_paths.append(local_path)
+            session = await get_http_client().session()
+            for i, url in enumerate(high_res_urls):
+                local_path = await self._download_single_image(session, url, vehicle_dir, i)
+                if local_path:
+                    downloaded_paths.append(local_path)
             
             logger.info(f"Successfully downloaded {len(downloaded_paths)} images for vehicle {vehicle_id}")
             return downloaded_paths
@@ -206,6 +194,32 @@ class HighResImageDownloader:
             logger.error(f"Error downloading images for vehicle {vehicle_id}: {e}")
             return []
     
+    GALLERY_IMAGE_SELECTOR = ".gallery-image img, .photo-gallery img, .vehicle-photo img, .detail-image img, .large-image img"
+    CURRENT_IMAGE_SELECTOR = ".active-image img, .current-image img, .gallery-main img"
+
+    def _wait_for_gallery(self, driver, timeout: float = 5):
+        """Wait until gallery images are in the DOM instead of sleeping a fixed time"""
+        try:
+            WebDriverWait(driver, timeout).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, self.GALLERY_IMAGE_SELECTOR))
+            )
+        except TimeoutException:
+            logger.debug("Gallery images did not appear before timeout")
+
+    def _wait_for_photo_change(self, driver, previous_url: Optional[str], timeout: float = 3):
+        """Wait until the current gallery image differs from previous_url"""
+        def photo_changed(d):
+            try:
+                img = d.find_element(By.CSS_SELECTOR, self.CURRENT_IMAGE_SELECTOR)
+            except NoSuchElementException:
+                return False
+            return (img.get_attribute("data-src") or img.get_attribute("src")) != previous_url
+
+        try:
+            WebDriverWait(driver, timeout).until(photo_changed)
+        except TimeoutException:
+            logger.debug("Gallery image did not change before timeout")
+
     def _is_high_res_url(self, url: str) -> bool:
         """Check if URL points to a high-resolution image"""
         if not url:
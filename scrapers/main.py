@@ -22,6 +22,10 @@ from scrapers.goonet_scraper import GoonetScraper
 from utils.image_downloader import ImageDownloader
 from utils.data_processor import DataProcessor
 
+# Vehicles written per INSERT ... ON CONFLICT statement (one parameter per
+# DatabaseManager.VEHICLE_COLUMNS entry plus content_hash - 32 each - and Postgres allows 32767)
+UPSERT_BATCH_SIZE = 100
+
 
 class ScraperManager:
     """Main scraper manager that coordinates all scraping activities"""
@@ -87,42 +91,50 @@ class ScraperManager:
             processed_count = 0
             added_count = 0
             updated_count = 0
+            unchanged_count = 0
             
+            batch = {}
             for vehicle_raw in vehicles_data:
                 try:
                     # Process and validate vehicle data
                     vehicle_data = self.data_processor.process_vehicle_data(vehicle_raw, site_name)
-                    
-                    # Check if vehicle already exists
-                    existing_vehicle = await self.db.get_vehicle_by_source_id(
-                        vehicle_data['source_id'], 
-                        site_name
-                    )
-                    
-                    if existing_vehicle:
-                        # Update existing vehicle
-                        await self.db.update_vehicle(existing_vehicle['id'], vehicle_data)
-                        updated_count += 1
-                        logger.debug(f"Updated vehicle: {vehicle_data['title_description'][:50]}...")
-                    else:
-                        # Add new vehicle
-                        vehicle_id = await self.db.create_vehicle(vehicle_data)
+                    # Keyed by source_id: one statement can't upsert the same row twice
+                    batch[vehicle_data['source_id']] = (vehicle_data, vehicle_raw)
+                except Exception as e:
+                    logger.error(f"Error processing vehicle: {e}")
+                    continue
+            
+            # Save in batches, one INSERT ... ON CONFLICT round-trip each
+            batch = list(batch.values())
+            for start in range(0, len(batch), UPSERT_BATCH_SIZE):
+                chunk = batch[start:start + UPSERT_BATCH_SIZE]
+                # One bad row fails the whole statement; retry row by row to keep the rest
+                try:
+                    rows = await self.db.upsert_vehicles([vehicle_data for vehicle_data, _ in chunk])
+                except Exception as e:
+                    logger.warning(f"Batch save of {len(chunk)} vehicles failed ({e}) - saving one by one")
+                    rows = []
+                    for vehicle_data, _ in chunk:
+                        try:
+                            rows.extend(await self.db.upsert_vehicles([vehicle_data]))
+                        except Exception as row_error:
+                            logger.error(f"Error saving vehicle {vehicle_data['source_id']}: {row_error}")
+                
+                raw_by_source_id = {vehicle_data['source_id']: vehicle_raw for vehicle_data, vehicle_raw in chunk}
+                for row in rows:
+                    if row['inserted']:
                         added_count += 1
-                        logger.debug(f"Added new vehicle: {vehicle_data['title_description'][:50]}...")
-                        
-                        # Download and process images
+                        # Download and process images for new vehicles only
+                        vehicle_raw = raw_by_source_id.get(row['source_id'], {})
                         if 'images' in vehicle_raw and vehicle_raw['images']:
-                            await self._process_vehicle_images(vehicle_id, vehicle_raw['images'])
-                    
+                            await self._process_vehicle_images(row['id'], vehicle_raw['images'])
+                    elif row['changed']:
+                        updated_count += 1
+                    else:
+                        unchanged_count += 1
                     processed_count += 1
-                    
-                    # Progress indicator
-                    if processed_count % 10 == 0:
-                        logger.info(f"Processed {processed_count}/{len(vehicles_data)} vehicles")
                 
-                except Exception as e:
-                    logger.error(f"Error processing vehicle: {e}")
-                    continue
+                logger.info(f"Processed {processed_count}/{len(vehicles_data)} vehicles")
             
             # Update scraper run with results
             await self.db.complete_scraper_run(
@@ -137,6 +149,7 @@ class ScraperManager:
             logger.info(f"   Processed: {processed_count}")
             logger.info(f"   Added: {added_count}")
             logger.info(f"   Updated: {updated_count}")
+            logger.info(f"   Unchanged: {unchanged_count}")
             
         except Exception as e:
             logger.error(f"❌ {site_name} scraping failed: {e}")
@@ -146,6 +159,7 @@ class ScraperManager:
     async def _process_vehicle_images(self, vehicle_id: int, image_urls: list):
         """Download and process vehicle images"""
         try:
+            images = []
             for i, img_url in enumerate(image_urls[:10]):  # Limit to 10 images
                 try:
                     # Download image
@@ -155,8 +169,7 @@ class ScraperManager:
                         i
                     )
                     
-                    # Save image record to database
-                    await self.db.create_vehicle_image({
+                    images.append({
                         'vehicle_id': vehicle_id,
                         'original_url': img_url,
                         'local_path': local_path,
@@ -170,6 +183,9 @@ class ScraperManager:
                     logger.warning(f"Failed to download image {img_url}: {e}")
                     continue
                     
+            # Save all image records in one write
+            await self.db.create_vehicle_images(images)
+            
         except Exception as e:
             logger.error(f"Error processing images for vehicle {vehicle_id}: {e}")
     
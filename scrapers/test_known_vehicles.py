@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Known vehicle index checks
+Loads the index from a stand-in pool whose rows include NULL keys (admin-created vehicles)
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from utils.compact_ids import CompactIdSet
+from utils.known_vehicles import KnownVehicleIndex
+
+ROWS = [
+    {'source_site': 'carsensor', 'source_id': 'AU6450744071'},
+    {'source_site': 'carsensor', 'source_id': None},
+    {'source_site': None, 'source_id': None},
+    {'source_site': 'carsensor', 'source_id': 'not-a-carsensor-id'},
+]
+
+
+class FakeConnection:
+    def transaction(self):
+        return FakeContext(None)
+
+    async def _rows(self):
+        for row in ROWS:
+            yield row
+
+    def cursor(self, query, prefetch=None):
+        return self._rows()
+
+
+class FakeContext:
+    def __init__(self, value):
+        self.value = value
+
+    async def __aenter__(self):
+        return self.value
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakePool:
+    def acquire(self):
+        return FakeContext(FakeConnection())
+
+
+def test_load_skips_null_rows():
+    index = KnownVehicleIndex()
+    asyncio.run(index.load(FakePool()))
+    assert len(index) == 2
+    assert index.contains('carsensor', 'AU6450744071')
+    assert index.contains('carsensor', 'not-a-carsensor-id')
+    assert not index.contains('carsensor', None)
+    assert None not in index.scope('carsensor')
+
+
+def test_compact_set_ignores_none():
+    ids = CompactIdSet(['SU00048411829', None])
+    ids.add(None)
+    assert len(ids) == 1
+    assert None not in ids
+    assert 'SU00048411829' in ids
+
+
+if __name__ == '__main__':
+    test_load_skips_null_rows()
+    test_compact_set_ignores_none()
+    print("✅ Known vehicle index checks passed")
@@ -24,6 +24,7 @@ from datetime import datetime
 import re
 from translator import VehicleTranslator
 from title_cleaner import clean_title
+from utils.content_hash import content_hash
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -126,7 +127,7 @@ class DatabaseManager:
         async with self.pool.acquire() as conn:
             # First try to find existing vehicle
             existing = await conn.fetchrow(
-                "SELECT id, is_available FROM vehicles WHERE source_id = $1 AND source_site = $2",
+                "SELECT id, is_available FROM vehicle_listings WHERE source_id = $1 AND source_site = $2",
                 vehicle["source_id"], vehicle["source_site"]
             )
             
@@ -136,54 +137,72 @@ class DatabaseManager:
                 # Check if vehicle was marked sold but is now back
                 if not existing['is_available']:
                     await conn.execute("""
-                        UPDATE vehicles 
+                        UPDATE vehicle_status 
                         SET is_available = TRUE,
                             notes = COALESCE(notes, '') || ' [RELISTED: ' || NOW()::date::text || ']'
-                        WHERE id = $1
+                        WHERE vehicle_id = $1
                     """, existing_id)
                     logger.success(f"🔄 RELISTED: Vehicle {vehicle['source_id']} is available again!")
                 
-                # Update existing vehicle
+                # Rewrite the wide vehicles row only if the scraped content changed;
+                # prices and last_scraped_at always go to the narrow status row
                 await conn.execute(
                     """
-                    UPDATE vehicles SET
-                        source_url = $2,
-                        title_description = $3,
-                        price_vehicle_yen = $4,
-                        price_total_yen = $5,
-                        mileage_km = $6,
-                        location_prefecture = $7,
-                        model_year_ad = $8,
-                        last_scraped_at = NOW(),
-                        updated_at = NOW()
-                    WHERE id = $1
+                    WITH listing AS (
+                        UPDATE vehicles SET
+                            source_url = $2,
+                            source_site = $3,
+                            manufacturer_id = $4,
+                            model_id = $5,
+                            title_description = $6,
+                            model_year_ad = $9,
+                            mileage_km = $10,
+                            location_prefecture = $11,
+                            has_repair_history = $12,
+                            has_warranty = $13,
+                            content_hash = $14,
+                            updated_at = NOW()
+                        WHERE id = $1 AND content_hash IS DISTINCT FROM $14
+                    )
+                    UPDATE vehicle_status SET
+                        price_vehicle_yen = $7,
+                        price_total_yen = $8,
+                        last_scraped_at = NOW()
+                    WHERE vehicle_id = $1
                     """,
-                    existing_id, vehicle["source_url"], 
-                    vehicle["title_description"], vehicle["price_vehicle_yen"],
-                    vehicle["price_total_yen"], vehicle["mileage_km"], 
-                    vehicle["location_prefecture"], vehicle["model_year_ad"]
+                    existing_id, *self._listing_values(vehicle)[1:]
                 )
                 return existing_id
             else:
                 # Insert new vehicle
                 return await conn.fetchval(
                     """
-                    INSERT INTO vehicles (
-                        source_id, source_url, source_site, manufacturer_id, model_id, 
-                        title_description, price_vehicle_yen, price_total_yen, 
-                        model_year_ad, mileage_km, location_prefecture,
-                        has_repair_history, has_warranty, is_available, last_scraped_at
-                    ) VALUES (
-                        $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, TRUE, NOW()
-                    ) RETURNING id
+                    WITH inserted AS (
+                        INSERT INTO vehicles (
+                            source_id, source_url, source_site, manufacturer_id, model_id, 
+                            title_description, model_year_ad, mileage_km, location_prefecture,
+                            has_repair_history, has_warranty, content_hash
+                        ) VALUES (
+                            $1, $2, $3, $4, $5, $6, $9, $10, $11, $12, $13, $14
+                        ) RETURNING id
+                    )
+                    INSERT INTO vehicle_status (vehicle_id, price_vehicle_yen, price_total_yen, is_available, last_scraped_at)
+                    SELECT id, $7, $8, TRUE, NOW() FROM inserted
+                    RETURNING vehicle_id
                     """,
-                    vehicle["source_id"], vehicle["source_url"], vehicle["source_site"], 
-                    vehicle["manufacturer_id"], vehicle["model_id"], vehicle["title_description"], 
-                    vehicle["price_vehicle_yen"], vehicle["price_total_yen"], vehicle["model_year_ad"],
-                    vehicle["mileage_km"], vehicle["location_prefecture"], 
-                    vehicle["has_repair_history"], vehicle["has_warranty"]
+                    *self._listing_values(vehicle)
                 )
 
+    @staticmethod
+    def _listing_values(vehicle):
+        """Bind values for create_vehicle: the listing fields, prices and the content hash"""
+        row = (vehicle["source_id"], vehicle["source_url"], vehicle["source_site"],
+               vehicle["manufacturer_id"], vehicle["model_id"], vehicle["title_description"],
+               vehicle["model_year_ad"], vehicle["mileage_km"], vehicle["location_prefecture"],
+               vehicle["has_repair_history"], vehicle["has_warranty"])
+        return (row[:6] + (vehicle["price_vehicle_yen"], vehicle["price_total_yen"]) + row[6:]
+                + (content_hash(row),))
+
     async def create_vehicle_image(self, image):
         async with self.pool.acquire() as conn:
             # Check if image already exists
@@ -210,7 +229,7 @@ class DatabaseManager:
         async with self.pool.acquire() as conn:
             vehicles = await conn.fetch("""
                 SELECT id, source_id 
-                FROM vehicles 
+                FROM vehicle_listings 
                 WHERE model_id = $1 
                 AND is_available = TRUE
                 AND source_site = 'carsensor'
@@ -221,11 +240,11 @@ class DatabaseManager:
         """Mark a vehicle as sold"""
         async with self.pool.acquire() as conn:
             await conn.execute("""
-                UPDATE vehicles 
+                UPDATE vehicle_status 
                 SET is_available = FALSE,
                     sold_detected_at = NOW(),
                     notes = COALESCE(notes, '') || ' [AUTO-DETECTED SOLD: ' || NOW()::date::text || ']'
-                WHERE id = $1
+                WHERE vehicle_id = $1
             """, vehicle_id)
             logger.warning(f"🚫 MARKED SOLD: Vehicle ID {vehicle_id} (source: {source_id})")
 
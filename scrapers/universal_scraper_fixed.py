@@ -9,25 +9,40 @@ import asyncio
 import sys
 import os
 import csv
+import json
 
 # Add current directory to Python path
 sys.path.insert(0, '/mnt/c/Users/ibm/Documents/GPSTrucksJapan/scrapers')
 import hashlib
+import math
 import random
-import aiohttp
 import aiofiles
 from pathlib import Path
-from bs4 import BeautifulSoup
 from loguru import logger
 import asyncpg
 from datetime import datetime
-import re
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 from translator import VehicleTranslator
+from utils.rate_limiter import HostRateLimiter
+from utils.http_client import ACCEPT_ENCODING, get_http_client
+from utils.retry import THROTTLE_STATUSES, HostCircuitBreaker, backoff_delay, parse_retry_after
+from utils.listing_parser import PARSER_BACKENDS, get_listing_parser
+from utils.gallery_extractor import extract_gallery_urls, harvest_gallery_urls, normalize_photo_url
+from utils.gallery_resolver import GalleryResolver
+from utils.browser_pool import PLAYWRIGHT_AVAILABLE, BrowserContextPool
+from utils.browser_profile import apply_request_blocking, drain_request_log, enable_request_log, lean_chrome_options
+from utils.browser_watchdog import kill_process_tree, process_tree_rss_mb
+from utils.page_cache import NOT_MODIFIED, PageChangeStore, fingerprint_records
+from utils.scrape_journal import ScrapeJournal
+from utils.catalog_cache import CatalogCache
+from utils.known_vehicles import KnownVehicleIndex
+from utils.content_hash import content_hash
+from utils.refresh_scheduler import RefreshScheduler
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 import time
@@ -45,11 +60,62 @@ USER_AGENTS = [
 TARGET_PREFECTURES = [
     "ibaraki", "tochigi", "gunma", "saitama", "chiba", "tokyo", "kanagawa"
 ]
+# Connection limits for carsensor.net - prefetching never opens more than this
+CONNECTOR_LIMIT = 10
+CONNECTOR_LIMIT_PER_HOST = 3
+# Listing pages have always been fetched without certificate checks; only this host opts out
+INSECURE_TLS_HOSTS = ("www.carsensor.net",)
+# Listing pages fetched ahead while the current page is enriched (0 = serial)
+PREFETCH_PAGES = 0
+# Vehicles per listing page, and pages requested at once once page 1's total count is known
+LISTING_PAGE_SIZE = 30
+LISTING_FANOUT = 4
+# CarSensor's "新着順" (newest first) sort, used by incremental runs
+NEWEST_FIRST_SORT = "19"
+# Incremental runs stop after this many already-known vehicles in a row
+INCREMENTAL_KNOWN_MARGIN = 3
+# Shared politeness budget for all fetches to one host (requests/second, burst)
+HOST_RATE_PER_SECOND = 0.5
+HOST_BURST = 2
+# Attempts per page fetch, and for pages retried from the retry queue at the end of a model
+FETCH_RETRIES = 4
+RETRY_QUEUE_ATTEMPTS = 6
+# Give up on a model after this many listing pages in a row failed to fetch
+MAX_CONSECUTIVE_FAILED_PAGES = 3
+# Sold reconciliation backs off when more than this share of a model's stock (and more than a
+# full listing page) vanished in one sweep - more likely a broken search than a sell-out
+MAX_SOLD_FRACTION = 0.5
+# Pause for a host after a 429/503 (seconds, doubles on repeated trips)
+CIRCUIT_COOLDOWN = 30
+# Models scraped at the same time (1 = one after another)
+MODEL_CONCURRENCY = 1
+# Browser contexts for detail pages that need rendering; also how many vehicles are enriched at once
+BROWSER_POOL_SIZE = 4
+# Gallery size of a rendered detail page, read up front from its distinct thumbnail links
+GALLERY_SIZE_SCRIPT = "new Set(Array.from(document.querySelectorAll('a.js-photo'), a => a.getAttribute('href'))).size"
+# Click-through limit when the gallery size can't be read
+MAX_GALLERY_STEPS = 50
+# Browser workers are replaced after this many pages, when browser processes exceed this RSS,
+# or when a single detail page takes longer than this (seconds) - i.e. hangs
+BROWSER_RECYCLE_PAGES = 50
+BROWSER_MAX_RSS_MB = 1500
+BROWSER_PAGE_TIMEOUT = 90
+# vehicle_images columns written by save_vehicle_images, in COPY order
+IMAGE_COLUMNS = ("vehicle_id", "original_url", "local_path", "filename", "is_primary", "file_size", "alt_text", "image_order")
+# Listing page HTML backend (see utils/listing_parser.py)
+LISTING_PARSER = "lxml"
+# ETag/Last-Modified validators and cassette fingerprints per listing URL
+PAGE_STATE_FILE = Path("listing_page_state.json")
+# Append-only model/page/vehicle completion log used by --resume
+JOURNAL_FILE = Path("scrape_journal.jsonl")
+# Per-model churn history that drives --scheduled refresh intervals and page depth
+SCHEDULE_FILE = Path("refresh_schedule.json")
 
 class DatabaseManager:
     def __init__(self, database_url):
         self.database_url = database_url
         self.pool = None
+        self.catalog = None
 
     async def connect(self):
         if not self.pool:
@@ -61,6 +127,8 @@ class DatabaseManager:
                     command_timeout=60
                 )
                 logger.info("Database connection pool created")
+                self.catalog = CatalogCache(self.pool)
+                await self.catalog.warm()
             except Exception as e:
                 logger.error(f"Failed to connect to the database: {e}")
                 raise
@@ -74,177 +142,318 @@ class DatabaseManager:
         async with self.pool.acquire() as conn:
             return await conn.fetchrow("SELECT COUNT(*) as total_vehicles FROM vehicles")
 
-    async def vehicle_exists(self, source_id, source_site='carsensor'):
-        """Check if vehicle already exists in database - CRUCIAL FOR PERFORMANCE"""
-        async with self.pool.acquire() as conn:
-            exists = await conn.fetchval(
-                "SELECT EXISTS(SELECT 1 FROM vehicles WHERE source_id = $1 AND source_site = $2)",
-                source_id, source_site
-            )
-            return exists
-
-    async def get_existing_vehicle_ids_for_model(self, model_id):
-        """Get all existing vehicle source_ids for a model at startup"""
+    async def get_existing_vehicle_prices_for_model(self, model_id):
+        """Get source_id -> total price for a model's existing vehicles (for price-change churn)"""
         async with self.pool.acquire() as conn:
             vehicles = await conn.fetch("""
-                SELECT source_id 
-                FROM vehicles 
+                SELECT source_id, price_total_yen 
+                FROM vehicle_listings 
                 WHERE model_id = $1 
                 AND source_site = 'carsensor'
             """, model_id)
-            return set(v['source_id'] for v in vehicles)
+            return {v['source_id']: v['price_total_yen'] for v in vehicles}
+
+    async def mark_vehicles_seen(self, prices):
+        """
+        Bump last_scraped_at for known vehicles seen on a page, in one statement.
+        `prices` maps source_id -> new listing price in yen, or None when unchanged.
+        """
+        async with self.pool.acquire() as conn:
+            await conn.execute("""
+                UPDATE vehicle_status s 
+                SET price_vehicle_yen = COALESCE(u.price_yen, s.price_vehicle_yen),
+                    price_total_yen = COALESCE(u.price_yen, s.price_total_yen),
+                    last_scraped_at = NOW()
+                FROM vehicles v, unnest($1::text[], $2::int[]) AS u(source_id, price_yen)
+                WHERE v.source_id = u.source_id 
+                AND s.vehicle_id = v.id
+            """, list(prices.keys()), list(prices.values()))
 
     async def get_or_create_manufacturer(self, name):
         """Get manufacturer ID or create if doesn't exist"""
-        async with self.pool.acquire() as conn:
-            # Try to find existing manufacturer
-            existing = await conn.fetchrow(
-                "SELECT id FROM manufacturers WHERE LOWER(name) = LOWER($1)", name
-            )
-            
-            if existing:
-                logger.info(f"Found existing manufacturer: {name} (ID: {existing['id']})")
-                return existing['id']
-            
-            # Create new manufacturer
-            manufacturer_id = await conn.fetchval(
-                """
-                INSERT INTO manufacturers (name, country, is_active)
-                VALUES ($1, 'Japan', TRUE)
-                RETURNING id
-                """, name
-            )
-            logger.success(f"✅ Created new manufacturer: {name} (ID: {manufacturer_id})")
-            return manufacturer_id
+        return await self.catalog.manufacturer_id(name)
 
     async def get_or_create_model(self, manufacturer_id, model_name):
         """Get model ID or create if doesn't exist"""
+        return await self.catalog.model_id(manufacturer_id, model_name, body_type='SUV', is_popular=True)
+
+    async def upsert_vehicles(self, vehicles):
+        """
+        Insert or update a page of vehicles in one round-trip.
+        The wide vehicles row is only rewritten when its content_hash changes;
+        prices, availability and last_scraped_at go to the narrow vehicle_status
+        row, which every vehicle on the page gets in the same statement.
+        Returns one row per vehicle: id, source_id, inserted (new row), changed
+        (inserted, rewritten, repriced or relisted) and relisted (was marked sold).
+        """
+        if not vehicles:
+            return []
+        
+        rows = []
+        for v in vehicles:
+            row = (v["source_id"], v["source_url"], v["source_site"], v["manufacturer_id"], v["model_id"],
+                   v["title_description"], v["model_year_ad"], v["mileage_km"], v["location_prefecture"],
+                   v["has_repair_history"], v["has_warranty"])
+            rows.append(row + (content_hash(row), v["price_vehicle_yen"], v["price_total_yen"]))
+        columns = [list(column) for column in zip(*rows)]
+        
         async with self.pool.acquire() as conn:
-            # Try to find existing model
-            existing = await conn.fetchrow(
-                "SELECT id FROM models WHERE manufacturer_id = $1 AND LOWER(name) = LOWER($2)",
-                manufacturer_id, model_name
-            )
-            
-            if existing:
-                logger.info(f"Found existing model: {model_name} (ID: {existing['id']})")
-                return existing['id']
-            
-            # Create new model
-            model_id = await conn.fetchval(
+            rows = await conn.fetch(
                 """
-                INSERT INTO models (manufacturer_id, name, body_type, is_popular)
-                VALUES ($1, $2, 'SUV', TRUE)
-                RETURNING id
-                """, manufacturer_id, model_name
+                WITH incoming AS (
+                    SELECT * FROM unnest(
+                        $1::text[], $2::text[], $3::text[], $4::int[], $5::int[], $6::text[], $7::int[],
+                        $8::int[], $9::text[], $10::bool[], $11::bool[], $12::text[], $13::int[], $14::int[]
+                    ) AS i(source_id, source_url, source_site, manufacturer_id, model_id, title_description,
+                           model_year_ad, mileage_km, location_prefecture, has_repair_history, has_warranty,
+                           content_hash, price_vehicle_yen, price_total_yen)
+                ),
+                previous AS (
+                    SELECT v.id, v.source_id, s.is_available, s.price_vehicle_yen, s.price_total_yen
+                    FROM vehicles v
+                    JOIN incoming USING (source_id)
+                    LEFT JOIN vehicle_status s ON s.vehicle_id = v.id
+                ),
+                upserted AS (
+                    INSERT INTO vehicles AS v (
+                        source_id, source_url, source_site, manufacturer_id, model_id,
+                        title_description, model_year_ad, mileage_km, location_prefecture,
+                        has_repair_history, has_warranty, content_hash
+                    )
+                    SELECT source_id, source_url, source_site, manufacturer_id, model_id,
+                           title_description, model_year_ad, mileage_km, location_prefecture,
+                           has_repair_history, has_warranty, content_hash
+                    FROM incoming
+                    ON CONFLICT (source_id) DO UPDATE SET
+                        -- every hashed column, so a new hash never sits next to stale values
+                        source_url = EXCLUDED.source_url,
+                        source_site = EXCLUDED.source_site,
+                        manufacturer_id = EXCLUDED.manufacturer_id,
+                        model_id = EXCLUDED.model_id,
+                        title_description = EXCLUDED.title_description,
+                        mileage_km = EXCLUDED.mileage_km,
+                        location_prefecture = EXCLUDED.location_prefecture,
+                        model_year_ad = EXCLUDED.model_year_ad,
+                        has_repair_history = EXCLUDED.has_repair_history,
+                        has_warranty = EXCLUDED.has_warranty,
+                        content_hash = EXCLUDED.content_hash,
+                        updated_at = NOW()
+                    WHERE v.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+                    RETURNING v.id, v.source_id, (v.xmax = 0) AS inserted
+                ),
+                ids AS (
+                    SELECT id, source_id, inserted, TRUE AS rewritten FROM upserted
+                    UNION ALL
+                    -- Conflicting rows the WHERE above skipped: same content, just seen again
+                    SELECT id, source_id, FALSE, FALSE FROM previous
+                    WHERE source_id NOT IN (SELECT source_id FROM upserted)
+                ),
+                status AS (
+                    INSERT INTO vehicle_status AS s (vehicle_id, price_vehicle_yen, price_total_yen,
+                                                     is_available, last_scraped_at)
+                    SELECT ids.id, incoming.price_vehicle_yen, incoming.price_total_yen, TRUE, NOW()
+                    FROM ids JOIN incoming USING (source_id)
+                    ON CONFLICT (vehicle_id) DO UPDATE SET
+                        price_vehicle_yen = EXCLUDED.price_vehicle_yen,
+                        price_total_yen = EXCLUDED.price_total_yen,
+                        is_available = TRUE,
+                        notes = CASE WHEN s.is_available THEN s.notes
+                                     ELSE COALESCE(s.notes, '') || ' [RELISTED: ' || NOW()::date::text || ']' END,
+                        last_scraped_at = NOW()
+                )
+                SELECT ids.id, ids.source_id, ids.inserted,
+                       ids.rewritten
+                       OR p.price_vehicle_yen IS DISTINCT FROM i.price_vehicle_yen
+                       OR p.price_total_yen IS DISTINCT FROM i.price_total_yen
+                       OR COALESCE(NOT p.is_available, FALSE) AS changed,
+                       COALESCE(NOT p.is_available, FALSE) AS relisted
+                FROM ids
+                JOIN incoming i USING (source_id)
+                LEFT JOIN previous p USING (source_id)
+                """,
+                *columns
             )
-            logger.success(f"✅ Created new model: {model_name} (ID: {model_id})")
-            return model_id
+        
+        for row in rows:
+            if row["relisted"]:
+                logger.success(f"🔄 RELISTED: Vehicle {row['source_id']} is available again!")
+        return rows
 
     async def create_vehicle(self, vehicle):
+        rows = await self.upsert_vehicles([vehicle])
+        return rows[0]["id"]
+
+    async def create_scraper_run(self, scraper_name):
         async with self.pool.acquire() as conn:
-            # First try to find existing vehicle
-            existing = await conn.fetchrow(
-                "SELECT id, is_available FROM vehicles WHERE source_id = $1 AND source_site = $2",
-                vehicle["source_id"], vehicle["source_site"]
+            return await conn.fetchval(
+                "INSERT INTO scraper_runs (scraper_name, status, started_at) VALUES ($1, 'running', NOW()) RETURNING id",
+                scraper_name
             )
-            
-            if existing:
-                existing_id = existing['id']
-                
-                # Check if vehicle was marked sold but is now back
-                if not existing['is_available']:
-                    await conn.execute("""
-                        UPDATE vehicles 
-                        SET is_available = TRUE,
-                            notes = COALESCE(notes, '') || ' [RELISTED: ' || NOW()::date::text || ']'
-                        WHERE id = $1
-                    """, existing_id)
-                    logger.success(f"🔄 RELISTED: Vehicle {vehicle['source_id']} is available again!")
-                
-                # Update existing vehicle
-                await conn.execute(
-                    """
-                    UPDATE vehicles SET
-                        source_url = $2,
-                        title_description = $3,
-                        price_vehicle_yen = $4,
-                        price_total_yen = $5,
-                        mileage_km = $6,
-                        location_prefecture = $7,
-                        model_year_ad = $8,
-                        last_scraped_at = NOW(),
-                        updated_at = NOW()
-                    WHERE id = $1
-                    """,
-                    existing_id, vehicle["source_url"], 
-                    vehicle["title_description"], vehicle["price_vehicle_yen"],
-                    vehicle["price_total_yen"], vehicle["mileage_km"], 
-                    vehicle["location_prefecture"], vehicle["model_year_ad"]
-                )
-                return existing_id
-            else:
-                # Insert new vehicle
-                return await conn.fetchval(
-                    """
-                    INSERT INTO vehicles (
-                        source_id, source_url, source_site, manufacturer_id, model_id, 
-                        title_description, price_vehicle_yen, price_total_yen, 
-                        model_year_ad, mileage_km, location_prefecture,
-                        has_repair_history, has_warranty, is_available, last_scraped_at
-                    ) VALUES (
-                        $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, TRUE, NOW()
-                    ) RETURNING id
-                    """,
-                    vehicle["source_id"], vehicle["source_url"], vehicle["source_site"], 
-                    vehicle["manufacturer_id"], vehicle["model_id"], vehicle["title_description"], 
-                    vehicle["price_vehicle_yen"], vehicle["price_total_yen"], vehicle["model_year_ad"],
-                    vehicle["mileage_km"], vehicle["location_prefecture"], 
-                    vehicle["has_repair_history"], vehicle["has_warranty"]
-                )
 
-    async def create_vehicle_image(self, image):
+    async def complete_scraper_run(self, run_id, status, vehicles_processed=0, vehicles_added=0,
+                                   vehicles_updated=0, error_message=None, log_details=None):
         async with self.pool.acquire() as conn:
-            # Check if image already exists
-            existing = await conn.fetchval(
-                "SELECT id FROM vehicle_images WHERE vehicle_id = $1 AND filename = $2",
-                image["vehicle_id"], image["filename"]
+            await conn.execute(
+                """
+                UPDATE scraper_runs SET
+                    status = $2,
+                    completed_at = NOW(),
+                    vehicles_processed = $3,
+                    vehicles_added = $4,
+                    vehicles_updated = $5,
+                    error_message = $6,
+                    log_details = $7::jsonb
+                WHERE id = $1
+                """,
+                run_id, status, vehicles_processed, vehicles_added, vehicles_updated,
+                error_message, json.dumps(log_details) if log_details is not None else None
             )
-            
-            if not existing:
-                await conn.execute(
-                    """
-                    INSERT INTO vehicle_images (
-                        vehicle_id, original_url, local_path, filename, 
-                        is_primary, file_size, alt_text, image_order
-                    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
-                    """,
-                    image["vehicle_id"], image.get("original_url"), image["local_path"], 
-                    image["filename"], image.get("is_primary", False), 
-                    image.get("file_size", 0), image.get("alt_text"), image.get("image_order", 0)
-                )
 
-    async def mark_vehicle_sold(self, vehicle_id, source_id):
-        """Mark a vehicle as sold"""
+    async def save_vehicle_images(self, images):
+        """
+        Write a vehicle's whole gallery at once: COPY the rows into a session
+        staging table, then merge them in one INSERT ... ON CONFLICT statement.
+        Images already stored (same vehicle_id and filename) are left as they are.
+        """
+        if not images:
+            return
+        
+        records = [
+            (image["vehicle_id"], image.get("original_url"), image["local_path"], image["filename"],
+             image.get("is_primary", False), image.get("file_size", 0), image.get("alt_text"),
+             image.get("image_order", 0))
+            for image in images
+        ]
+        columns = ", ".join(IMAGE_COLUMNS)
+        
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                # Lives for the pooled connection's session and is emptied on every commit
+                await conn.execute("""
+                    CREATE TEMP TABLE IF NOT EXISTS vehicle_images_staging (
+                        vehicle_id INTEGER, original_url TEXT, local_path VARCHAR(512), filename VARCHAR(255),
+                        is_primary BOOLEAN, file_size INTEGER, alt_text VARCHAR(255), image_order INTEGER
+                    ) ON COMMIT DELETE ROWS
+                """)
+                await conn.copy_records_to_table("vehicle_images_staging", records=records, columns=IMAGE_COLUMNS)
+                await conn.execute(f"""
+                    INSERT INTO vehicle_images ({columns})
+                    SELECT DISTINCT ON (vehicle_id, filename) {columns}
+                    FROM vehicle_images_staging
+                    ORDER BY vehicle_id, filename, image_order
+                    ON CONFLICT (vehicle_id, filename) DO NOTHING
+                """)
+
+    async def create_vehicle_image(self, image):
+        await self.save_vehicle_images([image])
+
+    async def get_available_vehicles_for_models(self, model_ids):
+        """Get source_id -> (id, model_id) for the available vehicles of these models"""
         async with self.pool.acquire() as conn:
-            await conn.execute("""
-                UPDATE vehicles 
+            vehicles = await conn.fetch("""
+                SELECT id, source_id, model_id 
+                FROM vehicle_listings 
+                WHERE model_id = ANY($1::int[]) 
+                AND source_site = 'carsensor'
+                AND is_available = TRUE
+            """, list(model_ids))
+            return {v['source_id']: (v['id'], v['model_id']) for v in vehicles}
+
+    async def mark_vehicles_sold(self, vehicle_ids):
+        """Mark vehicles as sold in one statement. Returns how many were still available."""
+        async with self.pool.acquire() as conn:
+            result = await conn.execute("""
+                UPDATE vehicle_status 
                 SET is_available = FALSE,
                     sold_detected_at = NOW(),
                     notes = COALESCE(notes, '') || ' [AUTO-DETECTED SOLD: ' || NOW()::date::text || ']'
-                WHERE id = $1
-            """, vehicle_id)
-            logger.warning(f"🚫 MARKED SOLD: Vehicle ID {vehicle_id} (source: {source_id})")
+                WHERE vehicle_id = ANY($1::int[]) 
+                AND is_available
+            """, list(vehicle_ids))
+            return int(result.split()[-1])
+
+    async def mark_vehicles_relisted(self, source_ids):
+        """Make sold vehicles that were listed again available, in one statement. Returns how many were revived."""
+        async with self.pool.acquire() as conn:
+            result = await conn.execute("""
+                UPDATE vehicle_status s 
+                SET is_available = TRUE,
+                    notes = COALESCE(s.notes, '') || ' [RELISTED: ' || NOW()::date::text || ']',
+                    last_scraped_at = NOW()
+                FROM vehicles v
+                WHERE s.vehicle_id = v.id 
+                AND v.source_site = 'carsensor'
+                AND v.source_id = ANY($1::text[]) 
+                AND NOT s.is_available
+            """, list(source_ids))
+            return int(result.split()[-1])
 
 class UniversalCarSensorScraper:
-    def __init__(self, config):
+    def __init__(self, config, prefetch_pages=PREFETCH_PAGES, fanout_pages=LISTING_FANOUT, rate_limiter=None, parser_backend=LISTING_PARSER,
+                 page_store=None, skip_unchanged=True, circuit_breaker=None, journal=None, resume=False,
+                 scheduler=None, scheduled=False, incremental=False, static_gallery=True,
+                 browser_pool_size=BROWSER_POOL_SIZE, synthesize_gallery=True):
         self.config = config
         self.db = DatabaseManager(config.database_url)
         self.image_dir = IMAGE_DIR
         self.image_dir.mkdir(exist_ok=True)
         self.translator = VehicleTranslator()
         self.driver = None
-        self.existing_vehicle_ids = set()  # Pre-load existing vehicles
+        # Galleries come from the detail page HTML; browser click-through is only the fallback
+        self.static_gallery = static_gallery
+        # Rendered fallback: a pool of async Playwright contexts, or the single Selenium
+        # driver in a worker thread (one page at a time) when Playwright is unavailable
+        self.browser_pool = None
+        if browser_pool_size > 0:
+            if PLAYWRIGHT_AVAILABLE:
+                self.browser_pool = BrowserContextPool(
+                    browser_pool_size, user_agents=USER_AGENTS,
+                    max_pages_per_context=BROWSER_RECYCLE_PAGES, max_rss_mb=BROWSER_MAX_RSS_MB
+                )
+            else:
+                logger.warning("Playwright not installed - rendered gallery fallback uses Selenium")
+        self.selenium_lock = asyncio.Lock()
+        # Pages served by the current Selenium driver; bumping the generation abandons a hung walk
+        self.selenium_pages = 0
+        self.selenium_generation = 0
+        # Vehicles on a page enriched concurrently (saves still happen in page order)
+        self.enrich_semaphore = asyncio.Semaphore(max(1, browser_pool_size))
+        # Keep one connection per host free for the page currently being processed
+        self.prefetch_pages = max(0, min(prefetch_pages, CONNECTOR_LIMIT_PER_HOST - 1))
+        # With a known page count, fetches are only bounded by the rate governor (and memory)
+        self.fanout_pages = max(0, min(fanout_pages, CONNECTOR_LIMIT))
+        # One governor for every fetch so concurrent models share the same budget
+        self.rate_limiter = rate_limiter or HostRateLimiter(HOST_RATE_PER_SECOND, HOST_BURST)
+        # Shared too: one 429 pauses every model talking to that host
+        self.circuit_breaker = circuit_breaker or HostCircuitBreaker(cooldown=CIRCUIT_COOLDOWN)
+        # "Manufacturer Model" -> listing pages that still failed after the retry queue
+        self.failed_pages = {}
+        # Crash-safe progress log; resume_state is filled from it by scrape_all_models
+        self.journal = journal
+        self.resume = resume and journal is not None
+        self.resume_state = None
+        # Churn history; with scheduled=True only due models run, as deep as they need
+        self.scheduler = scheduler
+        self.scheduled = scheduled and scheduler is not None
+        # Newest-first walk that stops at known vehicles; full sweeps still run when due
+        self.incremental = incremental
+        # "Manufacturer Model" -> churn counters from the last scrape_model call
+        self.model_stats = {}
+        # Whole-run totals for the scraper_runs row, from the upsert's inserted/updated flags
+        self.run_counts = {"added": 0, "updated": 0, "unchanged": 0, "sold": 0, "relisted": 0}
+        # (source_site, source_id) of every stored vehicle, shared by all models of the run
+        self.known_vehicles = KnownVehicleIndex()
+        self.run_id = None
+        # Process-wide keep-alive client, shared with the image downloaders
+        self.http = get_http_client(limit=CONNECTOR_LIMIT, limit_per_host=CONNECTOR_LIMIT_PER_HOST,
+                                    insecure_hosts=INSECURE_TLS_HOSTS)
+        # Cheapest gallery source: the listing photo's URL pattern, checked with HEAD requests
+        self.gallery_resolver = GalleryResolver(self.http) if synthesize_gallery else None
+        self.listing_parser = get_listing_parser(parser_backend)
+        logger.info(f"Listing parser backend: {self.listing_parser.name}")
+        # Remembers what each listing page looked like so unchanged pages can be skipped
+        self.page_store = page_store
+        self.skip_unchanged = skip_unchanged and page_store is not None
 
     def load_vehicle_configs(self):
         """Load vehicle configurations from CSV file"""
@@ -288,23 +497,53 @@ class UniversalCarSensorScraper:
         
         return manufacturer_id, model_id
 
-    async def fetch_page(self, session, url, retries=3):
+    async def fetch_page(self, url, retries=FETCH_RETRIES, track_changes=True):
+        """
+        Fetch a page. Returns the HTML, NOT_MODIFIED for a 304, "" when the page
+        does not exist (404/410), or None when every attempt failed.
+        track_changes=False leaves the listing change store out of it (detail pages).
+        """
+        track_changes = track_changes and self.page_store is not None
+        conditional_headers = self.page_store.conditional_headers(url) if track_changes and self.skip_unchanged else {}
+        
         for attempt in range(retries):
             headers = {
                 "User-Agent": random.choice(USER_AGENTS),
                 "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
                 "Accept-Language": "ja,en-US;q=0.7,en;q=0.3",
-                "Accept-Encoding": "gzip, deflate",
+                "Accept-Encoding": ACCEPT_ENCODING,
                 "Connection": "keep-alive",
-                "Cache-Control": "no-cache"
+                # Revalidate instead of bypassing validators when we have them
+                "Cache-Control": "max-age=0" if conditional_headers else "no-cache",
+                **conditional_headers
             }
+            throttled = False
             try:
-                timeout = aiohttp.ClientTimeout(total=30, connect=10)
-                async with session.get(url, headers=headers, timeout=timeout, ssl=False) as response:
-                    if response.status == 200:
+                await self.circuit_breaker.wait(url)
+                await self.rate_limiter.acquire(url)
+                async with self.http.get(url, headers=headers) as response:
+                    if response.status == 304 and conditional_headers:
+                        self.circuit_breaker.record_success(url)
+                        logger.info(f"Not modified since last run: {url}")
+                        return NOT_MODIFIED
+                    elif response.status == 200:
                         text = await response.text()
+                        self.circuit_breaker.record_success(url)
                         logger.info(f"Successfully fetched {url} ({len(text)} chars)")
+                        if track_changes:
+                            self.page_store.stage_validators(
+                                url, response.headers.get('ETag'), response.headers.get('Last-Modified')
+                            )
                         return text
+                    elif response.status in THROTTLE_STATUSES:
+                        # Pauses every worker on this host; the next attempt waits in circuit_breaker.wait()
+                        throttled = True
+                        self.circuit_breaker.record_throttle(
+                            url, response.status, parse_retry_after(response.headers.get('Retry-After'))
+                        )
+                    elif response.status in (404, 410):
+                        logger.info(f"HTTP {response.status} for {url} - page does not exist")
+                        return ""
                     else:
                         logger.warning(f"HTTP {response.status} for {url}")
             except asyncio.TimeoutError:
@@ -312,43 +551,304 @@ class UniversalCarSensorScraper:
             except Exception as e:
                 logger.error(f"Error fetching {url} (attempt {attempt + 1}): {e}")
             
-            if attempt < retries - 1:
-                logger.info(f"Retrying {url} in {2 + attempt} seconds...")
-                await asyncio.sleep(2 + attempt)
+            if attempt < retries - 1 and not throttled:
+                delay = backoff_delay(attempt)
+                logger.info(f"Retrying {url} in {delay:.1f} seconds...")
+                await asyncio.sleep(delay)
         
         logger.error(f"Failed to fetch {url} after {retries} attempts")
         return None
 
+    def build_page_url(self, vehicle_config, page_num):
+        """Build the listing URL for a page number with DUAL URL SUPPORT"""
+        if page_num == 1:
+            url = vehicle_config['url']
+            logger.debug(f"📄 Page 1 URL: {url}")
+        elif page_num == 2 and vehicle_config.get('page2_url'):
+            url = vehicle_config['page2_url']
+            logger.debug(f"📄 Page 2 URL: {url}")
+        elif vehicle_config.get('page2_url') and 'index2.html' in vehicle_config['page2_url']:
+            # For page 3+, replace index2.html with indexN.html in page2_url
+            url = vehicle_config['page2_url'].replace('index2.html', f'index{page_num}.html')
+            logger.debug(f"📄 Page {page_num} URL (generated): {url}")
+        else:
+            # Fallback to original method if no page2_url
+            base_url = vehicle_config['url'].split('?')[0]
+            params = vehicle_config['url'].split('?')[1] if '?' in vehicle_config['url'] else ''
+            url = f"{base_url}/index{page_num}.html?{params}"
+            logger.debug(f"📄 Page {page_num} URL (fallback): {url}")
+        if vehicle_config.get('incremental'):
+            url = self.newest_first_url(url)
+        return url
+
+    @staticmethod
+    def newest_first_url(url):
+        """Same listing URL with CarSensor's newest-first sort (SORT=19)"""
+        parts = urlsplit(url)
+        query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != 'SORT']
+        query.append(('SORT', NEWEST_FIRST_SORT))
+        return urlunsplit(parts._replace(query=urlencode(query, safe='*')))
+
+    @staticmethod
+    def take_until_known(records, known_ids, margin=INCREMENTAL_KNOWN_MARGIN):
+        """
+        Newest-first records up to where `margin` known vehicles in a row show
+        we have caught up with the last run. Returns (new records, caught_up).
+        """
+        fresh = []
+        known_run = 0
+        for record in records:
+            if record.source_id in known_ids:
+                known_run += 1
+                if known_run >= margin:
+                    return fresh, True
+            else:
+                known_run = 0
+                fresh.append(record)
+        return fresh, False
+
+    async def _prefetch_page(self, url, delay):
+        """Wait the usual politeness delay, then fetch a listing page in the background"""
+        await asyncio.sleep(delay)
+        return await self.fetch_page(url)
+
+    def schedule_prefetch(self, vehicle_config, page_num, pending_pages, last_page=None, fan_out=False, skip=()):
+        """
+        Queue background fetches for the pages after page_num.
+
+        Until the page count is known this is the pipelined mode: up to
+        prefetch_pages fetches, staggered like the serial walk. With fan_out
+        the last page is exact, so the next fanout_pages pages are requested
+        at once and the shared rate governor spaces them.
+        """
+        if last_page is None:
+            last_page = min(vehicle_config['max_pages'], 50)
+        ahead = self.fanout_pages if fan_out else self.prefetch_pages
+        delay = 0
+        for next_page in range(page_num + 1, min(page_num + ahead, last_page) + 1):
+            if next_page in pending_pages or next_page in skip:
+                continue
+            if not fan_out:
+                # Stagger requests so prefetching keeps the same spacing as the serial walk
+                delay += random.uniform(1, 3)
+            url = self.build_page_url(vehicle_config, next_page)
+            pending_pages[next_page] = asyncio.create_task(self._prefetch_page(url, delay))
+            logger.debug(f"⚡ Prefetching page {next_page} in {delay:.1f}s")
+
+    @staticmethod
+    def _log_page_limit(vehicle_config, total_pages):
+        """Log why the page walk stopped. Returns True if it stopped before the last results page."""
+        if total_pages is not None and total_pages <= min(vehicle_config['max_pages'], 50):
+            logger.success(f"🏁 Reached the last page ({total_pages}) of the search results")
+            return False
+        elif vehicle_config['max_pages'] > 50:
+            logger.warning(f"Reached hard limit of 50 pages")
+        else:
+            logger.info(f"Reached max pages limit ({vehicle_config['max_pages']})")
+        return True
+
     def setup_selenium_driver(self):
         """Setup headless Chrome driver for JavaScript-heavy pages"""
+        if self.driver is not None and not self.selenium_driver_healthy():
+            logger.warning("♻️ Selenium driver stopped responding - replacing it")
+            self.kill_selenium()
         if self.driver is None:
-            chrome_options = Options()
-            chrome_options.add_argument("--headless")
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
+            # Lean profile: no images, fonts, media or third-party scripts - only the gallery markup
+            chrome_options = enable_request_log(lean_chrome_options(random.choice(USER_AGENTS)))
             
             service = Service(ChromeDriverManager().install())
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            logger.info("Selenium Chrome driver initialized")
+            apply_request_blocking(self.driver)
+            logger.info("Selenium Chrome driver initialized (lean profile)")
         return self.driver
 
-    async def get_image_urls_from_detail_page(self, detail_url, max_retries=2):
+    async def get_image_urls_from_detail_page(self, detail_url, max_retries=2, seed_image_url=None):
+        """
+        Get all gallery image URLs for a vehicle, cheapest source first: URLs
+        synthesized from the listing photo, the static detail HTML, and only
+        then a rendered page.
+        """
+        if self.gallery_resolver and seed_image_url:
+            image_urls = await self.gallery_resolver.resolve(seed_image_url)
+            # A single hit may just mean the naming pattern doesn't continue for this vehicle
+            if len(image_urls) > 1:
+                logger.info(f"🧩 Synthesized gallery: {len(image_urls)} images")
+                return image_urls
+        if self.static_gallery:
+            image_urls = await self.get_image_urls_static(detail_url)
+            if image_urls is None:
+                return []
+            if image_urls:
+                return image_urls
+            logger.info(f"No gallery in static HTML, falling back to a browser: {detail_url}")
+        if self.browser_pool:
+            return await self.get_image_urls_with_browser(detail_url, max_retries)
+        return await self.get_image_urls_with_selenium(detail_url, max_retries)
+
+    async def get_image_urls_static(self, detail_url):
+        """
+        Read the gallery straight from the detail page HTML over plain HTTP.
+        Returns the URLs ([] if none were found), or None if the vehicle page is gone.
+        """
+        html = await self.fetch_page(detail_url, track_changes=False)
+        if html == "":
+            logger.warning(f"Detail page no longer exists: {detail_url}")
+            return None
+        if not html:
+            return []
+        
+        image_urls = extract_gallery_urls(html)
+        if image_urls:
+            logger.info(f"📸 Static gallery: {len(image_urls)} images")
+        return image_urls
+
+    async def get_image_urls_with_browser(self, detail_url, max_retries=2):
+        """Walk the detail page gallery in a pooled Playwright context"""
+        for attempt in range(max_retries):
+            logger.info(f"Rendering detail page gallery (attempt {attempt + 1}/{max_retries}): {detail_url}")
+            try:
+                # A hung page is abandoned and its context replaced by the pool
+                image_urls = await asyncio.wait_for(self._render_gallery(detail_url), BROWSER_PAGE_TIMEOUT)
+                if image_urls:
+                    logger.info(f"Successfully extracted {len(image_urls)} CarSensor image URLs")
+                    return image_urls
+                logger.warning(f"No images found on attempt {attempt + 1}/{max_retries} for {detail_url}")
+            except asyncio.TimeoutError:
+                logger.error(f"Browser page hung for {BROWSER_PAGE_TIMEOUT}s on {detail_url} - context replaced")
+            except Exception as e:
+                logger.error(f"Error rendering gallery (attempt {attempt + 1}/{max_retries}) for {detail_url}: {e}")
+            if attempt < max_retries - 1:
+                await asyncio.sleep(5)
+        
+        logger.error(f"FAILED: No CarSensor images found after {max_retries} attempts for {detail_url}")
+        return []
+
+    async def _render_gallery(self, detail_url):
+        """Open the detail page's gallery in a pooled context and collect its photo URLs"""
+        async with self.browser_pool.page() as page:
+            # Every photo the page asks for, including the ones the lean profile blocks
+            captured = []
+            page.on("request", lambda request: captured.append(request.url) if "/CSphoto/" in request.url else None)
+            
+            await page.goto(detail_url, wait_until="domcontentloaded")
+            main_src = await page.get_attribute("#js-mainPhoto", "src")
+            
+            expansion = await page.query_selector("div.detailSlider__expansion")
+            if expansion:
+                await expansion.evaluate("el => el.click()")
+                try:
+                    await page.wait_for_selector("a.js-photo", state="attached", timeout=5000)
+                except Exception:
+                    logger.info("Gallery thumbnails did not appear")
+            else:
+                logger.warning(f"No gallery expansion button found for {detail_url}")
+            
+            # One pass over the opened gallery's DOM and network traffic; click through only if it came up short
+            gallery_size = await page.evaluate(GALLERY_SIZE_SCRIPT)
+            image_urls = harvest_gallery_urls(await page.content(), captured, main_src)
+            if len(image_urls) >= max(gallery_size, 2):
+                logger.info(f"🕸️ Harvested {len(image_urls)} gallery images in one pass")
+            elif expansion:
+                stepped = await self._step_gallery_with_browser(page, main_src, gallery_size or MAX_GALLERY_STEPS)
+                if len(stepped) > len(image_urls):
+                    image_urls = stepped
+            return image_urls
+
+    async def _step_gallery_with_browser(self, page, main_src, max_steps):
+        """Click "next" through an opened gallery, reading #js-mainPhoto after each photo change"""
+        image_urls = []
+        if main_src and "carsensor.net" in main_src:
+            image_urls.append(normalize_photo_url(main_src))
+        
+        for _ in range(max_steps):
+            next_button = await page.query_selector("#js-nextPhoto")
+            if not next_button or not await next_button.is_enabled():
+                break
+            previous_src = await page.get_attribute("#js-mainPhoto", "src")
+            await next_button.evaluate("el => el.click()")
+            try:
+                await page.wait_for_function(
+                    "prev => document.getElementById('js-mainPhoto').getAttribute('src') !== prev",
+                    arg=previous_src, timeout=5000
+                )
+            except Exception:
+                break
+            img_src = await page.get_attribute("#js-mainPhoto", "src")
+            if not img_src or "carsensor.net" not in img_src:
+                continue
+            img_src = normalize_photo_url(img_src)
+            if img_src in image_urls[:1]:
+                logger.info("Cycled back to first image, all gallery images collected")
+                break
+            if img_src not in image_urls:
+                image_urls.append(img_src)
+        
+        return image_urls
+
+    async def get_image_urls_with_selenium(self, detail_url, max_retries=2):
+        """Run the blocking Selenium gallery walk in a worker thread so the event loop keeps going"""
+        async with self.selenium_lock:  # one shared driver
+            generation = self.selenium_generation
+            try:
+                return await asyncio.wait_for(
+                    asyncio.to_thread(self._collect_gallery_with_selenium, detail_url, max_retries, generation),
+                    BROWSER_PAGE_TIMEOUT * max_retries
+                )
+            except asyncio.TimeoutError:
+                # The thread can't be cancelled: kill its browser so its calls fail, and start fresh
+                logger.error(f"Selenium hung on {detail_url} - killing the browser")
+                await asyncio.to_thread(self.kill_selenium)
+                return []
+            finally:
+                # driver.quit() and the /proc walk block, so they run off the event loop too
+                self.selenium_pages += 1
+                await asyncio.to_thread(self.recycle_selenium_if_needed)
+
+    def selenium_driver_healthy(self):
+        """Cheap liveness probe: the driver answers a trivial script"""
+        try:
+            self.driver.execute_script("return document.readyState")
+            return True
+        except Exception:
+            return False
+
+    def recycle_selenium_if_needed(self):
+        """Quit the driver after BROWSER_RECYCLE_PAGES pages or once Chrome grows past BROWSER_MAX_RSS_MB"""
+        if self.driver is None:
+            return
+        reason = None
+        if self.selenium_pages >= BROWSER_RECYCLE_PAGES:
+            reason = f"{self.selenium_pages} pages"
+        else:
+            pid = self.driver.service.process.pid if self.driver.service.process else None
+            rss_mb = process_tree_rss_mb(pid) if pid else None
+            if rss_mb is not None and rss_mb > BROWSER_MAX_RSS_MB:
+                reason = f"{rss_mb:.0f} MB RSS"
+        if reason:
+            logger.info(f"♻️ Recycling Selenium driver after {reason}")
+            self.cleanup_selenium()
+
+    def _collect_gallery_with_selenium(self, detail_url, max_retries=2, generation=None):
         """Uses Selenium to get all images from the detail page gallery"""
         for attempt in range(max_retries):
+            if generation is not None and generation != self.selenium_generation:
+                return []  # abandoned after a hang; the driver was killed under us
             try:
                 driver = self.setup_selenium_driver()
                 logger.info(f"Loading detail page to get all gallery images (attempt {attempt + 1}/{max_retries}): {detail_url}")
+                drain_request_log(driver)  # drop the previous page's requests
                 driver.get(detail_url)
                 
-                # Wait for page to load
-                time.sleep(3)
+                # Wait for the photo element rather than a fixed delay
+                try:
+                    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, "js-mainPhoto")))
+                except TimeoutException:
+                    logger.warning(f"Main photo did not appear within 10s: {detail_url}")
                 
                 # Get the main image URL from the detail page
                 image_urls = []
                 bkkn_images = []
+                main_src = None
                 try:
                     main_img = driver.find_element(By.ID, "js-mainPhoto")
                     if main_img:
@@ -372,14 +872,23 @@ class UniversalCarSensorScraper:
                     logger.info("Found gallery expansion button. Clicking to open gallery...")
                     expansion_button = expansion_buttons[0]
                     driver.execute_script("arguments[0].scrollIntoView(true);", expansion_button)
-                    time.sleep(1)
                     driver.execute_script("arguments[0].click();", expansion_button)
                 
-                    # Wait for the gallery to load
-                    time.sleep(3)
+                    # Wait for the gallery thumbnails to load
+                    try:
+                        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, "a.js-photo")))
+                    except TimeoutException:
+                        logger.info("Gallery thumbnails did not appear")
                     
-                    # Navigate through all gallery images
-                    max_attempts = 50  # Safety limit
+                    # One pass over the opened gallery's DOM and the photo URLs Chrome requested
+                    gallery_size = driver.execute_script("return " + GALLERY_SIZE_SCRIPT) or 0
+                    harvested = harvest_gallery_urls(driver.page_source, drain_request_log(driver), main_src)
+                    fully_harvested = len(harvested) >= max(gallery_size, 2)
+                    if fully_harvested:
+                        logger.info(f"🕸️ Harvested {len(harvested)} gallery images in one pass")
+                    
+                    # Otherwise click through, at most once per photo
+                    max_attempts = 0 if fully_harvested else (gallery_size or MAX_GALLERY_STEPS)
                     attempts = 0
                     
                     while attempts < max_attempts:
@@ -397,14 +906,23 @@ class UniversalCarSensorScraper:
                             # Try to click next button to get next image
                             next_buttons = driver.find_elements(By.ID, "js-nextPhoto")
                             if next_buttons and next_buttons[0].is_enabled():
+                                previous_src = driver.find_element(By.ID, "js-mainPhoto").get_attribute("src")
                                 driver.execute_script("arguments[0].click();", next_buttons[0])
-                                time.sleep(1)
                                 attempts += 1
                                 
+                                # Wait for the photo to actually change instead of sleeping
+                                try:
+                                    WebDriverWait(driver, 5).until(
+                                        lambda d: d.find_element(By.ID, "js-mainPhoto").get_attribute("src") != previous_src
+                                    )
+                                except TimeoutException:
+                                    logger.info("Gallery photo stopped changing, finished collecting gallery images")
+                                    break
+                                
                                 # Check if we've cycled back to the first image
                                 current_img = driver.find_element(By.ID, "js-mainPhoto")
                                 current_src = current_img.get_attribute("src")
-                                if current_src in image_urls[:1]:
+                                if current_src in bkkn_images[:1]:
                                     logger.info("Cycled back to first image, all gallery images collected")
                                     break
                             else:
@@ -416,7 +934,7 @@ class UniversalCarSensorScraper:
                             break
                     
                     # Use the bkkn images we collected
-                    image_urls = bkkn_images
+                    image_urls = harvested if len(harvested) > len(bkkn_images) else bkkn_images
                     
                 except Exception as e:
                     logger.warning(f"Could not access gallery for {detail_url}: {e}. Using any bkkn images found: {len(bkkn_images)}")
@@ -450,54 +968,47 @@ class UniversalCarSensorScraper:
     def cleanup_selenium(self):
         """Clean up Selenium driver"""
         if self.driver:
-            self.driver.quit()
+            try:
+                self.driver.quit()
+            except Exception as e:
+                logger.warning(f"Selenium quit failed ({e}) - killing the browser")
+                self.kill_selenium()
             self.driver = None
+        self.selenium_pages = 0
 
-    async def parse_vehicle(self, session, vehicle_div, manufacturer_id, model_id, manufacturer_name, model_name):
+    def kill_selenium(self):
+        """Hard-kill chromedriver and its Chrome processes (for a hung or dead driver)"""
+        if self.driver is not None:
+            process = self.driver.service.process
+            if process:
+                kill_process_tree(process.pid)
+        self.driver = None
+        self.selenium_pages = 0
+        self.selenium_generation += 1
+
+    async def parse_vehicle(self, session, record, manufacturer_id, model_id, manufacturer_name, model_name):
+        """Enrich a ListingRecord into a vehicle ready to be saved (None if skipped on purpose; raises on errors)"""
         vehicle = {"source_site": "carsensor"}
         try:
             # Ensure database is connected
             if not self.db.pool:
                 await self.db.connect()
-                
-            # Find the main image link (contains the detail URL)
-            link_tag = vehicle_div.select_one('.cassetteMain__mainImg a')
-            if not link_tag or not link_tag.get('href'):
-                logger.warning("Could not find detail link for a vehicle.")
-                return None
-            
-            detail_url = link_tag['href']
-            if not detail_url.startswith('http'):
-                detail_url = "https://www.carsensor.net" + detail_url
             
-            vehicle["source_url"] = detail_url
-            
-            # Extract source ID from CarSensor URL
-            source_id_match = re.search(r'/([A-Z0-9]+)/index\.html', detail_url)
-            if source_id_match:
-                vehicle["source_id"] = source_id_match.group(1)
-            else:
-                alt_match = re.search(r'/detail/([A-Z0-9]+)/', detail_url)
-                vehicle["source_id"] = alt_match.group(1) if alt_match else "N/A"
-                
-            if vehicle["source_id"] == "N/A":
-                logger.warning(f"Could not extract source_id from URL: {detail_url}")
-                return None
+            vehicle["source_url"] = record.detail_url
+            vehicle["source_id"] = record.source_id
 
-            # CRITICAL FIX: Check if vehicle already exists BEFORE processing
-            if await self.db.vehicle_exists(vehicle["source_id"]):
-                logger.info(f"⏭️ Skipping existing vehicle {vehicle['source_id']} - already in database")
+            # CRITICAL FIX: Check if vehicle already exists BEFORE processing (in-memory, see utils/known_vehicles.py)
+            if self.known_vehicles.contains("carsensor", record.source_id):
+                logger.info(f"⏭️ Skipping existing vehicle {record.source_id} - already in database")
                 return None  # Skip this vehicle entirely, don't download images!
 
             # Set manufacturer and model IDs
             vehicle["manufacturer_id"] = manufacturer_id
             vehicle["model_id"] = model_id
 
-            # Get title from image alt text
-            img_elem = vehicle_div.select_one('.cassetteMain__mainImg img')
-            if img_elem and img_elem.get('alt'):
-                japanese_title = img_elem['alt'].strip()
-                english_title = self.translator.translate_text(japanese_title)
+            # Title comes from the main image alt text
+            if record.title:
+                english_title = self.translator.translate_text(record.title)
                 
                 # Include manufacturer and model in title
                 if manufacturer_name not in english_title and model_name not in english_title:
@@ -507,58 +1018,23 @@ class UniversalCarSensorScraper:
             else:
                 vehicle["title_description"] = f"{manufacturer_name} {model_name}"
 
-            # Parse price
-            price_main_elem = vehicle_div.select_one(".totalPrice__mainPriceNum")
-            price_sub_elem = vehicle_div.select_one(".totalPrice__subPriceNum")
-            if price_main_elem:
-                price_str = price_main_elem.text.strip()
-                if price_sub_elem:
-                    price_str += price_sub_elem.text.strip()
-                vehicle["price_vehicle_yen"] = int(float(price_str) * 10000)
-            else:
-                 vehicle["price_vehicle_yen"] = 0
-            vehicle["price_total_yen"] = vehicle["price_vehicle_yen"]
-
-            # Parse year and mileage
-            vehicle["model_year_ad"] = 0
-            vehicle["mileage_km"] = 0
-            spec_boxes = vehicle_div.select(".specList__detailBox")
-            for box in spec_boxes:
-                dt = box.find("dt")
-                dd = box.find("dd")
-                if dt and dd:
-                    label = dt.text.strip()
-                    value = dd.text.strip()
-                    if "年式" in label:
-                        year_match = re.search(r'(\d{4})', value)
-                        if year_match:
-                            vehicle["model_year_ad"] = int(year_match.group(1))
-                    elif "走行距離" in label:
-                        mileage_match = re.search(r'([\d\.]+)', value)
-                        if mileage_match:
-                            mileage_val = float(mileage_match.group(1))
-                            if "万km" in value:
-                                vehicle["mileage_km"] = int(mileage_val * 10000)
-                            else:
-                                vehicle["mileage_km"] = int(mileage_val)
+            vehicle["price_vehicle_yen"] = record.price_yen
+            vehicle["price_total_yen"] = record.price_yen
+            vehicle["model_year_ad"] = record.model_year
+            vehicle["mileage_km"] = record.mileage_km
             
             # Skip old vehicles
             if vehicle["model_year_ad"] != 0 and vehicle["model_year_ad"] < MIN_YEAR:
                 return None
             
-            # Parse location
-            area_div = vehicle_div.select_one(".cassetteSub__area")
-            if area_div:
-                location_parts = [p.text.strip() for p in area_div.find_all("p")]
-                vehicle["location_prefecture"] = " ".join(location_parts)
-            else:
-                vehicle["location_prefecture"] = "N/A"
-
+            vehicle["location_prefecture"] = record.location
             vehicle["has_repair_history"] = False
             vehicle["has_warranty"] = False
 
             # Get all image URLs from detail page gallery
-            image_urls = await self.get_image_urls_from_detail_page(detail_url)
+            image_urls = await self.get_image_urls_from_detail_page(
+                record.detail_url, seed_image_url=record.image_url
+            )
             
             vehicle["images"] = []
             if image_urls:
@@ -601,241 +1077,643 @@ class UniversalCarSensorScraper:
 
             return vehicle
         except Exception as e:
+            # Re-raised so process_records counts it and the page is left open for the next run / --resume
             logger.error(f"Error parsing vehicle. URL: {vehicle.get('source_url', 'N/A')}, Error: {e}", exc_info=True)
-            return None
+            raise
+
+    @staticmethod
+    def model_key(vehicle_config):
+        return f"{vehicle_config['manufacturer']} {vehicle_config['model']}"
+
+    def page_completed(self, vehicle_config, page_num, url, fingerprint, records, total=None, page_errors=0):
+        """
+        Record a fully processed page in the change store and the journal.
+        A page with failed vehicles is left open instead, so both the next
+        run and --resume process it again.
+        """
+        if page_errors:
+            logger.warning(f"⚠️ PAGE {page_num}: {page_errors} vehicles failed - page left open to retry them")
+            return
+        source_ids = [r.source_id for r in records]
+        if self.page_store:
+            self.page_store.commit(url, fingerprint, source_ids, total)
+        if self.journal:
+            self.journal.page_done(self.model_key(vehicle_config), page_num, source_ids)
+
+    async def _track_churn(self, vehicle_config, page_num, records, existing_prices):
+        """
+        Count seen vehicles, price changes and how deep new vehicles appear on this page.
+        Known vehicles are never re-saved, so their last_scraped_at and any changed
+        prices are written here (one UPDATE per page) - otherwise the same change
+        would be counted on every run.
+        """
+        stats = self.model_stats[self.model_key(vehicle_config)]
+        stats['pages'] += 1
+        has_new = False
+        seen_prices = {}
+        changed_prices = {}
+        for record in records:
+            stats['seen'].add(record.source_id)
+            old_price = existing_prices.get(record.source_id)
+            if record.source_id not in existing_prices:
+                has_new = True
+            elif record.price_yen and old_price != record.price_yen:
+                changed_prices[record.source_id] = record.price_yen
+                seen_prices[record.source_id] = record.price_yen
+            else:
+                seen_prices[record.source_id] = None
+        if has_new:
+            stats['deepest_new_page'] = max(stats['deepest_new_page'], page_num)
+        if changed_prices:
+            stats['price_changed'] += len(changed_prices)
+            # Also keeps a retried page from counting the same changes twice
+            existing_prices.update(changed_prices)
+        if seen_prices:
+            try:
+                await self.db.mark_vehicles_seen(seen_prices)
+            except Exception as e:
+                logger.warning(f"Could not update {len(seen_prices)} known vehicles on page {page_num}: {e}")
+
+    def _restore_unchanged_page(self, vehicle_config, page_num, url, found_vehicle_ids):
+        """Reuse the stored result of an unchanged page: no dedup lookups, no enrichment, no DB writes"""
+        previous = self.page_store.get(url)
+        last_checked = previous.get('checked_at', 'last run')
+        self.page_store.touch(url)
+        found_vehicle_ids.update(previous.get('source_ids', []))
+        stats = self.model_stats.get(self.model_key(vehicle_config))
+        if stats is not None:
+            stats['pages'] += 1
+            stats['seen'].update(previous.get('source_ids', []))
+        if self.journal:
+            self.journal.page_done(self.model_key(vehicle_config), page_num, previous.get('source_ids', []))
+        logger.success(f"⏭️ PAGE {page_num} UNCHANGED since {last_checked} - skipped")
+        return previous
+
+    async def process_records(self, session, records, page_num, vehicle_config, manufacturer_id, model_id,
+                              found_vehicle_ids, all_vehicles):
+        """
+        Enrich and save records not seen yet. Returns (saved count, error count).
+        
+        Up to browser_pool_size vehicles are enriched at once; saving happens
+        afterwards in page order.
+        """
+        processed_count = 0
+        page_errors = 0
+        
+        pending = []
+        pending_ids = set()
+        for record in records:
+            # The same vehicle can appear twice on a page
+            if record.source_id in found_vehicle_ids or record.source_id in pending_ids:
+                logger.debug(f"⭕ Skipping duplicate vehicle {record.source_id}")
+                continue
+            pending_ids.add(record.source_id)
+            pending.append(record)
+        
+        async def enrich(record):
+            async with self.enrich_semaphore:
+                return await self.parse_vehicle(
+                    session, record, manufacturer_id, model_id,
+                    vehicle_config['manufacturer'], vehicle_config['model']
+                )
+        
+        results = await asyncio.gather(*(enrich(record) for record in pending), return_exceptions=True)
+        
+        ready = []
+        for record, vehicle in zip(pending, results):
+            if isinstance(vehicle, Exception):
+                page_errors += 1
+                logger.error(f"Failed to process vehicle {record.source_id}: {vehicle}")
+            elif vehicle:
+                # Add to tracking set
+                found_vehicle_ids.add(record.source_id)
+                ready.append((record, vehicle))
+        
+        if not ready:
+            return processed_count, page_errors
+        
+        # Save the whole page in one round-trip; on failure retry row by row to isolate the bad one
+        try:
+            rows = await self.db.upsert_vehicles([vehicle for _, vehicle in ready])
+        except Exception as e:
+            logger.warning(f"Batch save of {len(ready)} vehicles failed ({e}) - saving one by one")
+            rows = []
+            for record, vehicle in ready:
+                try:
+                    rows.extend(await self.db.upsert_vehicles([vehicle]))
+                except Exception as row_error:
+                    page_errors += 1
+                    logger.error(f"Failed to save vehicle {record.source_id}: {row_error}")
+        saved = {row["source_id"]: row for row in rows}
+        
+        for record, vehicle in ready:
+            row = saved.get(record.source_id)
+            if row is None:
+                continue
+            try:
+                vehicle_id = row["id"]
+                self.known_vehicles.add("carsensor", record.source_id)
+                if row["inserted"]:
+                    self.run_counts["added"] += 1
+                elif row["changed"]:
+                    self.run_counts["updated"] += 1
+                    if row["relisted"]:
+                        self.run_counts["relisted"] += 1
+                else:
+                    self.run_counts["unchanged"] += 1
+                logger.info(f"💾 Saved vehicle: {vehicle['title_description'][:40]}...")
+                
+                # Save images
+                for img in vehicle.get("images", []):
+                    img["vehicle_id"] = vehicle_id
+                await self.db.save_vehicle_images(vehicle.get("images", []))
+                
+                if self.journal:
+                    self.journal.vehicle_done(
+                        self.model_key(vehicle_config), page_num, record.source_id, vehicle_id
+                    )
+                all_vehicles.append(vehicle)
+                processed_count += 1
+                
+            except Exception as e:
+                page_errors += 1
+                logger.error(f"Failed to process vehicle {record.source_id}: {e}")
+        
+        return processed_count, page_errors
+
+    async def retry_failed_pages(self, session, page_nums, vehicle_config, manufacturer_id, model_id,
+                                 found_vehicle_ids, all_vehicles, existing_prices):
+        """Second, slower round for pages that failed during the walk. Returns pages that still failed."""
+        still_failed = []
+        logger.info(f"🔁 Retrying {len(page_nums)} failed pages: {page_nums}")
+        
+        for page_num in page_nums:
+            url = self.build_page_url(vehicle_config, page_num)
+            html = await self.fetch_page(url, retries=RETRY_QUEUE_ATTEMPTS)
+            if html is None:
+                still_failed.append(page_num)
+                continue
+            if html == "":
+                logger.info(f"Page {page_num} does not exist")
+                continue
+            if html is NOT_MODIFIED:
+                self._restore_unchanged_page(vehicle_config, page_num, url, found_vehicle_ids)
+                continue
+            
+            records, total = self.listing_parser.parse_page(html)
+            del html
+            fingerprint = fingerprint_records(records)
+            if self.skip_unchanged and self.page_store.is_unchanged(url, fingerprint):
+                self._restore_unchanged_page(vehicle_config, page_num, url, found_vehicle_ids)
+                continue
+            
+            await self._track_churn(vehicle_config, page_num, records, existing_prices)
+            processed_count, page_errors = await self.process_records(
+                session, records, page_num, vehicle_config, manufacturer_id, model_id, found_vehicle_ids, all_vehicles
+            )
+            logger.success(f"✅ RETRIED PAGE {page_num} COMPLETE: {processed_count} new vehicles saved")
+            self.page_completed(vehicle_config, page_num, url, fingerprint, records, total, page_errors)
+        
+        return still_failed
 
     async def scrape_model(self, vehicle_config):
         """Scrape a single make/model based on configuration"""
-        logger.info(f"🚗 Starting scraper for {vehicle_config['manufacturer']} {vehicle_config['model']}")
+        model_key = self.model_key(vehicle_config)
+        logger.info(f"🚗 Starting scraper for {model_key}")
         logger.info(f"📋 URL: {vehicle_config['url']}")
         logger.info(f"📋 Max pages: {vehicle_config['max_pages']}")
+        self.failed_pages.pop(model_key, None)
         
         # Get or create manufacturer and model IDs
         manufacturer_id, model_id = await self.setup_model_ids(vehicle_config)
         
-        # PRE-LOAD ALL EXISTING VEHICLES FOR THIS MODEL
-        logger.info(f"📊 Loading existing vehicles for {vehicle_config['manufacturer']} {vehicle_config['model']}...")
-        existing_ids = await self.db.get_existing_vehicle_ids_for_model(model_id)
-        logger.info(f"📊 Found {len(existing_ids)} existing vehicles in database for this model")
-        
-        # Create session with better connection settings
-        connector = aiohttp.TCPConnector(
-            limit=10,
-            limit_per_host=3,
-            ttl_dns_cache=300,
-            use_dns_cache=True,
-            ssl=False
-        )
-        timeout = aiohttp.ClientTimeout(total=30, connect=10)
-        
-        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
-            page_num = 1
-            all_vehicles = []
-            found_vehicle_ids = existing_ids.copy()  # Start with existing IDs!
-            
+        # Every vehicle already in the database, loaded once for the whole run
+        await self.known_vehicles.load(self.db.pool)
+        # This model's prices, to count price changes
+        existing_prices = await self.db.get_existing_vehicle_prices_for_model(model_id)
+        logger.info(f"📊 Found {len(existing_prices)} existing vehicles in database for this model")
+        incremental = vehicle_config.get('incremental', False)
+        if incremental:
+            logger.info("🆕 Incremental run: newest first, stopping at known vehicles")
+        # cut_off/resumed: the walk did not see every listing page itself (see sweep_skip_reason)
+        stats = {'price_changed': 0, 'seen': set(), 'pages': 0, 'deepest_new_page': 0, 'incremental': incremental,
+                 'full_sweep': vehicle_config.get('full_sweep', True) and not incremental,
+                 'cut_off': False, 'resumed': False, 'finished': False, 'model_id': model_id, 'new': 0, 'sold': 0}
+        self.model_stats[model_key] = stats
+        
+        # One keep-alive session for the whole process (see utils/http_client.py)
+        session = await self.http.session()
+        
+        page_num = 1
+        all_vehicles = []
+        found_vehicle_ids = self.known_vehicles.scope("carsensor")  # Start with existing IDs!
+        pending_pages = {}  # page_num -> prefetch task
+        retry_queue = []  # pages that failed to fetch, retried after the walk
+        consecutive_failures = 0
+        # Exact page count from the result bar; until it is known the walk relies on heuristics
+        total_pages = None
+        last_page = min(vehicle_config['max_pages'], 50)
+        
+        # Pages and vehicles the interrupted run already finished (--resume)
+        done_pages = self.resume_state.done_pages(model_key) if self.resume_state else {}
+        if done_pages:
+            found_vehicle_ids.update(self.resume_state.done_vehicles(model_key))
+            stats['resumed'] = True
+            logger.info(f"📝 Resuming {model_key}: pages {sorted(done_pages)} already done")
+        
+        try:
             while True:
-                logger.info(f"📄 STARTING PAGE {page_num} - Searching for {vehicle_config['manufacturer']} {vehicle_config['model']}...")
-                
-                # Build page URL with DUAL URL SUPPORT
-                if page_num == 1:
-                    url = vehicle_config['url']
-                    logger.info(f"📄 Page 1 URL: {url}")
-                elif page_num == 2 and vehicle_config.get('page2_url'):
-                    url = vehicle_config['page2_url']
-                    logger.info(f"📄 Page 2 URL: {url}")
+                if page_num in done_pages:
+                    page_ids = done_pages[page_num]
+                    found_vehicle_ids.update(page_ids)
+                    logger.info(f"⏭️ PAGE {page_num} already completed in the interrupted run")
+                    if len(page_ids) < LISTING_PAGE_SIZE:
+                        logger.success(f"🏁 Reached last page (only {len(page_ids)} vehicles on page)")
+                        break
+                    page_num += 1
+                    if page_num > last_page:
+                        stats['cut_off'] = self._log_page_limit(vehicle_config, total_pages)
+                        break
+                    continue
+            
+                logger.info(f"📄 STARTING PAGE {page_num} - Searching for {model_key}...")
+            
+                url = self.build_page_url(vehicle_config, page_num)
+                logger.info(f"📄 Page {page_num} URL: {url}")
+            
+                prefetched = pending_pages.pop(page_num, None)
+                if prefetched:
+                    html = await prefetched
+                    logger.info(f"⚡ Page {page_num} was prefetched")
                 else:
-                    # For page 3+, replace index2.html with indexN.html in page2_url
-                    if vehicle_config.get('page2_url') and 'index2.html' in vehicle_config['page2_url']:
-                        url = vehicle_config['page2_url'].replace('index2.html', f'index{page_num}.html')
-                        logger.info(f"📄 Page {page_num} URL (generated): {url}")
-                    else:
-                        # Fallback to original method if no page2_url
-                        base_url = vehicle_config['url'].split('?')[0]
-                        params = vehicle_config['url'].split('?')[1] if '?' in vehicle_config['url'] else ''
-                        url = f"{base_url}/index{page_num}.html?{params}"
-                        logger.warning(f"📄 Page {page_num} URL (fallback): {url}")
-                
-                html = await self.fetch_page(session, url)
-                if not html:
-                    logger.warning(f"Failed to fetch page {page_num}")
+                    html = await self.fetch_page(url)
+            
+                if html is None:
+                    # Don't lose the rest of the model to one bad page - retry it at the end
+                    retry_queue.append(page_num)
+                    consecutive_failures += 1
+                    logger.warning(f"Failed to fetch page {page_num} - queued for retry")
+                    if consecutive_failures >= MAX_CONSECUTIVE_FAILED_PAGES:
+                        logger.error(f"❌ {consecutive_failures} pages in a row failed - stopping page walk for {model_key}")
+                        stats['cut_off'] = True
+                        break
+                    page_num += 1
+                    if page_num > last_page:
+                        stats['cut_off'] = self._log_page_limit(vehicle_config, total_pages)
+                        break
+                    continue
+                consecutive_failures = 0
+            
+                if html == "":
+                    logger.info(f"Page {page_num} does not exist. Reached end of results.")
                     break
-                    
-                soup = BeautifulSoup(html, "html.parser")
+            
+                if html is NOT_MODIFIED:
+                    records = None
+                    total = (self.page_store.get(url) or {}).get('total')
+                else:
+                    # Single extraction pass: every later stage reads these records, not the HTML
+                    records, total = self.listing_parser.parse_page(html)
+                    del html
+                    fingerprint = fingerprint_records(records)
+            
+                # Result count known: fetch exactly the pages that exist, several at a time
+                if total_pages is None and total is not None:
+                    total_pages = max(1, math.ceil(total / LISTING_PAGE_SIZE))
+                    last_page = min(last_page, total_pages)
+                    logger.info(f"📊 {total} vehicles listed = {total_pages} pages (scraping up to page {last_page})")
+            
+                # Unchanged page: no dedup lookups, no enrichment, no DB writes
+                if self.skip_unchanged and (records is None or self.page_store.is_unchanged(url, fingerprint)):
+                    previous = self._restore_unchanged_page(vehicle_config, page_num, url, found_vehicle_ids)
+                
+                    if incremental:
+                        logger.success("🏁 No new listings since the last run - incremental run done")
+                        break
+                    if previous.get('count', 0) < LISTING_PAGE_SIZE:
+                        logger.success(f"🏁 Reached last page (only {previous.get('count', 0)} vehicles on page)")
+                        break
+                
+                    self.schedule_prefetch(vehicle_config, page_num, pending_pages, last_page,
+                                           fan_out=total_pages is not None and not incremental, skip=done_pages)
+                    page_num += 1
+                    if page_num > last_page:
+                        stats['cut_off'] = self._log_page_limit(vehicle_config, total_pages)
+                        break
+                    if page_num not in pending_pages:
+                        await asyncio.sleep(random.uniform(1, 3))
+                    continue
                 
-                # Find vehicle containers
-                vehicle_divs = soup.find_all("div", class_="cassetteMain")
-                logger.info(f"Found {len(vehicle_divs)} vehicle cassettes on page {page_num}")
+                logger.info(f"Found {len(records)} vehicle cassettes on page {page_num}")
 
-                if not vehicle_divs:
+                if not records:
                     logger.info(f"No vehicles found on page {page_num}. Reached end of results.")
                     break
-                
+            
+                # Start fetching the next page(s) while this page is enriched and saved
+                self.schedule_prefetch(vehicle_config, page_num, pending_pages, last_page,
+                                       fan_out=total_pages is not None and not incremental, skip=done_pages)
+                await self._track_churn(vehicle_config, page_num, records, existing_prices)
+            
                 # Process vehicles and track duplicates
-                processed_count = 0
-                new_vehicles_on_page = 0
-                duplicate_vehicles_on_page = 0
-                
-                # First pass: quickly check for duplicates by extracting source_ids
-                page_source_ids = []
-                for div in vehicle_divs:
-                    try:
-                        link_tag = div.select_one('.cassetteMain__mainImg a')
-                        if link_tag and link_tag.get('href'):
-                            detail_url = link_tag['href']
-                            if not detail_url.startswith('http'):
-                                detail_url = "https://www.carsensor.net" + detail_url
-                            
-                            # Extract source ID
-                            source_id_match = re.search(r'/([A-Z0-9]+)/index\.html', detail_url)
-                            if source_id_match:
-                                source_id = source_id_match.group(1)
-                            else:
-                                alt_match = re.search(r'/detail/([A-Z0-9]+)/', detail_url)
-                                source_id = alt_match.group(1) if alt_match else None
-                            
-                            if source_id:
-                                page_source_ids.append(source_id)
-                                if source_id in found_vehicle_ids:
-                                    duplicate_vehicles_on_page += 1
-                                else:
-                                    new_vehicles_on_page += 1
-                    except:
-                        pass
-                
+                caught_up = False
+                if incremental:
+                    new_records, caught_up = self.take_until_known(records, found_vehicle_ids)
+                else:
+                    new_records = [r for r in records if r.source_id not in found_vehicle_ids]
+                new_vehicles_on_page = len(new_records)
+                duplicate_vehicles_on_page = len(records) - new_vehicles_on_page
+            
                 # Calculate duplicate percentage
-                total_on_page = len(page_source_ids)
-                duplicate_percentage = (duplicate_vehicles_on_page / total_on_page * 100) if total_on_page > 0 else 0
-                
+                total_on_page = len(records)
+                duplicate_percentage = duplicate_vehicles_on_page / total_on_page * 100
+            
                 logger.info(f"📊 Page {page_num} Quick Check: {new_vehicles_on_page} new, {duplicate_vehicles_on_page} duplicates ({duplicate_percentage:.1f}% duplicates)")
-                
-                # STOP CONDITIONS:
-                # 1. If page has fewer than 30 vehicles AND no duplicates (true last page)
-                if len(vehicle_divs) < 30 and duplicate_percentage == 0:
-                    logger.success(f"🏁 LAST PAGE detected: {len(vehicle_divs)} vehicles (< 30) with no duplicates")
-                # 2. If more than 80% are duplicates (we've gone past the end)
-                elif duplicate_percentage > 80:
-                    logger.warning(f"⚠️ Page {page_num} has {duplicate_percentage:.1f}% duplicates. We've likely gone past the last page.")
-                    logger.success(f"🏁 Stopping - reached end of unique results for {vehicle_config['manufacturer']} {vehicle_config['model']}")
-                    break
-                # 3. If ALL vehicles are duplicates
-                elif new_vehicles_on_page == 0 and total_on_page > 0:
-                    logger.warning(f"⚠️ Page {page_num} has 100% duplicates. Definitely past the last page.")
-                    logger.success(f"🏁 Stopping - no new vehicles found for {vehicle_config['manufacturer']} {vehicle_config['model']}")
-                    break
-                
+            
+                # STOP CONDITIONS (only needed while the page count is unknown):
+                if total_pages is None and not incremental:
+                    # 1. If page has fewer than 30 vehicles AND no duplicates (true last page)
+                    if len(records) < LISTING_PAGE_SIZE and duplicate_percentage == 0:
+                        logger.success(f"🏁 LAST PAGE detected: {len(records)} vehicles (< 30) with no duplicates")
+                    # 2. If more than 80% are duplicates (we've gone past the end)
+                    elif duplicate_percentage > 80:
+                        logger.warning(f"⚠️ Page {page_num} has {duplicate_percentage:.1f}% duplicates. We've likely gone past the last page.")
+                        logger.success(f"🏁 Stopping - reached end of unique results for {model_key}")
+                        stats['cut_off'] = True  # a guess, not a confirmed last page
+                        break
+                    # 3. If ALL vehicles are duplicates
+                    elif new_vehicles_on_page == 0:
+                        logger.warning(f"⚠️ Page {page_num} has 100% duplicates. Definitely past the last page.")
+                        logger.success(f"🏁 Stopping - no new vehicles found for {model_key}")
+                        stats['cut_off'] = True
+                        break
+            
                 # Process only the new vehicles
-                for i, div in enumerate(vehicle_divs):
-                    try:
-                        # Quick check if this is a duplicate
-                        link_tag = div.select_one('.cassetteMain__mainImg a')
-                        if link_tag and link_tag.get('href'):
-                            detail_url = link_tag['href']
-                            if not detail_url.startswith('http'):
-                                detail_url = "https://www.carsensor.net" + detail_url
-                            
-                            # Extract source ID for quick duplicate check
-                            source_id_match = re.search(r'/([A-Z0-9]+)/index\.html', detail_url)
-                            if source_id_match:
-                                quick_source_id = source_id_match.group(1)
-                            else:
-                                alt_match = re.search(r'/detail/([A-Z0-9]+)/', detail_url)
-                                quick_source_id = alt_match.group(1) if alt_match else None
-                            
-                            # Skip if duplicate
-                            if quick_source_id and quick_source_id in found_vehicle_ids:
-                                logger.debug(f"⭕ Skipping duplicate vehicle {quick_source_id}")
-                                continue
-                        
-                        # Process the vehicle
-                        vehicle = await self.parse_vehicle(
-                            session, div, manufacturer_id, model_id, 
-                            vehicle_config['manufacturer'], vehicle_config['model']
-                        )
-                        
-                        if vehicle:
-                            source_id = vehicle["source_id"]
-                            
-                            # Double-check for duplicate (belt and suspenders)
-                            if source_id in found_vehicle_ids:
-                                logger.debug(f"⭕ Skipping duplicate vehicle {source_id} (caught in processing)")
-                                continue
-                            
-                            # Add to tracking set
-                            found_vehicle_ids.add(source_id)
-                            
-                            # Save vehicle to database
-                            vehicle_id = await self.db.create_vehicle(vehicle)
-                            logger.info(f"💾 Saved vehicle: {vehicle['title_description'][:40]}...")
-                            
-                            # Save images
-                            for img in vehicle.get("images", []):
-                                img["vehicle_id"] = vehicle_id
-                                await self.db.create_vehicle_image(img)
-                            
-                            all_vehicles.append(vehicle)
-                            processed_count += 1
-                            
-                    except Exception as e:
-                        logger.error(f"Failed to process vehicle {i+1}: {e}")
-                
+                processed_count, page_errors = await self.process_records(
+                    session, new_records, page_num, vehicle_config, manufacturer_id, model_id, found_vehicle_ids, all_vehicles
+                )
+            
                 logger.success(f"✅ PAGE {page_num} COMPLETE: {processed_count} new vehicles saved | TOTAL: {len(all_vehicles)} vehicles")
-                
+            
+                self.page_completed(vehicle_config, page_num, url, fingerprint, records, total, page_errors)
+            
+                if caught_up:
+                    logger.success(f"🏁 Caught up with known vehicles on page {page_num} - incremental run done")
+                    break
+            
                 # Check if this is the last page (< 30 vehicles with low duplicate rate)
-                if len(vehicle_divs) < 30 and duplicate_percentage < 50:
-                    logger.success(f"🏁 Reached last page (only {len(vehicle_divs)} vehicles on page)")
+                if len(records) < LISTING_PAGE_SIZE and duplicate_percentage < 50:
+                    logger.success(f"🏁 Reached last page (only {len(records)} vehicles on page)")
                     break
-                
+            
                 page_num += 1
-                
-                # Stop conditions
-                if page_num > vehicle_config['max_pages']:
-                    logger.info(f"Reached max pages limit ({vehicle_config['max_pages']})")
-                    break
-                
-                # Safety: hard limit
-                if page_num > 50:
-                    logger.warning(f"Reached hard limit of 50 pages")
+            
+                # Stop conditions: exact last page, max_pages, or the 50 page safety limit
+                if page_num > last_page:
+                    stats['cut_off'] = self._log_page_limit(vehicle_config, total_pages)
                     break
-                
-                # Add delay between pages
-                await asyncio.sleep(random.uniform(1, 3))
             
-            logger.success(f"✅ Completed {vehicle_config['manufacturer']} {vehicle_config['model']}: {len(all_vehicles)} vehicles scraped")
-            return all_vehicles
-
-    async def scrape_all_models(self):
-        """Scrape all enabled models from configuration"""
-        vehicle_configs = self.load_vehicle_configs()
+                # Add delay between pages (prefetched pages already waited inside their task)
+                if page_num not in pending_pages:
+                    await asyncio.sleep(random.uniform(1, 3))
+        finally:
+            # Drop prefetches for pages we decided not to process (or left behind by an error)
+            for task in pending_pages.values():
+                task.cancel()
+            await asyncio.gather(*pending_pages.values(), return_exceptions=True)
         
-        if not vehicle_configs:
-            logger.error("No vehicle configurations loaded!")
+        if retry_queue:
+            still_failed = await self.retry_failed_pages(
+                session, retry_queue, vehicle_config, manufacturer_id, model_id, found_vehicle_ids, all_vehicles,
+                existing_prices
+            )
+            if still_failed:
+                self.failed_pages[model_key] = still_failed
+                logger.error(f"❌ {model_key}: pages {still_failed} still failed after retrying")
+        
+        stats['finished'] = True
+        stats['new'] = len(all_vehicles)
+        logger.success(f"✅ Completed {model_key}: {len(all_vehicles)} vehicles scraped")
+        return all_vehicles
+
+    def sweep_skip_reason(self, model_key):
+        """Why this run's walk of a model was not a complete sweep, or None if it was"""
+        stats = self.model_stats.get(model_key)
+        if not stats or not stats['finished']:
+            return "the model failed"
+        if not stats['full_sweep']:
+            return "only the first pages were scraped"
+        if model_key in self.failed_pages:
+            return f"pages {self.failed_pages[model_key]} failed"
+        if stats['cut_off']:
+            return "the page walk stopped before the last page"
+        if stats['resumed']:
+            return "part of the walk came from an interrupted run"
+        return None
+
+    async def reconcile_sold(self):
+        """
+        Sold detection by set difference, once every model has been walked:
+        available vehicles of completely swept models that no listing page of
+        any model showed this run are marked sold, and sold vehicles that any
+        page showed are revived - one UPDATE each, not one per vehicle.
+        (A vehicle listed under two searches is stored under only one model.)
+        """
+        seen = set()
+        for stats in self.model_stats.values():
+            seen |= stats['seen']
+        if not seen:
             return
         
-        await self.db.connect()
+        relisted = await self.db.mark_vehicles_relisted(seen)
+        if relisted:
+            self.run_counts["relisted"] += relisted
+            logger.success(f"🔄 RELISTED: {relisted} vehicles are available again")
         
-        total_vehicles = 0
-        failed_models = []
+        swept = {}
+        for model_key, stats in self.model_stats.items():
+            skip_reason = self.sweep_skip_reason(model_key)
+            if skip_reason is None:
+                swept[stats['model_id']] = model_key
+            elif stats['full_sweep']:
+                logger.warning(f"⚠️ Skipping sold reconciliation for {model_key}: {skip_reason}")
+        if not swept:
+            return
+        
+        available = await self.db.get_available_vehicles_for_models(swept.keys())
+        missing = {}
+        stock = {}
+        for source_id, (vehicle_id, model_id) in available.items():
+            stock[model_id] = stock.get(model_id, 0) + 1
+            if source_id not in seen:
+                missing.setdefault(model_id, []).append(vehicle_id)
         
-        for i, config in enumerate(vehicle_configs, 1):
+        sold_ids = []
+        for model_id, vehicle_ids in missing.items():
+            model_key = swept[model_id]
+            if len(vehicle_ids) > LISTING_PAGE_SIZE and len(vehicle_ids) > MAX_SOLD_FRACTION * stock[model_id]:
+                logger.warning(f"⚠️ Skipping sold reconciliation for {model_key}: {len(vehicle_ids)} of "
+                               f"{stock[model_id]} available vehicles missing - check the search URL")
+                continue
+            self.model_stats[model_key]['sold'] = len(vehicle_ids)
+            logger.warning(f"🚫 {model_key}: {len(vehicle_ids)} vehicles no longer listed")
+            sold_ids.extend(vehicle_ids)
+        if sold_ids:
+            sold = await self.db.mark_vehicles_sold(sold_ids)
+            self.run_counts["sold"] += sold
+            logger.warning(f"🚫 MARKED SOLD: {sold} vehicles")
+
+    def record_runs(self, vehicle_configs):
+        """Feed every finished model's churn to the refresh scheduler"""
+        for config in vehicle_configs:
+            model_key = self.model_key(config)
+            stats = self.model_stats.get(model_key)
+            if not stats or not stats['finished']:
+                continue
+            self.scheduler.record_run(
+                model_key,
+                new=stats['new'],
+                sold=stats['sold'],
+                price_changed=stats['price_changed'],
+                seen=len(stats['seen']),
+                pages=stats['pages'],
+                deepest_new_page=stats['deepest_new_page'],
+                # Only a walk complete enough to reconcile sold vehicles counts as a full sweep
+                full_sweep=self.sweep_skip_reason(model_key) is None
+            )
+
+    async def _scrape_model_task(self, config, index, total, semaphore):
+        """Scrape one model under the concurrency limit. Returns vehicle count or None on failure."""
+        async with semaphore:
             try:
                 logger.info(f"\n{'='*60}")
-                logger.info(f"SCRAPING MODEL {i}/{len(vehicle_configs)}: {config['manufacturer']} {config['model']}")
+                logger.info(f"SCRAPING MODEL {index}/{total}: {config['manufacturer']} {config['model']}")
                 logger.info(f"{'='*60}")
                 
+                if self.journal:
+                    self.journal.model_start(self.model_key(config))
+                
                 vehicles = await self.scrape_model(config)
-                total_vehicles += len(vehicles)
+                
+                # A model with pages still failing stays open so --resume retries them
+                if self.journal and self.model_key(config) not in self.failed_pages:
+                    self.journal.model_done(self.model_key(config), len(vehicles))
                 
                 logger.success(f"✅ COMPLETED: {config['manufacturer']} {config['model']} - {len(vehicles)} vehicles")
+                return len(vehicles)
                 
             except Exception as e:
                 logger.error(f"❌ FAILED: {config['manufacturer']} {config['model']} - {e}")
-                failed_models.append(f"{config['manufacturer']} {config['model']}")
+                return None
+
+    def plan_scheduled_run(self, vehicle_configs):
+        """Keep only models whose churn-based refresh is due, limited to the pages they need"""
+        planned = []
+        for config in sorted(vehicle_configs, key=lambda c: c['priority']):
+            key = self.model_key(config)
+            if not self.scheduler.is_due(key, config['priority']):
+                logger.info(f"🗓️ {key}: not due ({self.scheduler.describe(key, config['priority'])})")
                 continue
-            
-            # Add delay between models
-            if i < len(vehicle_configs):
-                logger.info(f"⏳ Waiting 10 seconds before next model...")
-                await asyncio.sleep(10)
+            depth = self.scheduler.page_depth(key, config['max_pages'])
+            if depth >= config['max_pages']:
+                planned.append(dict(config, full_sweep=True))
+                sweep = "full sweep"
+            elif self.incremental:
+                planned.append(dict(config, incremental=True, full_sweep=False))
+                sweep = "incremental, newest first"
+            else:
+                planned.append(dict(config, max_pages=depth, full_sweep=False))
+                sweep = f"first {depth} pages"
+            logger.info(f"🗓️ {key}: due, {sweep} ({self.scheduler.describe(key, config['priority'])})")
+        
+        logger.info(f"🗓️ {len(planned)}/{len(vehicle_configs)} models due this run")
+        return planned
+
+    def plan_incremental_run(self, vehicle_configs):
+        """Newest-first incremental walks, except models due a full sweep for sold reconciliation"""
+        planned = []
+        for config in vehicle_configs:
+            key = self.model_key(config)
+            if self.scheduler and self.scheduler.needs_full_sweep(key):
+                logger.info(f"🧹 {key}: full sweep due")
+                planned.append(dict(config, full_sweep=True))
+            else:
+                planned.append(dict(config, incremental=True, full_sweep=False))
+        return planned
+
+    async def scrape_all_models(self, concurrency=MODEL_CONCURRENCY):
+        """Scrape all enabled models from configuration"""
+        vehicle_configs = self.load_vehicle_configs()
+        
+        if not vehicle_configs:
+            logger.error("No vehicle configurations loaded!")
+            return
+        
+        if self.scheduled:
+            vehicle_configs = self.plan_scheduled_run(vehicle_configs)
+            if not vehicle_configs:
+                logger.info("🗓️ No models are due for a refresh yet")
+                return
+        elif self.incremental:
+            vehicle_configs = self.plan_incremental_run(vehicle_configs)
+        
+        if self.journal:
+            if self.resume:
+                self.resume_state = self.journal.resume_run()
+                skipped = [c for c in vehicle_configs if self.model_key(c) in self.resume_state.completed_models]
+                if skipped:
+                    logger.info(f"📝 Skipping {len(skipped)} models finished in the interrupted run")
+                    vehicle_configs = [c for c in vehicle_configs if c not in skipped]
+            else:
+                interrupted = self.journal.interrupted_run()
+                if interrupted:
+                    logger.warning(f"⚠️ Run {interrupted} was interrupted - starting over (use --resume to continue it)")
+                self.journal.start_run()
+        
+        await self.db.connect()
+        try:
+            self.run_id = await self.db.create_scraper_run("carsensor_universal")
+        except Exception as e:
+            logger.warning(f"Could not record scraper run: {e}")
+        
+        total_vehicles = 0
+        failed_models = []
+        
+        if concurrency > 1:
+            # All fetches share self.rate_limiter, so no fixed sleep between models
+            logger.info(f"🚀 Scraping up to {concurrency} models concurrently "
+                        f"({self.rate_limiter.rate} req/s per host, burst {self.rate_limiter.burst})")
+            semaphore = asyncio.Semaphore(concurrency)
+            results = await asyncio.gather(*[
+                self._scrape_model_task(config, i, len(vehicle_configs), semaphore)
+                for i, config in enumerate(vehicle_configs, 1)
+            ])
+            for config, count in zip(vehicle_configs, results):
+                if count is None:
+                    failed_models.append(f"{config['manufacturer']} {config['model']}")
+                else:
+                    total_vehicles += count
+        else:
+            semaphore = asyncio.Semaphore(1)
+            for i, config in enumerate(vehicle_configs, 1):
+                count = await self._scrape_model_task(config, i, len(vehicle_configs), semaphore)
+                if count is None:
+                    failed_models.append(f"{config['manufacturer']} {config['model']}")
+                    continue
+                total_vehicles += count
+                
+                # Add delay between models
+                if i < len(vehicle_configs):
+                    logger.info(f"⏳ Waiting 10 seconds before next model...")
+                    await asyncio.sleep(10)
+        
+        # Sold/relisted reconciliation needs every model's sightings, so it runs once at the end
+        try:
+            await self.reconcile_sold()
+        except Exception as e:
+            logger.error(f"Sold reconciliation failed: {e}")
+        if self.scheduler:
+            self.record_runs(vehicle_configs)
         
         # Final summary
         logger.info(f"\n{'='*60}")
@@ -846,19 +1724,104 @@ class UniversalCarSensorScraper:
         
         if failed_models:
             logger.warning(f"❌ Failed models: {', '.join(failed_models)}")
+        if self.browser_pool and (self.browser_pool.recycled_contexts or self.browser_pool.relaunches):
+            logger.info(f"♻️ Browser pool: {self.browser_pool.recycled_contexts} contexts recycled, "
+                        f"{self.browser_pool.relaunches} browser relaunches")
+        if self.failed_pages:
+            logger.warning(f"❌ Incomplete models (pages still failing): "
+                           f"{', '.join(f'{k} {v}' for k, v in self.failed_pages.items())}")
+        
+        logger.info(f"💾 Database: {self.run_counts['added']} added, {self.run_counts['updated']} updated, "
+                    f"{self.run_counts['unchanged']} unchanged, {self.run_counts['sold']} sold, "
+                    f"{self.run_counts['relisted']} relisted")
+        
+        if self.run_id:
+            try:
+                await self.db.complete_scraper_run(
+                    self.run_id,
+                    "completed" if not failed_models and not self.failed_pages else "partial",
+                    vehicles_processed=total_vehicles,
+                    vehicles_added=self.run_counts["added"],
+                    vehicles_updated=self.run_counts["updated"],
+                    error_message=", ".join(failed_models) or None,
+                    log_details={"failed_pages": self.failed_pages, "models": len(vehicle_configs),
+                                 "unchanged": self.run_counts["unchanged"], "sold": self.run_counts["sold"],
+                                 "relisted": self.run_counts["relisted"]}
+                )
+            except Exception as e:
+                logger.warning(f"Could not record scraper run: {e}")
+        
+        if self.journal:
+            if failed_models or self.failed_pages:
+                logger.info(f"📝 Run left resumable in {self.journal.path} - rerun with --resume to finish it")
+                self.journal.close()
+            else:
+                self.journal.finish_run(total_vehicles)
         
         await self.db.disconnect()
-        self.cleanup_selenium()
+        await self.http.close()
+        if self.browser_pool:
+            await self.browser_pool.close()
+        await asyncio.to_thread(self.cleanup_selenium)
 
 async def main():
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Universal CarSensor Scraper - FIXED VERSION')
+    parser.add_argument('--prefetch', type=int, default=PREFETCH_PAGES,
+                       help=f'Listing pages to fetch ahead while vehicles are processed '
+                            f'(0 = serial, max {CONNECTOR_LIMIT_PER_HOST - 1})')
+    parser.add_argument('--fanout', type=int, default=LISTING_FANOUT,
+                       help=f'Listing pages requested at once once the result count is known '
+                            f'(0 = one at a time, default: {LISTING_FANOUT})')
+    parser.add_argument('--parser', choices=list(PARSER_BACKENDS), default=LISTING_PARSER,
+                       help=f'Listing page HTML parser backend (default: {LISTING_PARSER})')
+    parser.add_argument('--force-refresh', action='store_true',
+                       help='Process every listing page even if it is unchanged since the last run')
+    parser.add_argument('--concurrency', type=int, default=MODEL_CONCURRENCY,
+                       help='Models to scrape at the same time (default: 1)')
+    parser.add_argument('--rate', type=float, default=HOST_RATE_PER_SECOND,
+                       help=f'Max requests per second per host across all models (default: {HOST_RATE_PER_SECOND})')
+    parser.add_argument('--resume', action='store_true',
+                       help=f'Continue the interrupted run recorded in {JOURNAL_FILE} at the exact page it stopped')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Walk listings newest first and stop at already-known vehicles '
+                            '(models due a full sweep are still fully scraped)')
+    parser.add_argument('--render-gallery', action='store_true',
+                       help='Always click through detail galleries in a browser instead of reading the static HTML')
+    parser.add_argument('--no-gallery-synthesis', action='store_true',
+                       help="Don't build galleries from the listing photo's URL pattern (read the detail page instead)")
+    parser.add_argument('--browsers', type=int, default=BROWSER_POOL_SIZE,
+                       help=f'Browser contexts for rendered detail pages, and vehicles enriched at once '
+                            f'(default: {BROWSER_POOL_SIZE})')
+    parser.add_argument('--scheduled', action='store_true',
+                       help='Only scrape models whose churn/priority based refresh is due (run this from cron, e.g. hourly)')
+    args = parser.parse_args()
+    
     logger.info("🚗 Universal CarSensor Scraper Starting - FIXED VERSION")
     logger.info("=" * 60)
     
     config = type('Config', (), {'database_url': DATABASE_URL})()
-    scraper = UniversalCarSensorScraper(config)
+    scraper = UniversalCarSensorScraper(
+        config,
+        prefetch_pages=args.prefetch,
+        fanout_pages=args.fanout,
+        rate_limiter=HostRateLimiter(args.rate, HOST_BURST),
+        parser_backend=args.parser,
+        page_store=PageChangeStore(PAGE_STATE_FILE),
+        skip_unchanged=not args.force_refresh,
+        journal=ScrapeJournal(JOURNAL_FILE),
+        resume=args.resume,
+        scheduler=RefreshScheduler(SCHEDULE_FILE),
+        scheduled=args.scheduled,
+        incremental=args.incremental,
+        static_gallery=not args.render_gallery,
+        browser_pool_size=args.browsers,
+        synthesize_gallery=not args.no_gallery_synthesis
+    )
     
     try:
-        await scraper.scrape_all_models()
+        await scraper.scrape_all_models(concurrency=args.concurrency)
     except Exception as e:
         logger.error(f"Scraper failed: {e}", exc_info=True)
         return False
@@ -0,0 +1,216 @@
+"""
+Browser Context Pool
+A fixed set of Playwright browser contexts shared by async workers that need a rendered page
+"""
+
+import asyncio
+import random
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+from loguru import logger
+
+from utils.browser_profile import block_heavy_requests
+from utils.browser_watchdog import process_tree_rss_mb
+
+try:
+    from playwright.async_api import async_playwright
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    async_playwright = None
+    PLAYWRIGHT_AVAILABLE = False
+
+
+class _Worker:
+    """One browser context plus how much it has been used and whether it can be trusted"""
+
+    def __init__(self, context, browser):
+        self.context = context
+        self.browser = browser
+        self.pages = 0
+        self.broken = False
+
+
+class BrowserContextPool:
+    """
+    One headless Chromium with `size` isolated contexts (separate cookies and
+    cache, like separate browser profiles). `page()` checks out an idle
+    context, so at most `size` pages render at once and callers queue for a
+    free context instead of sharing one blocking driver.
+
+    The browser is launched on first use, inside the running event loop.
+    With `lean=True` every context drops images, fonts, media and
+    third-party requests (see utils/browser_profile.py).
+
+    Workers are recycled so long runs keep steady memory: a context is
+    replaced after `max_pages_per_context` pages, or as soon as a page in it
+    times out or crashes, and the browser is relaunched when its processes
+    grow past `max_rss_mb` or it disconnects. Pages still running on the old
+    browser finish first; it is closed when its last context comes back.
+    """
+
+    def __init__(self, size: int = 4, headless: bool = True, timeout: float = 30000,
+                 user_agents: Optional[List[str]] = None, lean: bool = True,
+                 max_pages_per_context: int = 50, max_rss_mb: Optional[float] = 1500):
+        if not PLAYWRIGHT_AVAILABLE:
+            raise RuntimeError("playwright is not installed (pip install playwright && playwright install chromium)")
+        self.size = max(1, size)
+        self.headless = headless
+        self.timeout = timeout
+        self.user_agents = user_agents or []
+        self.lean = lean
+        self.max_pages_per_context = max_pages_per_context
+        self.max_rss_mb = max_rss_mb
+
+        self._playwright = None
+        self._browser = None
+        # Open contexts per browser, and relaunched-away browsers waiting for theirs to close
+        self._context_counts: Dict[object, int] = {}
+        self._retired = set()
+        self._idle: Optional[asyncio.Queue] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self.recycled_contexts = 0
+        self.relaunches = 0
+
+    async def start(self):
+        """Launch the browser and open the contexts (no-op if already running)"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._browser is not None:
+                return
+            self._playwright = await async_playwright().start()
+            await self._launch()
+            self._idle = asyncio.Queue()
+            for _ in range(self.size):
+                self._idle.put_nowait(await self._new_worker())
+            logger.info(f"🌐 Browser pool started with {self.size} contexts")
+
+    async def _launch(self):
+        self._browser = await self._playwright.chromium.launch(
+            headless=self.headless,
+            args=["--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu"]
+        )
+
+    async def _new_worker(self) -> _Worker:
+        context = await self._browser.new_context(
+            user_agent=random.choice(self.user_agents) if self.user_agents else None,
+            locale="ja-JP",
+            viewport={"width": 1280, "height": 800}
+        )
+        context.set_default_timeout(self.timeout)
+        if self.lean:
+            await context.route("**/*", block_heavy_requests)
+        self._context_counts[self._browser] = self._context_counts.get(self._browser, 0) + 1
+        return _Worker(context, self._browser)
+
+    async def _relaunch(self, browser, reason: str):
+        """Swap in a fresh browser for `browser`; its contexts are replaced as they come back"""
+        async with self._lock:
+            if browser is not self._browser:
+                return  # another worker already relaunched it
+            self.relaunches += 1
+            logger.warning(f"♻️ Relaunching browser ({reason})")
+            self._retired.add(browser)
+            await self._launch()
+
+    async def _retire_worker(self, worker: _Worker):
+        """Close a worker's context and put a fresh one on the current browser in its place"""
+        try:
+            await worker.context.close()
+        except Exception as e:
+            logger.debug(f"Error closing browser context: {e}")
+
+        self._context_counts[worker.browser] -= 1
+        if worker.browser in self._retired and self._context_counts[worker.browser] <= 0:
+            self._retired.discard(worker.browser)
+            del self._context_counts[worker.browser]
+            try:
+                await worker.browser.close()
+            except Exception as e:
+                logger.debug(f"Error closing retired browser: {e}")
+
+        self.recycled_contexts += 1
+        try:
+            replacement = await self._new_worker()
+        except Exception as e:
+            # The browser itself is gone - relaunch so the pool doesn't shrink
+            await self._relaunch(self._browser, f"could not open a context: {e}")
+            replacement = await self._new_worker()
+        self._idle.put_nowait(replacement)
+
+    async def _checkout(self) -> _Worker:
+        """Next idle worker that lives on the current, still-connected browser"""
+        while True:
+            worker = await self._idle.get()
+            if not self._browser.is_connected():
+                self._idle.put_nowait(worker)
+                await self._relaunch(self._browser, "browser disconnected")
+                continue
+            if worker.browser is not self._browser:
+                await self._retire_worker(worker)
+                continue
+            return worker
+
+    async def _check_in(self, worker: _Worker):
+        if worker.broken:
+            logger.warning(f"♻️ Replacing a broken browser context after {worker.pages} pages")
+        if worker.broken or worker.browser is not self._browser or worker.pages >= self.max_pages_per_context:
+            await self._retire_worker(worker)
+        else:
+            self._idle.put_nowait(worker)
+
+        # Only one relaunch at a time: while an old browser drains, its memory still counts
+        if self.max_rss_mb and not self._retired:
+            # Walks /proc for every process - keep it off the event loop
+            rss_mb = await asyncio.to_thread(process_tree_rss_mb, include_self=False)
+            if rss_mb is not None and rss_mb > self.max_rss_mb:
+                await self._relaunch(self._browser, f"browser processes at {rss_mb:.0f} MB > {self.max_rss_mb:.0f} MB")
+
+    @asynccontextmanager
+    async def page(self):
+        """Borrow a context and yield a fresh page in it; waits while every context is busy"""
+        await self.start()
+        worker = await self._checkout()
+        page = None
+        try:
+            page = await worker.context.new_page()
+            yield page
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            # A hung page can leave its context in any state - never hand it out again
+            worker.broken = True
+            raise
+        except Exception as e:
+            if any(word in str(e).lower() for word in ("closed", "crash", "disconnected")):
+                worker.broken = True
+            raise
+        finally:
+            worker.pages += 1
+            if page is not None and not worker.broken:
+                try:
+                    await page.close()
+                except Exception as e:
+                    logger.debug(f"Error closing browser page: {e}")
+                    worker.broken = True
+            await self._check_in(worker)
+
+    async def close(self):
+        """Close every context, the browser(s) and the Playwright driver"""
+        if self._idle is not None:
+            while not self._idle.empty():
+                worker = self._idle.get_nowait()
+                try:
+                    await worker.context.close()
+                except Exception as e:
+                    logger.debug(f"Error closing browser context: {e}")
+        for browser in list(self._retired) + ([self._browser] if self._browser else []):
+            try:
+                await browser.close()
+            except Exception as e:
+                logger.debug(f"Error closing browser: {e}")
+        self._retired = set()
+        self._context_counts = {}
+        self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        self._idle = None
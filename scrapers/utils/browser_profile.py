@@ -0,0 +1,98 @@
+"""
+Lean Browser Profile
+Headless browser settings that only load what gallery scraping needs: CarSensor's HTML and scripts
+"""
+
+import json
+from typing import List, Optional
+from urllib.parse import urlparse
+
+# Gallery scraping reads src attributes - the pixels themselves are never needed
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+# Everything else (analytics, ads, social widgets, survey tags) is third-party
+FIRST_PARTY_DOMAINS = ("carsensor.net", "carsensor-edge.net")
+
+# Selenium has no per-request hook, so Chrome gets URL patterns instead (Network.setBlockedURLs)
+BLOCKED_URL_PATTERNS = [
+    "*.jpg", "*.JPG", "*.jpeg", "*.JPEG", "*.png", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.m3u8",
+    "*googletagmanager.com*", "*google-analytics.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*googleadservices.com*", "*facebook.net*", "*facebook.com*", "*line.me*", "*line-scdn.net*",
+    "*smartnews-ads.com*", "*macromill.com*", "*hacci.live*", "*yahoo.co.jp*", "*yimg.jp*",
+    "*adobedtm.com*", "*omtrdc.net*", "*criteo.*", "*twitter.com*", "*translate.googleapis.com*"
+]
+
+
+def is_first_party(url: str) -> bool:
+    host = urlparse(url).hostname or ""
+    return any(host == domain or host.endswith("." + domain) for domain in FIRST_PARTY_DOMAINS)
+
+
+def should_block(resource_type: str, url: str) -> bool:
+    """True for requests a lean page load skips: images, fonts, media and anything third-party"""
+    if url.startswith(("data:", "blob:")):
+        return False
+    return resource_type in BLOCKED_RESOURCE_TYPES or not is_first_party(url)
+
+
+def lean_chrome_options(user_agent: Optional[str] = None):
+    """
+    Selenium Chrome options for a small headless window that stops waiting at DOMContentLoaded.
+    Images stay enabled so Chrome still issues (and logs) gallery photo requests;
+    apply_request_blocking() then cancels them before any bytes are downloaded.
+    """
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--disable-extensions")
+    options.add_argument("--window-size=1280,800")
+    options.add_argument("--mute-audio")
+    if user_agent:
+        options.add_argument(f"--user-agent={user_agent}")
+    options.add_experimental_option("prefs", {
+        "profile.default_content_setting_values.notifications": 2
+    })
+    # Return from driver.get() once the DOM is ready; callers wait for the elements they need
+    options.page_load_strategy = "eager"
+    return options
+
+
+def apply_request_blocking(driver):
+    """Block images, fonts, media and known third-party hosts in a Chrome driver via DevTools (they stay in the request log)"""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+
+
+async def block_heavy_requests(route):
+    """Playwright route handler: abort what should_block() rejects, let the rest through"""
+    request = route.request
+    if should_block(request.resource_type, request.url):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def enable_request_log(options):
+    """Record Chrome's DevTools network events so requested URLs can be read back with drain_request_log()"""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+
+def drain_request_log(driver) -> List[str]:
+    """URLs requested since the last call (blocked requests included). Needs enable_request_log()."""
+    urls = []
+    for entry in driver.get_log("performance"):
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        if message.get("method") == "Network.requestWillBeSent":
+            url = message.get("params", {}).get("request", {}).get("url")
+            if url:
+                urls.append(url)
+    return urls
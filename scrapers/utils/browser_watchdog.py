@@ -0,0 +1,73 @@
+"""
+Browser Watchdog
+Memory and liveness checks for long-lived browser processes, read straight from /proc
+"""
+
+import os
+import signal
+from typing import Dict, List, Optional
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def _parent_map() -> Dict[int, int]:
+    """pid -> parent pid for every process we can see"""
+    parents = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat', 'r') as f:
+                # The command name can contain spaces/parentheses, so split after its closing ")"
+                fields = f.read().rsplit(')', 1)[1].split()
+            parents[int(entry)] = int(fields[1])
+        except (OSError, IndexError, ValueError):
+            continue
+    return parents
+
+
+def descendant_pids(pid: int) -> List[int]:
+    """All children, grandchildren, ... of pid (Chrome's renderer/GPU helpers hang off the main process)"""
+    if not os.path.isdir('/proc'):
+        return []
+    children: Dict[int, List[int]] = {}
+    for child, parent in _parent_map().items():
+        children.setdefault(parent, []).append(child)
+
+    found = []
+    stack = list(children.get(pid, []))
+    while stack:
+        current = stack.pop()
+        found.append(current)
+        stack.extend(children.get(current, []))
+    return found
+
+
+def _rss_bytes(pid: int) -> int:
+    try:
+        with open(f'/proc/{pid}/statm', 'r') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+def process_tree_rss_mb(pid: Optional[int] = None, include_self: bool = True) -> Optional[float]:
+    """
+    Resident memory of a process and all its descendants in MB. Defaults to
+    this process (whose descendants are every browser it launched). None
+    where /proc isn't available, which disables memory-based recycling.
+    """
+    if not os.path.isdir('/proc'):
+        return None
+    pid = pid or os.getpid()
+    pids = descendant_pids(pid) + ([pid] if include_self else [])
+    return sum(_rss_bytes(p) for p in pids) / (1024 * 1024)
+
+
+def kill_process_tree(pid: int):
+    """SIGKILL a hung browser and every helper process it started"""
+    for target in descendant_pids(pid) + [pid]:
+        try:
+            os.kill(target, signal.SIGKILL)
+        except OSError:
+            continue
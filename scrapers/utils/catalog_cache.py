@@ -0,0 +1,87 @@
+"""
+Catalog Cache
+In-process manufacturer/model name -> ID maps, loaded once and filled in as new names are created
+"""
+
+import asyncio
+from typing import Dict, Optional, Tuple
+from loguru import logger
+
+
+class CatalogCache:
+    """
+    Holds every manufacturer and model ID, keyed by lower-cased name, so
+    get-or-create calls are dictionary lookups instead of a LOWER(name)
+    query each time. warm() loads both tables in one go; a miss inserts
+    the name with ON CONFLICT on the LOWER(name) unique indexes (see
+    add_catalog_unique_indexes.sql), so two scrapers creating the same
+    name at once both get the one row's ID back.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.manufacturers: Dict[str, int] = {}
+        self.models: Dict[Tuple[int, str], int] = {}
+        self.warmed = False
+        self._warm_lock = asyncio.Lock()
+
+    async def warm(self):
+        """Load the whole manufacturers and models tables (once)"""
+        async with self._warm_lock:
+            if self.warmed:
+                return
+            async with self.pool.acquire() as conn:
+                manufacturers = await conn.fetch("SELECT id, name FROM manufacturers")
+                models = await conn.fetch("SELECT id, manufacturer_id, name FROM models")
+            # Lowest ID wins if old duplicates are still around
+            for row in sorted(manufacturers, key=lambda r: r['id'], reverse=True):
+                self.manufacturers[row['name'].lower()] = row['id']
+            for row in sorted(models, key=lambda r: r['id'], reverse=True):
+                self.models[(row['manufacturer_id'], row['name'].lower())] = row['id']
+            self.warmed = True
+            logger.info(f"📚 Catalog cache: {len(self.manufacturers)} manufacturers, {len(self.models)} models")
+
+    async def manufacturer_id(self, name: str, country: str = 'Japan') -> int:
+        """ID of the manufacturer (case-insensitive), creating it on first sight"""
+        await self.warm()
+        key = name.lower()
+        if key in self.manufacturers:
+            return self.manufacturers[key]
+
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                INSERT INTO manufacturers (name, country, is_active)
+                VALUES ($1, $2, TRUE)
+                ON CONFLICT ((LOWER(name))) DO UPDATE SET name = manufacturers.name
+                RETURNING id, (xmax = 0) AS inserted
+                """,
+                name, country
+            )
+        if row['inserted']:
+            logger.success(f"✅ Created new manufacturer: {name} (ID: {row['id']})")
+        self.manufacturers[key] = row['id']
+        return row['id']
+
+    async def model_id(self, manufacturer_id: int, name: str, body_type: Optional[str] = None,
+                       is_popular: bool = False) -> int:
+        """ID of the manufacturer's model (case-insensitive), creating it on first sight"""
+        await self.warm()
+        key = (manufacturer_id, name.lower())
+        if key in self.models:
+            return self.models[key]
+
+        async with self.pool.acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                INSERT INTO models (manufacturer_id, name, body_type, is_popular)
+                VALUES ($1, $2, $3, $4)
+                ON CONFLICT (manufacturer_id, (LOWER(name))) DO UPDATE SET name = models.name
+                RETURNING id, (xmax = 0) AS inserted
+                """,
+                manufacturer_id, name, body_type, is_popular
+            )
+        if row['inserted']:
+            logger.success(f"✅ Created new model: {name} (ID: {row['id']})")
+        self.models[key] = row['id']
+        return row['id']
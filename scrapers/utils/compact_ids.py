@@ -0,0 +1,164 @@
+"""
+Compact Source IDs
+Packs CarSensor-style IDs (short letter prefix + long number) into 64-bit ints and keeps them in a sorted array
+"""
+
+import bisect
+import re
+import struct
+import sys
+from array import array
+from itertools import chain
+from typing import Iterable, Optional, Set
+
+# AU6450744071, SU00048411829, ... : up to 3 letters, then up to 13 digits (leading zeros significant)
+SOURCE_ID_PATTERN = re.compile(r'^([A-Z]{0,3})(\d{1,13})$')
+
+# Bit layout (63 bits, so codes stay positive in a signed 'q' array):
+#   [letters: 3 x 5 bits][digit count: 4 bits][number: 44 bits]   (10**13 < 2**44)
+LETTER_BITS = 5
+LENGTH_BITS = 4
+NUMBER_BITS = 44
+PREFIX_SHIFT = NUMBER_BITS + LENGTH_BITS
+
+SNAPSHOT_MAGIC = b'CIDS1'
+# Snapshots are little-endian throughout (header and codes), whatever the host byte order
+SNAPSHOT_SWAP = sys.byteorder != 'little'
+
+
+def encode_source_id(source_id: Optional[str]) -> Optional[int]:
+    """64-bit code for an ID, or None if it doesn't fit the prefix + number shape (or is None)"""
+    if source_id is None:
+        return None
+    match = SOURCE_ID_PATTERN.match(source_id)
+    if not match:
+        return None
+    letters, digits = match.groups()
+    prefix = 0
+    for position in range(3):
+        letter = ord(letters[position]) - ord('A') + 1 if position < len(letters) else 0
+        prefix = (prefix << LETTER_BITS) | letter
+    return (prefix << PREFIX_SHIFT) | (len(digits) << NUMBER_BITS) | int(digits)
+
+
+def decode_source_id(code: int) -> str:
+    """Inverse of encode_source_id()"""
+    number = code & ((1 << NUMBER_BITS) - 1)
+    length = (code >> NUMBER_BITS) & ((1 << LENGTH_BITS) - 1)
+    prefix = code >> PREFIX_SHIFT
+    letters = []
+    for position in range(3):
+        letter = (prefix >> (LETTER_BITS * (2 - position))) & ((1 << LETTER_BITS) - 1)
+        if letter:
+            letters.append(chr(ord('A') + letter - 1))
+    return ''.join(letters) + str(number).zfill(length)
+
+
+class CompactIdSet:
+    """
+    Set of source IDs stored as 8-byte codes: a sorted array('q') searched
+    with bisect, plus a small hash set of codes added since the last
+    compaction. Merging happens once that delta outgrows `1/8` of the array,
+    so adds stay cheap and the bulk stays compact - a few hundred thousand
+    IDs take a few MB instead of tens. IDs that don't encode are kept as
+    plain strings; None is never a member (add/stage ignore it).
+
+    Bulk loads go through stage() (or update()), which only appends to an
+    unsorted array; they become visible to lookups at the next compact().
+    """
+
+    def __init__(self, source_ids: Iterable[str] = ()):
+        self.codes = array('q')
+        self.delta: Set[int] = set()
+        self.others: Set[str] = set()
+        self._staged = array('q')
+        self.update(source_ids)
+
+    def _has_code(self, code: int) -> bool:
+        if code in self.delta:
+            return True
+        index = bisect.bisect_left(self.codes, code)
+        return index < len(self.codes) and self.codes[index] == code
+
+    def __contains__(self, source_id: Optional[str]) -> bool:
+        if source_id is None:
+            return False
+        code = encode_source_id(source_id)
+        if code is None:
+            return source_id in self.others
+        return self._has_code(code)
+
+    def add(self, source_id: Optional[str]):
+        if source_id is None:
+            return
+        code = encode_source_id(source_id)
+        if code is None:
+            self.others.add(source_id)
+        elif not self._has_code(code):
+            self.delta.add(code)
+            if len(self.delta) > max(1024, len(self.codes) // 8):
+                self.compact()
+
+    def stage(self, source_id: Optional[str]):
+        """Queue an ID for the next compact() (bulk loading)"""
+        if source_id is None:
+            return
+        code = encode_source_id(source_id)
+        if code is None:
+            self.others.add(source_id)
+        else:
+            self._staged.append(code)
+
+    def update(self, source_ids: Iterable[str]):
+        for source_id in source_ids:
+            self.stage(source_id)
+        self.compact()
+
+    def compact(self):
+        """Merge the delta and any staged codes into the sorted array"""
+        if not self.delta and not self._staged:
+            return
+        merged = array('q')
+        previous = None
+        for code in sorted(chain(self.codes, self.delta, self._staged)):
+            if code != previous:
+                merged.append(code)
+                previous = code
+        self.codes = merged
+        self.delta = set()
+        self._staged = array('q')
+
+    def __len__(self):
+        return len(self.codes) + len(self.delta) + len(self.others)
+
+    def __iter__(self):
+        for code in chain(self.codes, self.delta):
+            yield decode_source_id(code)
+        yield from self.others
+
+    def save(self, path):
+        """Write a snapshot: the sorted codes as little-endian int64s, then any unencodable IDs"""
+        self.compact()
+        codes = self.codes
+        if SNAPSHOT_SWAP:
+            codes = array('q', codes)
+            codes.byteswap()
+        with open(path, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC + struct.pack('<q', len(codes)))
+            codes.tofile(f)
+            f.write('\n'.join(sorted(self.others)).encode('utf-8'))
+
+    @classmethod
+    def load(cls, path) -> "CompactIdSet":
+        """Read a snapshot written by save()"""
+        ids = cls()
+        with open(path, 'rb') as f:
+            if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+                raise ValueError(f"{path} is not a compact ID snapshot")
+            count, = struct.unpack('<q', f.read(8))
+            ids.codes.fromfile(f, count)
+            if SNAPSHOT_SWAP:
+                ids.codes.byteswap()
+            rest = f.read().decode('utf-8')
+        ids.others = set(rest.split('\n')) if rest else set()
+        return ids
@@ -0,0 +1,14 @@
+"""
+Content Hash
+Fingerprint of a vehicle's scraped fields, stored in vehicles.content_hash so unchanged rows are never rewritten
+"""
+
+import hashlib
+import json
+from typing import Sequence
+
+
+def content_hash(values: Sequence) -> str:
+    """sha1 hex of the values in order (None, numbers and strings stay distinct)"""
+    payload = json.dumps(list(values), ensure_ascii=False, default=str, separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
@@ -0,0 +1,101 @@
+"""
+Gallery Extractor
+Pulls a vehicle's full photo gallery out of the static detail page HTML (no browser needed)
+"""
+
+import re
+from collections import Counter
+from typing import Iterable, List, Optional
+
+# Any CarSensor photo URL, in attributes (a.js-photo href, img src/data-original) or script data
+PHOTO_URL_PATTERN = re.compile(
+    r'(?:https?:)?(?://|\\/\\/)ccsrpcm[al]\.carsensor\.net(?:/|\\/)CSphoto(?:/|\\/)[^"\'\s<>)]+?\.(?:jpe?g|JPE?G|png|PNG)'
+)
+# /CSphoto/bkkn/502/318/UZ0049502318/UZ0049502318_001L.JPG -> UZ0049502318
+PHOTO_ID_PATTERN = re.compile(r'/CSphoto/(?:bkkn|ml)/\d+/\d+/([A-Z0-9]+)/')
+MAIN_PHOTO_PATTERN = re.compile(r'<img[^>]*id="js-mainPhoto"[^>]*>', re.IGNORECASE)
+# UZ0049502318_001L.JPG -> ("..._001", "L"); the same photo also exists as _001M/_001S
+PHOTO_SIZE_PATTERN = re.compile(r'^(.*_\d{3})([A-Z]?)\.(?:jpe?g|JPE?G)$')
+SIZE_RANK = {'L': 3, 'M': 2, 'S': 1}
+
+
+def normalize_photo_url(url: str) -> str:
+    """Unescape JSON slashes and make protocol-relative URLs absolute"""
+    url = url.replace('\\/', '/')
+    if url.startswith('//'):
+        url = 'https:' + url
+    elif url.startswith('http://'):
+        url = 'https://' + url[len('http://'):]
+    return url
+
+
+def photo_id(url: str) -> Optional[str]:
+    """The per-vehicle photo folder ID in a CarSensor photo URL"""
+    match = PHOTO_ID_PATTERN.search(url)
+    return match.group(1) if match else None
+
+
+def _largest_variants(urls: List[str]) -> List[str]:
+    """Keep one URL per photo, preferring the L over M/S size variants, in gallery (photo number) order"""
+    best = {}
+    order = []
+    for url in urls:
+        match = PHOTO_SIZE_PATTERN.match(url)
+        key = match.group(1) if match else url
+        rank = SIZE_RANK.get(match.group(2), 0) if match else 0
+        if key not in best:
+            order.append(key)
+            best[key] = (rank, url)
+        elif rank > best[key][0]:
+            best[key] = (rank, url)
+    # Keys share the folder prefix, so sorting them sorts by the _NNN photo number
+    return [best[key][1] for key in sorted(order)]
+
+
+def extract_gallery_urls(html: str, vehicle_photo_id: Optional[str] = None) -> List[str]:
+    """
+    Full-size gallery URLs for the vehicle on a detail page, in page order.
+
+    Collects every CarSensor photo URL in the HTML - the a.js-photo gallery
+    links, lazy-load data-original attributes and embedded script data - then
+    keeps only the vehicle's own photo folder (from `vehicle_photo_id`, the
+    #js-mainPhoto image or the most common folder), so "similar vehicles"
+    blocks don't leak in. Large "bkkn" photos win over "ml" thumbnails and
+    the L size wins over M/S variants of the same photo.
+    """
+    urls = []
+    seen = set()
+    for match in PHOTO_URL_PATTERN.finditer(html):
+        url = normalize_photo_url(match.group(0))
+        if url not in seen:
+            seen.add(url)
+            urls.append(url)
+
+    if not urls:
+        return []
+
+    if vehicle_photo_id is None:
+        main_tag = MAIN_PHOTO_PATTERN.search(html)
+        main_urls = PHOTO_URL_PATTERN.findall(main_tag.group(0)) if main_tag else []
+        if main_urls:
+            vehicle_photo_id = photo_id(normalize_photo_url(main_urls[0]))
+    if vehicle_photo_id is None:
+        counts = Counter(pid for pid in map(photo_id, urls) if pid)
+        if not counts:
+            return []
+        vehicle_photo_id = counts.most_common(1)[0][0]
+
+    own = [url for url in urls if photo_id(url) == vehicle_photo_id]
+    large = [url for url in own if '/CSphoto/bkkn/' in url]
+    return _largest_variants(large) if large else own
+
+
+def harvest_gallery_urls(html: str, captured_urls: Iterable[str] = (),
+                         main_photo_url: Optional[str] = None) -> List[str]:
+    """
+    Gallery URLs from a rendered page in one pass: the rendered DOM plus the
+    photo URLs the browser requested (even blocked ones), narrowed to the
+    vehicle of `main_photo_url` when given.
+    """
+    vehicle_photo_id = photo_id(normalize_photo_url(main_photo_url)) if main_photo_url else None
+    return extract_gallery_urls(html + "\n" + "\n".join(captured_urls), vehicle_photo_id)
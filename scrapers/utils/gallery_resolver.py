@@ -0,0 +1,96 @@
+"""
+Gallery Resolver
+Builds a vehicle's full gallery from one photo URL by following CarSensor's file naming, verified with HEAD requests
+"""
+
+import asyncio
+import re
+from typing import Callable, List, Optional, Tuple
+
+import aiohttp
+from loguru import logger
+
+from utils.gallery_extractor import normalize_photo_url
+from utils.http_client import SharedHttpClient, get_http_client
+
+# .../bkkn/502/318/UZ0049502318/UZ0049502318_001L.JPG -> photo 1; the L size is the full-resolution one
+BKKN_PHOTO_PATTERN = re.compile(r'^(?P<prefix>.+/CSphoto/bkkn/.+_)(?P<index>\d{3})(?P<size>[LMS]?)(?P<ext>\.(?:JPG|jpe?g))$')
+# .../ml/411/829/U00048411829/SU00048411829_1_003.jpg -> photo 1 (the _003 suffix is shared by all photos)
+ML_PHOTO_PATTERN = re.compile(r'^(?P<prefix>.+/CSphoto/ml/.+_)(?P<index>\d+)(?P<suffix>_\d{3}\.(?:jpe?g|JPG))$')
+
+# Status codes that mean "HEAD not supported here", worth retrying as a 1-byte GET
+HEAD_UNSUPPORTED = {403, 405, 501}
+
+
+def gallery_template(seed_url: str) -> Optional[Tuple[Callable[[int], str], int]]:
+    """
+    Return (index -> URL, seed index) for the gallery the seed photo belongs
+    to, or None if the URL doesn't follow a known CarSensor naming scheme.
+    bkkn photos are always upgraded to the L (largest) size.
+    """
+    url = normalize_photo_url(seed_url)
+
+    match = BKKN_PHOTO_PATTERN.match(url)
+    if match:
+        prefix, ext = match.group('prefix'), match.group('ext')
+        return (lambda index: f"{prefix}{index:03d}L{ext}"), int(match.group('index'))
+
+    match = ML_PHOTO_PATTERN.match(url)
+    if match:
+        prefix, suffix = match.group('prefix'), match.group('suffix')
+        return (lambda index: f"{prefix}{index}{suffix}"), int(match.group('index'))
+
+    return None
+
+
+class GalleryResolver:
+    """
+    Probes candidate URLs 1..max_photos in concurrent batches of `batch_size`
+    and stops at the first missing index past the seed photo (the listing's
+    main photo isn't always photo 1), so a 12-photo gallery costs about two
+    rounds of small requests instead of a rendered detail page.
+
+    A candidate exists if the CDN answers 200/206 with an image content type
+    without redirecting (missing photos may redirect to a placeholder).
+    """
+
+    def __init__(self, http: Optional[SharedHttpClient] = None, max_photos: int = 60,
+                 batch_size: int = 8, timeout: float = 10):
+        self.http = http or get_http_client()
+        self.max_photos = max_photos
+        self.batch_size = max(1, batch_size)
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async def exists(self, url: str) -> bool:
+        """HEAD the URL (falling back to a 1-byte range GET) and report whether the photo is there"""
+        try:
+            async with self.http.head(url, allow_redirects=False, timeout=self.timeout) as response:
+                status = response.status
+                content_type = response.headers.get('Content-Type', '')
+            if status in HEAD_UNSUPPORTED:
+                async with self.http.get(url, allow_redirects=False, timeout=self.timeout,
+                                         headers={"Range": "bytes=0-0"}) as response:
+                    status = response.status
+                    content_type = response.headers.get('Content-Type', '')
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.debug(f"Probe failed for {url}: {e}")
+            return False
+        return status in (200, 206) and (not content_type or content_type.startswith('image/'))
+
+    async def resolve(self, seed_url: str) -> List[str]:
+        """Gallery URLs in photo order, up to (not including) the first gap. [] for unknown URL schemes."""
+        resolved = gallery_template(seed_url)
+        if resolved is None:
+            return []
+        template, seed_index = resolved
+
+        urls = []
+        for start in range(1, self.max_photos + 1, self.batch_size):
+            candidates = [template(i) for i in range(start, min(start + self.batch_size, self.max_photos + 1))]
+            found = await asyncio.gather(*(self.exists(url) for url in candidates))
+            for index, (url, ok) in enumerate(zip(candidates, found), start):
+                if ok:
+                    urls.append(url)
+                elif index > seed_index:
+                    return urls
+        return urls
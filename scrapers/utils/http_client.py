@@ -0,0 +1,153 @@
+"""
+Shared HTTP Client
+One process-wide, keep-alive HTTP client for scrapers, image downloaders and the image proxy
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+from loguru import logger
+
+try:
+    import brotli  # noqa: F401  (lets aiohttp/urllib3 decode "br" responses)
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+
+class SharedHttpClient:
+    """
+    Lazily created aiohttp session (plus a pooled requests.Session for sync
+    callers) that is reused for every request in the process.
+
+    Connections are kept alive and DNS lookups cached, so repeated requests
+    to carsensor.net and its image hosts skip the TCP+TLS handshake.
+    `limit_per_host` caps connections to any single host; `host_limits`
+    tightens or loosens that for specific hosts. TLS certificates are
+    verified except for hosts listed in `insecure_hosts` (explicit opt-in).
+    """
+
+    def __init__(self, limit: int = 10, limit_per_host: int = 3,
+                 host_limits: Optional[Dict[str, int]] = None,
+                 insecure_hosts: Iterable[str] = (),
+                 dns_cache_ttl: int = 300, total_timeout: float = 30,
+                 connect_timeout: float = 10, keepalive_timeout: float = 30):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.host_limits = dict(host_limits or {})
+        self.insecure_hosts = frozenset(insecure_hosts)
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout)
+        self.keepalive_timeout = keepalive_timeout
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop = None
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._sync_session = None
+
+    async def session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use (or for a new event loop)"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            await self._close_stale_session()
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                auto_decompress=True,
+                headers={"Accept-Encoding": ACCEPT_ENCODING}
+            )
+            self._session_loop = loop
+            self._host_semaphores = {}
+            logger.info(f"Shared HTTP session created (limit {self.limit}, {self.limit_per_host}/host)")
+        return self._session
+
+    async def _close_stale_session(self):
+        """Close a session left over from an earlier event loop before it is replaced"""
+        session, loop = self._session, self._session_loop
+        if session is None or session.closed:
+            return
+        try:
+            if loop is not None and loop.is_running():
+                # Still serving another thread - close it there
+                asyncio.run_coroutine_threadsafe(session.close(), loop)
+            else:
+                # A finished loop leaves no transports to wait for, so this just closes the connector
+                await session.close()
+        except Exception as e:
+            logger.debug(f"Could not close the previous HTTP session cleanly: {e}")
+
+    def _host_semaphore(self, url: str) -> Optional[asyncio.Semaphore]:
+        host = urlparse(url).hostname
+        if host not in self.host_limits:
+            return None
+        semaphore = self._host_semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.host_limits[host])
+            self._host_semaphores[host] = semaphore
+        return semaphore
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, **kwargs):
+        """Issue a request on the shared session, honouring per-host limits"""
+        session = await self.session()
+        if urlparse(url).hostname in self.insecure_hosts:
+            kwargs.setdefault("ssl", False)
+        semaphore = self._host_semaphore(url)
+        if semaphore is None:
+            async with session.request(method, url, **kwargs) as response:
+                yield response
+        else:
+            async with semaphore:
+                async with session.request(method, url, **kwargs) as response:
+                    yield response
+
+    def get(self, url: str, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url: str, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def sync_session(self):
+        """Pooled requests.Session for synchronous callers such as the Flask image proxy"""
+        if self._sync_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=self.limit, pool_maxsize=self.limit_per_host)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+            self._sync_session = session
+        return self._sync_session
+
+    async def close(self):
+        """Close the async session (the sync session lives for the process)"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+            logger.info("Shared HTTP session closed")
+        self._session = None
+        self._session_loop = None
+
+
+_client: Optional[SharedHttpClient] = None
+
+
+def get_http_client(**kwargs) -> SharedHttpClient:
+    """Return the process-wide client. Keyword arguments only apply on first call."""
+    global _client
+    if _client is None:
+        _client = SharedHttpClient(**kwargs)
+    elif kwargs:
+        logger.debug("get_http_client() called with settings after creation; using existing client")
+    return _client
@@ -11,6 +11,7 @@ from pathlib import Path
 from typing import Tuple, Optional
 from PIL import Image
 from loguru import logger
+from utils.http_client import get_http_client
 
 
 class ImageDownloader:
@@ -43,22 +44,21 @@ class ImageDownloader:
             filename = f"image_{image_index}_{url_hash}.jpg"
             local_path = vehicle_dir / filename
             
-            # Download image
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, timeout=30) as response:
-                    if response.status == 200:
-                        image_data = await response.read()
-                        
-                        # Process and save image
-                        processed_size = await self._process_image(image_data, local_path)
-                        
-                        relative_path = f"/images/vehicles/{vehicle_id}/{filename}"
-                        
-                        logger.debug(f"Downloaded image: {filename} ({processed_size} bytes)")
-                        return relative_path, filename, processed_size
-                    else:
-                        logger.warning(f"Failed to download image: {url} (Status: {response.status})")
-                        return None, None, None
+            # Download image over the shared keep-alive client
+            async with get_http_client().get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
+                if response.status == 200:
+                    image_data = await response.read()
+                    
+                    # Process and save image
+                    processed_size = await self._process_image(image_data, local_path)
+                    
+                    relative_path = f"/images/vehicles/{vehicle_id}/{filename}"
+                    
+                    logger.debug(f"Downloaded image: {filename} ({processed_size} bytes)")
+                    return relative_path, filename, processed_size
+                else:
+                    logger.warning(f"Failed to download image: {url} (Status: {response.status})")
+                    return None, None, None
                         
         except Exception as e:
             logger.error(f"Error downloading image {url}: {e}")
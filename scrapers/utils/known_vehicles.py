@@ -0,0 +1,89 @@
+"""
+Known Vehicle Index
+Every (source_site, source_id) already in the database, loaded once per run and kept current as vehicles are saved
+"""
+
+import asyncio
+from typing import Dict, Iterable, Set
+from loguru import logger
+
+from utils.compact_ids import CompactIdSet
+
+# Rows pulled per cursor round-trip while streaming the index in
+LOAD_PREFETCH = 10000
+
+
+class KnownVehicleIndex:
+    """
+    One in-memory set of source IDs per site, shared by every model of a
+    run, so "is this vehicle new?" never needs a query and a vehicle listed
+    under two searches (e.g. Land Cruiser and Prado) is only processed once.
+    load() streams the keys through a server-side cursor instead of
+    materialising the whole result set; add() records vehicles as they are
+    written. IDs are held as 64-bit codes (see utils/compact_ids.py).
+    """
+
+    def __init__(self):
+        self.sites: Dict[str, CompactIdSet] = {}
+        self.loaded = False
+        self._load_lock = asyncio.Lock()
+
+    async def load(self, pool):
+        """Stream every vehicle key from the database (once)"""
+        async with self._load_lock:
+            if self.loaded:
+                return
+            async with pool.acquire() as conn:
+                async with conn.transaction():
+                    async for row in conn.cursor("SELECT source_site, source_id FROM vehicles "
+                                                 "WHERE source_site IS NOT NULL AND source_id IS NOT NULL",
+                                                 prefetch=LOAD_PREFETCH):
+                        if row['source_site'] is not None:
+                            self._site(row['source_site']).stage(row['source_id'])
+            for ids in self.sites.values():
+                ids.compact()
+            self.loaded = True
+            logger.info(f"📊 Known vehicle index: {len(self)} vehicles "
+                        f"({', '.join(f'{site}: {len(ids)}' for site, ids in self.sites.items())})")
+
+    def contains(self, source_site: str, source_id: str) -> bool:
+        ids = self.sites.get(source_site)
+        return ids is not None and source_id in ids
+
+    def add(self, source_site: str, source_id: str):
+        self._site(source_site).add(source_id)
+
+    def _site(self, source_site: str) -> CompactIdSet:
+        if source_site not in self.sites:
+            self.sites[source_site] = CompactIdSet()
+        return self.sites[source_site]
+
+    def scope(self, source_site: str) -> "KnownVehicleScope":
+        """A per-model set layered over this index (see KnownVehicleScope)"""
+        return KnownVehicleScope(self, source_site)
+
+    def __len__(self):
+        return sum(len(ids) for ids in self.sites.values())
+
+
+class KnownVehicleScope:
+    """
+    Set-like view for one model walk: IDs the walk itself has seen (pages
+    restored or resumed, vehicles skipped on purpose) plus everything in the
+    shared index. Additions stay local; saved vehicles go into the index
+    with KnownVehicleIndex.add().
+    """
+
+    def __init__(self, index: KnownVehicleIndex, source_site: str):
+        self.index = index
+        self.source_site = source_site
+        self.local: Set[str] = set()
+
+    def __contains__(self, source_id: str) -> bool:
+        return source_id in self.local or self.index.contains(self.source_site, source_id)
+
+    def add(self, source_id: str):
+        self.local.add(source_id)
+
+    def update(self, source_ids: Iterable[str]):
+        self.local.update(source_ids)
@@ -0,0 +1,219 @@
+"""
+Listing Parser
+Pluggable HTML backends that pull the raw cassette fields out of a CarSensor listing page
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+from bs4 import BeautifulSoup
+from loguru import logger
+from utils.listing_record import ListingRecord
+from utils.gallery_extractor import PHOTO_URL_PATTERN, normalize_photo_url
+
+try:
+    import lxml.html
+    from lxml import etree
+except ImportError:  # lxml is optional, BeautifulSoup's html.parser always works
+    lxml = None
+    etree = None
+
+
+TOTAL_COUNT_PATTERN = re.compile(r'(\d[\d,]*)')
+
+
+def _parse_total(text: Optional[str]) -> Optional[int]:
+    """Total result count from the result bar text ("1,234台")"""
+    if not text:
+        return None
+    match = TOTAL_COUNT_PATTERN.search(text)
+    return int(match.group(1).replace(',', '')) if match else None
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching a single CSS class token"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _first_photo_url(*candidates: Optional[str]) -> Optional[str]:
+    """First CarSensor photo URL in the given attribute values / script texts"""
+    for candidate in candidates:
+        if not candidate:
+            continue
+        match = PHOTO_URL_PATTERN.search(candidate)
+        if match:
+            return normalize_photo_url(match.group(0))
+    return None
+
+
+class ListingParser:
+    """
+    Base class for listing page parsers.
+
+    parse_cassettes() returns one dict per div.cassetteMain with the raw text
+    the scraper needs:
+        href        detail link of the main image (may be relative)
+        title       alt text of the main image
+        image       the main image's CarSensor photo URL (seed for gallery synthesis)
+        price_main  integer part of the total price in 万円 ("723")
+        price_sub   decimal part of the total price (".8")
+        specs       {spec label: spec value} from the spec list
+        area        location lines from the cassette's area block
+
+    parse_listing() additionally returns the search's total result count
+    from the result bar (None if the page has none).
+    """
+
+    name = "base"
+
+    def parse_listing(self, html: str) -> Tuple[List[Dict], Optional[int]]:
+        raise NotImplementedError
+
+    def parse_cassettes(self, html: str) -> List[Dict]:
+        return self.parse_listing(html)[0]
+
+    def parse_page(self, html: str) -> Tuple[List[ListingRecord], Optional[int]]:
+        """Parse a listing page into ListingRecords plus the total result count"""
+        cassettes, total = self.parse_listing(html)
+        records = []
+        for cassette in cassettes:
+            record = ListingRecord.from_cassette(cassette)
+            if record is None:
+                logger.warning("Could not extract source_id for a vehicle cassette, skipping")
+                continue
+            records.append(record)
+        return records, total
+
+    def parse_records(self, html: str) -> List[ListingRecord]:
+        """Parse a listing page straight into ListingRecords, skipping cassettes without a detail link"""
+        return self.parse_page(html)[0]
+
+
+class SoupListingParser(ListingParser):
+    """BeautifulSoup backend (the scraper's original html.parser behaviour)"""
+
+    name = "bs4"
+
+    def __init__(self, features: str = "html.parser"):
+        self.features = features
+
+    def parse_listing(self, html: str) -> Tuple[List[Dict], Optional[int]]:
+        soup = BeautifulSoup(html, self.features)
+        cassettes = []
+
+        for div in soup.find_all("div", class_="cassetteMain"):
+            link_tag = div.select_one('.cassetteMain__mainImg a')
+            img_elem = div.select_one('.cassetteMain__mainImg img')
+            # The lazy-loaded <img> is written by an inline document.write() script
+            img_script = div.select_one('.cassetteMain__mainImg script')
+            price_main_elem = div.select_one(".totalPrice__mainPriceNum")
+            price_sub_elem = div.select_one(".totalPrice__subPriceNum")
+
+            specs = {}
+            for box in div.select(".specList__detailBox"):
+                dt = box.find("dt")
+                dd = box.find("dd")
+                if dt and dd:
+                    specs[dt.text.strip()] = dd.text.strip()
+
+            # The area block is a sibling of cassetteMain inside the cassette wrapper
+            wrapper = div.parent if div.parent is not None else div
+            area_div = wrapper.select_one(".cassetteSub__area")
+
+            cassettes.append({
+                "href": link_tag.get('href') if link_tag else None,
+                "title": img_elem.get('alt') if img_elem else None,
+                "image": _first_photo_url(
+                    img_elem.get('data-original') if img_elem else None,
+                    img_elem.get('src') if img_elem else None,
+                    img_script.string if img_script else None
+                ),
+                "price_main": price_main_elem.text.strip() if price_main_elem else None,
+                "price_sub": price_sub_elem.text.strip() if price_sub_elem else None,
+                "specs": specs,
+                "area": [p.text.strip() for p in area_div.find_all("p")] if area_div else []
+            })
+
+        total_elem = soup.select_one(".resultBar__result p")
+        total = _parse_total(total_elem.text) if total_elem else None
+
+        soup.decompose()
+        return cassettes, total
+
+
+class LxmlListingParser(ListingParser):
+    """lxml backend using precompiled XPath expressions"""
+
+    name = "lxml"
+
+    def __init__(self):
+        if etree is None:
+            raise ImportError("lxml is not installed")
+
+        self._cassettes = etree.XPath(f"//div[{_has_class('cassetteMain')}]")
+        self._link = etree.XPath(f".//*[{_has_class('cassetteMain__mainImg')}]//a")
+        self._img = etree.XPath(f".//*[{_has_class('cassetteMain__mainImg')}]//img")
+        self._img_script = etree.XPath(f".//*[{_has_class('cassetteMain__mainImg')}]//script/text()")
+        self._price_main = etree.XPath(f".//*[{_has_class('totalPrice__mainPriceNum')}]")
+        self._price_sub = etree.XPath(f".//*[{_has_class('totalPrice__subPriceNum')}]")
+        self._spec_boxes = etree.XPath(f".//*[{_has_class('specList__detailBox')}]")
+        self._dt = etree.XPath(".//dt")
+        self._dd = etree.XPath(".//dd")
+        self._area = etree.XPath(f".//*[{_has_class('cassetteSub__area')}]")
+        self._p = etree.XPath(".//p")
+        self._total = etree.XPath(f"//*[{_has_class('resultBar__result')}]//p")
+
+    @staticmethod
+    def _first_text(nodes) -> str:
+        return nodes[0].text_content().strip() if nodes else None
+
+    def parse_listing(self, html: str) -> Tuple[List[Dict], Optional[int]]:
+        tree = lxml.html.fromstring(html)
+        cassettes = []
+
+        for div in self._cassettes(tree):
+            links = self._link(div)
+            imgs = self._img(div)
+
+            specs = {}
+            for box in self._spec_boxes(div):
+                dt = self._dt(box)
+                dd = self._dd(box)
+                if dt and dd:
+                    specs[dt[0].text_content().strip()] = dd[0].text_content().strip()
+
+            wrapper = div.getparent() if div.getparent() is not None else div
+            area = self._area(wrapper)
+
+            cassettes.append({
+                "href": links[0].get('href') if links else None,
+                "title": imgs[0].get('alt') if imgs else None,
+                "image": _first_photo_url(
+                    imgs[0].get('data-original') if imgs else None,
+                    imgs[0].get('src') if imgs else None,
+                    *self._img_script(div)
+                ),
+                "price_main": self._first_text(self._price_main(div)),
+                "price_sub": self._first_text(self._price_sub(div)),
+                "specs": specs,
+                "area": [p.text_content().strip() for p in self._p(area[0])] if area else []
+            })
+
+        return cassettes, _parse_total(self._first_text(self._total(tree)))
+
+
+PARSER_BACKENDS = {
+    "bs4": SoupListingParser,
+    "lxml": LxmlListingParser,
+}
+
+
+def get_listing_parser(name: str = "lxml") -> ListingParser:
+    """Create a listing parser by backend name, falling back to bs4 if the backend is unavailable"""
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend: {name} (choose from {', '.join(PARSER_BACKENDS)})")
+
+    try:
+        return PARSER_BACKENDS[name]()
+    except ImportError as e:
+        logger.warning(f"Parser backend '{name}' unavailable ({e}), falling back to bs4")
+        return SoupListingParser()
@@ -0,0 +1,118 @@
+"""
+Listing Record
+Compact, immutable per-cassette record produced once per listing page
+"""
+
+import re
+from typing import Dict, Optional
+
+BASE_URL = "https://www.carsensor.net"
+
+SOURCE_ID_PATTERN = re.compile(r'/([A-Z0-9]+)/index\.html')
+SOURCE_ID_FALLBACK_PATTERN = re.compile(r'/detail/([A-Z0-9]+)/')
+YEAR_PATTERN = re.compile(r'(\d{4})')
+MILEAGE_PATTERN = re.compile(r'([\d\.]+)')
+
+
+def extract_source_id(detail_url: str) -> Optional[str]:
+    """Extract the CarSensor vehicle ID from a detail URL"""
+    match = SOURCE_ID_PATTERN.search(detail_url) or SOURCE_ID_FALLBACK_PATTERN.search(detail_url)
+    return match.group(1) if match else None
+
+
+def _parse_price(main: Optional[str], sub: Optional[str]) -> int:
+    """Convert the 万円 price parts ("723", ".8") to yen"""
+    if not main:
+        return 0
+    try:
+        return int(float(main + (sub or "")) * 10000)
+    except ValueError:
+        return 0
+
+
+def _parse_specs(specs: Dict[str, str]):
+    """Return (model_year, mileage_km) from the spec list, 0 when missing"""
+    model_year = 0
+    mileage_km = 0
+
+    for label, value in specs.items():
+        if "年式" in label:
+            year_match = YEAR_PATTERN.search(value)
+            if year_match:
+                model_year = int(year_match.group(1))
+        elif "走行距離" in label:
+            mileage_match = MILEAGE_PATTERN.search(value)
+            if mileage_match:
+                try:
+                    mileage_val = float(mileage_match.group(1))
+                except ValueError:
+                    continue
+                if "万km" in value:
+                    mileage_km = int(mileage_val * 10000)
+                else:
+                    mileage_km = int(mileage_val)
+
+    return model_year, mileage_km
+
+
+class ListingRecord:
+    """
+    One vehicle cassette from a listing page.
+
+    Built in a single pass from the parser's raw fields. Dedup, stop
+    conditions, enrichment and the DB write all read this record, so the
+    listing page tree can be dropped as soon as the page is extracted.
+    """
+
+    __slots__ = ('source_id', 'detail_url', 'title', 'price_yen', 'model_year', 'mileage_km', 'location',
+                 'image_url')
+
+    def __init__(self, source_id: str, detail_url: str, title: str,
+                 price_yen: int, model_year: int, mileage_km: int, location: str,
+                 image_url: Optional[str] = None):
+        for name, value in zip(self.__slots__, (source_id, detail_url, title, price_yen,
+                                                 model_year, mileage_km, location, image_url)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other):
+        if not isinstance(other, ListingRecord):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, name) for name in self.__slots__))
+
+    def __repr__(self):
+        return f"ListingRecord({self.source_id}, {self.price_yen} yen, {self.model_year}, {self.mileage_km} km)"
+
+    @classmethod
+    def from_cassette(cls, cassette: Dict) -> Optional['ListingRecord']:
+        """Build a record from ListingParser raw fields. Returns None without a usable detail link."""
+        href = cassette.get('href')
+        if not href:
+            return None
+
+        detail_url = href if href.startswith('http') else BASE_URL + href
+        source_id = extract_source_id(detail_url)
+        if not source_id:
+            return None
+
+        model_year, mileage_km = _parse_specs(cassette.get('specs') or {})
+        area = cassette.get('area')
+
+        return cls(
+            source_id=source_id,
+            detail_url=detail_url,
+            title=(cassette.get('title') or '').strip(),
+            price_yen=_parse_price(cassette.get('price_main'), cassette.get('price_sub')),
+            model_year=model_year,
+            mileage_km=mileage_km,
+            location=" ".join(area) if area else "N/A",
+            image_url=cassette.get('image')
+        )
@@ -0,0 +1,113 @@
+"""
+Page Change Store
+Persists ETag/Last-Modified validators and cassette fingerprints per listing URL
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from loguru import logger
+
+# Returned by fetch_page when the server answers 304 Not Modified
+NOT_MODIFIED = object()
+
+
+def fingerprint_records(records: Iterable) -> str:
+    """Hash the parts of a page's ListingRecords that matter for the database"""
+    digest = hashlib.sha1()
+    for record in records:
+        digest.update(
+            f"{record.source_id}|{record.price_yen}|{record.model_year}|"
+            f"{record.mileage_km}|{record.location}|{record.title}\n".encode('utf-8')
+        )
+    return digest.hexdigest()
+
+
+class PageChangeStore:
+    """
+    JSON-backed store of what each listing page looked like last time.
+
+    Validators from a response are only staged by fetch_page; they are
+    committed together with the page fingerprint once the page has been
+    fully processed, so a crash mid-page never hides unprocessed vehicles
+    behind a 304 on the next run.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.pages: Dict[str, Dict] = {}
+        self._staged: Dict[str, Dict] = {}
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.pages = json.load(f)
+            logger.info(f"Loaded change state for {len(self.pages)} listing pages from {self.path}")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read page change state {self.path}: {e}. Starting fresh.")
+            self.pages = {}
+
+    def save(self):
+        """Write the store atomically"""
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.pages, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def get(self, url: str) -> Optional[Dict]:
+        return self.pages.get(url)
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """If-None-Match / If-Modified-Since headers for a previously processed page"""
+        entry = self.pages.get(url)
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def stage_validators(self, url: str, etag: Optional[str], last_modified: Optional[str]):
+        """Remember validators from a 200 response until the page is committed"""
+        self._staged[url] = {'etag': etag, 'last_modified': last_modified}
+
+    def is_unchanged(self, url: str, fingerprint: str) -> bool:
+        entry = self.pages.get(url)
+        return bool(entry) and entry.get('fingerprint') == fingerprint
+
+    def commit(self, url: str, fingerprint: str, source_ids: List[str], total: Optional[int] = None):
+        """Record a fully processed page (and the search's total result count) and persist the store"""
+        entry = self.pages.get(url, {})
+        staged = self._staged.pop(url, None)
+        if staged:
+            entry.update(staged)
+
+        entry.update({
+            'fingerprint': fingerprint,
+            'count': len(source_ids),
+            'source_ids': list(source_ids),
+            'total': total,
+            'checked_at': datetime.now().isoformat()
+        })
+        self.pages[url] = entry
+        self.save()
+
+    def touch(self, url: str):
+        """Mark an unchanged page as checked (keeps newly staged validators)"""
+        entry = self.pages.get(url)
+        if not entry:
+            return
+        staged = self._staged.pop(url, None)
+        if staged:
+            entry.update(staged)
+        entry['checked_at'] = datetime.now().isoformat()
+        self.save()
@@ -0,0 +1,69 @@
+"""
+Rate Limiter
+Shared per-host token bucket that keeps concurrent scrapers polite
+"""
+
+import asyncio
+import time
+from typing import Dict
+from urllib.parse import urlparse
+from loguru import logger
+
+
+class _TokenBucket:
+    """Token bucket state for a single host"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+
+class HostRateLimiter:
+    """
+    Per-host token bucket shared by every fetch in the process.
+
+    Each host gets `rate` requests per second on average with bursts of up to
+    `burst` requests. Waiters are served in arrival order, so many concurrent
+    models share the same politeness budget instead of multiplying it.
+    """
+
+    def __init__(self, rate: float = 0.5, burst: int = 2):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._buckets: Dict[str, _TokenBucket] = {}
+
+    def _bucket(self, host: str) -> _TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = _TokenBucket(self.rate, self.burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    async def acquire(self, url: str) -> float:
+        """Wait until a request to the URL's host is allowed. Returns seconds waited."""
+        host = urlparse(url).hostname or url
+        bucket = self._bucket(host)
+        waited = 0.0
+
+        # Holding the lock while sleeping keeps waiters first-come, first-served
+        async with bucket.lock:
+            bucket._refill()
+            if bucket.tokens < 1:
+                delay = (1 - bucket.tokens) / bucket.rate
+                logger.debug(f"Rate limit for {host}: waiting {delay:.2f}s")
+                await asyncio.sleep(delay)
+                waited = delay
+                bucket._refill()
+            bucket.tokens -= 1
+
+        return waited
@@ -0,0 +1,139 @@
+"""
+Refresh Scheduler
+Decides which models are due and how deep to scrape them from observed churn and config priority
+"""
+
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional
+from loguru import logger
+
+
+class RefreshScheduler:
+    """
+    JSON-backed per-model churn history.
+
+    Every run records how many vehicles were new, sold or changed price. The
+    smoothed change rate (changes per hour) sets the refresh interval: a model
+    is refreshed once about `target_changes` changes are expected, clamped to
+    [min_interval_hours, max_interval_hours]. Lower `priority` numbers in
+    vehicle_config2.csv shorten the interval, higher ones stretch it.
+
+    Between full sweeps (at most `full_sweep_hours` apart) only the first
+    pages are scraped - as deep as new vehicles have recently shown up.
+    """
+
+    def __init__(self, path: Path, min_interval_hours: float = 1.0, max_interval_hours: float = 24.0,
+                 target_changes: float = 3.0, priority_weight: float = 0.05,
+                 full_sweep_hours: float = 24.0, smoothing: float = 0.5, history: int = 10):
+        self.path = Path(path)
+        self.min_interval_hours = min_interval_hours
+        self.max_interval_hours = max_interval_hours
+        self.target_changes = target_changes
+        self.priority_weight = priority_weight
+        self.full_sweep_hours = full_sweep_hours
+        self.smoothing = smoothing
+        self.history = history
+        self.models: Dict[str, Dict] = {}
+        self._load()
+
+    def _load(self):
+        if not self.path.exists():
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.models = json.load(f)
+            logger.info(f"Loaded refresh history for {len(self.models)} models from {self.path}")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read refresh schedule {self.path}: {e}. Starting fresh.")
+            self.models = {}
+
+    def save(self):
+        """Write the schedule atomically"""
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.models, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def interval_hours(self, model_key: str, priority: int) -> float:
+        """Hours between refreshes for a model"""
+        state = self.models.get(model_key)
+        if not state or state.get('change_rate') is None:
+            return self.min_interval_hours
+
+        rate = state['change_rate']
+        interval = self.target_changes / rate if rate > 0 else self.max_interval_hours
+        interval *= 1 + max(0, priority - 1) * self.priority_weight
+        return max(self.min_interval_hours, min(self.max_interval_hours, interval))
+
+    def next_due(self, model_key: str, priority: int) -> Optional[datetime]:
+        """When the model should next be refreshed (None = never scraped, due now)"""
+        state = self.models.get(model_key)
+        if not state or not state.get('last_run'):
+            return None
+        last_run = datetime.fromisoformat(state['last_run'])
+        return last_run + timedelta(hours=self.interval_hours(model_key, priority))
+
+    def is_due(self, model_key: str, priority: int, now: Optional[datetime] = None) -> bool:
+        due_at = self.next_due(model_key, priority)
+        return due_at is None or (now or datetime.now()) >= due_at
+
+    def needs_full_sweep(self, model_key: str, now: Optional[datetime] = None) -> bool:
+        state = self.models.get(model_key)
+        if not state or not state.get('last_full_sweep'):
+            return True
+        last_sweep = datetime.fromisoformat(state['last_full_sweep'])
+        return (now or datetime.now()) - last_sweep >= timedelta(hours=self.full_sweep_hours)
+
+    def page_depth(self, model_key: str, max_pages: int, now: Optional[datetime] = None) -> int:
+        """Pages to scrape this run: everything for a full sweep, otherwise where new vehicles appear"""
+        if self.needs_full_sweep(model_key, now):
+            return max_pages
+        runs = self.models[model_key].get('runs', [])
+        deepest = max((r.get('deepest_new_page', 0) for r in runs), default=0)
+        # One page past the deepest recent new listing absorbs shifting pagination
+        return max(1, min(max_pages, deepest + 1))
+
+    def record_run(self, model_key: str, new: int, sold: int, price_changed: int, seen: int,
+                   pages: int, deepest_new_page: int, full_sweep: bool, now: Optional[datetime] = None):
+        """Store one run's churn and update the smoothed change rate"""
+        now = now or datetime.now()
+        state = self.models.setdefault(model_key, {'runs': [], 'change_rate': None})
+        changes = new + sold + price_changed
+
+        if state.get('last_run'):
+            hours = max((now - datetime.fromisoformat(state['last_run'])).total_seconds() / 3600, 1 / 60)
+            rate = changes / hours
+            if state.get('change_rate') is None:
+                state['change_rate'] = rate
+            else:
+                state['change_rate'] = self.smoothing * rate + (1 - self.smoothing) * state['change_rate']
+
+        state['last_run'] = now.isoformat()
+        if full_sweep:
+            state['last_full_sweep'] = now.isoformat()
+        state['runs'] = (state.get('runs', []) + [{
+            'at': now.isoformat(),
+            'new': new,
+            'sold': sold,
+            'price_changed': price_changed,
+            'seen': seen,
+            'pages': pages,
+            'deepest_new_page': deepest_new_page,
+            'full_sweep': full_sweep
+        }])[-self.history:]
+        self.save()
+
+        rate_text = f"{state['change_rate']:.2f}/h" if state.get('change_rate') is not None else "n/a"
+        logger.info(f"🗓️ {model_key}: {new} new, {sold} sold, {price_changed} price changes "
+                    f"(churn {rate_text})")
+
+    def describe(self, model_key: str, priority: int) -> str:
+        """Short human-readable schedule line for logs"""
+        interval = self.interval_hours(model_key, priority)
+        due_at = self.next_due(model_key, priority)
+        due_text = "now" if due_at is None else due_at.strftime('%Y-%m-%d %H:%M')
+        return f"every {interval:.1f}h, next {due_text}"
+
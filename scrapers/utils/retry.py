@@ -0,0 +1,121 @@
+"""
+Retry Helpers
+Exponential backoff with jitter, Retry-After parsing and a per-host circuit breaker
+"""
+
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from loguru import logger
+
+# Responses that mean "slow down" rather than "this page is broken"
+THROTTLE_STATUSES = {429, 503}
+
+
+def backoff_delay(attempt: int, base: float = 2.0, cap: float = 60.0) -> float:
+    """Full-jitter exponential backoff: uniform(0, min(cap, base * 2^attempt))"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class _HostCircuit:
+    """Breaker state for a single host"""
+
+    def __init__(self):
+        self.open_until = 0.0
+        self.trips = 0
+        self.ramp = 1.0  # fraction of normal throughput allowed, 1.0 = fully closed
+        self.lock = asyncio.Lock()
+
+
+class HostCircuitBreaker:
+    """
+    Pauses every worker talking to a host once it starts throttling us.
+
+    A 429/503 opens the circuit for `cooldown` seconds (doubling on repeated
+    trips, never shorter than the server's Retry-After). When the pause ends
+    requests are let through one at a time with extra spacing that shrinks
+    over `recovery_steps` successful responses, so we ramp back up to the
+    normal rate instead of hitting the host with every queued request at once.
+    """
+
+    def __init__(self, cooldown: float = 30.0, max_cooldown: float = 600.0,
+                 recovery_steps: int = 4, recovery_interval: float = 10.0):
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.recovery_steps = max(1, recovery_steps)
+        self.recovery_interval = recovery_interval
+        self._circuits: Dict[str, _HostCircuit] = {}
+
+    def _circuit(self, url: str) -> _HostCircuit:
+        host = urlparse(url).hostname or url
+        circuit = self._circuits.get(host)
+        if circuit is None:
+            circuit = _HostCircuit()
+            self._circuits[host] = circuit
+        return circuit
+
+    def is_open(self, url: str) -> bool:
+        return self._circuit(url).open_until > time.monotonic()
+
+    async def wait(self, url: str) -> float:
+        """Block while the host's circuit is open or recovering. Returns seconds waited."""
+        circuit = self._circuit(url)
+        waited = 0.0
+
+        remaining = circuit.open_until - time.monotonic()
+        while remaining > 0:
+            await asyncio.sleep(remaining)
+            waited += remaining
+            # Another worker may have re-opened the circuit while we slept
+            remaining = circuit.open_until - time.monotonic()
+
+        if circuit.ramp < 1.0:
+            async with circuit.lock:
+                delay = self.recovery_interval * (1.0 - circuit.ramp)
+                await asyncio.sleep(delay)
+                waited += delay
+
+        return waited
+
+    def record_throttle(self, url: str, status: int, retry_after: Optional[float] = None):
+        """Open the circuit after a 429/503"""
+        circuit = self._circuit(url)
+        circuit.trips += 1
+        pause = min(self.max_cooldown, self.cooldown * (2 ** (circuit.trips - 1)))
+        if retry_after is not None:
+            pause = max(pause, min(retry_after, self.max_cooldown))
+
+        circuit.open_until = max(circuit.open_until, time.monotonic() + pause)
+        circuit.ramp = 1.0 / self.recovery_steps
+        logger.warning(f"🛑 HTTP {status} from {urlparse(url).hostname} - pausing all requests "
+                       f"to it for {pause:.0f}s (trip {circuit.trips})")
+
+    def record_success(self, url: str):
+        """Count a good response towards closing the circuit again"""
+        circuit = self._circuit(url)
+        if circuit.ramp >= 1.0:
+            return
+        circuit.ramp = min(1.0, circuit.ramp + 1.0 / self.recovery_steps)
+        if circuit.ramp >= 1.0:
+            circuit.trips = 0
+            logger.info(f"✅ {urlparse(url).hostname} recovered - back to normal request rate")
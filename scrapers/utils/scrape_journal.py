@@ -0,0 +1,137 @@
+"""
+Scrape Journal
+Append-only, fsync'd JSONL log of model/page/vehicle completion used to resume interrupted runs
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+from loguru import logger
+
+
+class ResumeState:
+    """What an interrupted run had already finished, rebuilt from its journal entries"""
+
+    def __init__(self, run_id: Optional[str] = None):
+        self.run_id = run_id
+        self.completed_models: Set[str] = set()
+        self.pages: Dict[str, Dict[int, List[str]]] = {}
+        self.vehicles: Dict[str, Set[str]] = {}
+
+    def done_pages(self, model_key: str) -> Dict[int, List[str]]:
+        """page_num -> source_ids on that page, for pages fully processed in the interrupted run"""
+        return self.pages.get(model_key, {})
+
+    def done_vehicles(self, model_key: str) -> Set[str]:
+        """source_ids already enriched and saved in the interrupted run"""
+        return self.vehicles.get(model_key, set())
+
+    def apply(self, entry: Dict):
+        event = entry.get('event')
+        model = entry.get('model')
+        if event == 'model_done':
+            self.completed_models.add(model)
+        elif event == 'page_done':
+            self.pages.setdefault(model, {})[entry['page']] = entry.get('source_ids', [])
+        elif event == 'vehicle_done':
+            self.vehicles.setdefault(model, set()).add(entry['source_id'])
+
+
+class ScrapeJournal:
+    """
+    One JSON object per line, flushed and fsync'd on every write so a crash
+    loses at most the entry being written. A new run truncates the journal
+    (the previous one is kept as <name>.prev); --resume appends to it.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.run_id: Optional[str] = None
+        self._file = None
+
+    def _read_entries(self) -> List[Dict]:
+        if not self.path.exists():
+            return []
+        entries = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_num, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # A torn last line from a crash mid-write - everything before it is intact
+                    logger.warning(f"Ignoring unreadable journal line {line_num} in {self.path}")
+        return entries
+
+    def interrupted_run(self) -> Optional[str]:
+        """run_id of the journaled run if it never finished"""
+        entries = self._read_entries()
+        if not entries:
+            return None
+        run_id = entries[0].get('run_id')
+        if any(e.get('event') == 'run_done' for e in entries):
+            return None
+        return run_id
+
+    def start_run(self) -> str:
+        """Begin a fresh journal for a new run"""
+        if self.path.exists():
+            os.replace(self.path, self.path.with_suffix(self.path.suffix + '.prev'))
+        self.run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._write('run_start')
+        logger.info(f"📝 Journaling run {self.run_id} to {self.path}")
+        return self.run_id
+
+    def resume_run(self) -> ResumeState:
+        """Reopen an interrupted run's journal. Starts a fresh run if there is nothing to resume."""
+        run_id = self.interrupted_run()
+        if run_id is None:
+            logger.info("📝 No interrupted run to resume - starting a new run")
+            self.start_run()
+            return ResumeState()
+
+        state = ResumeState(run_id)
+        for entry in self._read_entries():
+            state.apply(entry)
+
+        self.run_id = run_id
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._write('run_resume')
+        logger.info(f"📝 Resuming run {run_id}: {len(state.completed_models)} models done, "
+                    f"{sum(len(p) for p in state.pages.values())} pages and "
+                    f"{sum(len(v) for v in state.vehicles.values())} vehicles already processed")
+        return state
+
+    def _write(self, event: str, **fields):
+        if self._file is None:
+            return
+        entry = {'ts': datetime.now().isoformat(), 'run_id': self.run_id, 'event': event, **fields}
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def model_start(self, model_key: str):
+        self._write('model_start', model=model_key)
+
+    def page_done(self, model_key: str, page_num: int, source_ids: List[str]):
+        self._write('page_done', model=model_key, page=page_num, source_ids=list(source_ids))
+
+    def vehicle_done(self, model_key: str, page_num: int, source_id: str, vehicle_id: int):
+        self._write('vehicle_done', model=model_key, page=page_num, source_id=source_id, vehicle_id=vehicle_id)
+
+    def model_done(self, model_key: str, vehicles: int):
+        self._write('model_done', model=model_key, vehicles=vehicles)
+
+    def finish_run(self, total_vehicles: int):
+        self._write('run_done', vehicles=total_vehicles)
+        self.close()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -33,7 +33,7 @@ async def test_single_vehicle():
             m.name as model_name,
             v.created_at,
             v.ai_description
-        FROM vehicles v
+        FROM vehicle_listings v
         JOIN models m ON v.model_id = m.id
         WHERE v.ai_description IS NULL 
         OR v.ai_description = ''